@@ -0,0 +1,491 @@
+"""Per-stage latency of the recognition hot path, checked against a baseline.
+
+Runs each stage of the `recognize` loop — hand detection
+(``handDetector.findHands``), landmark extraction (``findLandmarks`` and the
+legacy ``findPosition``), normalization, classification
+(``GestureManager.predict_batch``), smoothing and overlay drawing — and then
+the full per-frame loop, without a camera or a window. Inputs are replayable:
+video clips given with ``--video`` are decoded into memory up front (so
+decoding isn't timed) and deterministic synthetic frames (a drawn hand that
+moves and rotates, generated from ``--seed``) are always included.
+
+When the detector finds no hand in a frame (or detection isn't run), the
+classification stages use the landmarks the synthetic hand was drawn from
+(or, for clips, the last detected ones), so every stage gets a sample per
+frame; ``hands_found`` in the results counts the frames with a detection. The full loop takes
+the app's real branches: no hand means no classification.
+
+For every input and stage the script reports throughput and p50/p95/p99
+latency, writes the results as JSON and compares them with a saved baseline.
+
+Usage:
+    python benchmarks/pipeline_bench.py --video clip.mp4   # compare to baseline
+    python benchmarks/pipeline_bench.py --record           # write a new baseline
+
+Exits with status 1 when a stage's p50 or p95 latency regressed by more than
+``--threshold`` (and by at least ``--min-delta-us``) against the baseline.
+Baselines are machine specific: record one on the machine you compare on.
+"""
+
+import argparse
+import datetime
+import itertools
+import json
+import math
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+BASELINE_PATH = os.path.join(ROOT_DIR, "benchmarks", "pipeline_baseline.json")
+OUTPUT_PATH = os.path.join(ROOT_DIR, "logs", "pipeline_bench.json")
+
+STAGES = (
+    "detect",
+    "landmarks",
+    "position",
+    "normalize",
+    "predict",
+    "smooth",
+    "overlay",
+    "loop",
+)
+# Stages that need MediaPipe
+DETECTOR_STAGES = ("detect", "landmarks", "position", "loop")
+
+PERCENTILES = (50, 95, 99)
+# Percentiles checked against the baseline (p99 is too noisy to gate on)
+GATED_PERCENTILES = (50, 95)
+DEFAULT_THRESHOLD = 0.15
+DEFAULT_MIN_DELTA_US = 5.0
+
+FRAME_SIZE = (640, 480)
+# Frame rate replayed frames are timestamped at for detection skipping
+REPLAY_FPS = 30
+
+# Open right hand, wrist at the origin, in units of the palm length
+# (MediaPipe landmark order: wrist, then thumb, index, middle, ring, pinky
+# from base to tip)
+HAND_TEMPLATE = np.array(
+    [
+        [0.0, 0.0],
+        [-0.35, -0.15], [-0.6, -0.35], [-0.75, -0.55], [-0.9, -0.7],
+        [-0.25, -0.9], [-0.28, -1.3], [-0.3, -1.55], [-0.32, -1.75],
+        [0.0, -0.95], [0.0, -1.4], [0.0, -1.7], [0.0, -1.9],
+        [0.22, -0.88], [0.25, -1.3], [0.27, -1.55], [0.29, -1.72],
+        [0.42, -0.75], [0.5, -1.05], [0.55, -1.25], [0.6, -1.42],
+    ],
+    dtype=np.float32,
+)  # fmt: skip
+HAND_BONES = (
+    (0, 1), (1, 2), (2, 3), (3, 4),
+    (0, 5), (5, 6), (6, 7), (7, 8),
+    (9, 10), (10, 11), (11, 12),
+    (13, 14), (14, 15), (15, 16),
+    (0, 17), (17, 18), (18, 19), (19, 20),
+)  # fmt: skip
+PALM = (0, 1, 5, 9, 13, 17)
+SKIN_BGR = (120, 160, 210)
+
+
+def synthetic_frames(count, size=FRAME_SIZE, seed=0):
+    """Return ``(frames, landmarks)`` for a drawn hand wandering over noise.
+
+    ``landmarks`` holds the ``(count, 21, 2)`` pixel coordinates each hand
+    was drawn from. The same seed always gives the same frames.
+    """
+    import cv2
+
+    rng = np.random.default_rng(seed)
+    width, height = size
+    background = rng.integers(40, 90, (height, width, 3), dtype=np.uint8)
+    phase = np.linspace(0, 2 * np.pi, count, endpoint=False)
+
+    frames, landmarks = [], []
+    for t in phase:
+        angle = 0.3 * math.sin(t) + rng.normal(0, 0.05)
+        scale = height * (0.22 + 0.03 * math.sin(2 * t))
+        wrist = np.array(
+            [width * (0.5 + 0.2 * math.cos(t)), height * (0.85 + 0.05 * math.sin(t))]
+        )
+        rotation = np.array(
+            [[math.cos(angle), -math.sin(angle)], [math.sin(angle), math.cos(angle)]]
+        )
+        points = (HAND_TEMPLATE @ rotation.T * scale + wrist).astype(np.float32)
+
+        frame = background.copy()
+        pixels = np.round(points).astype(np.int32)
+        thickness = max(2, int(scale * 0.18))
+        cv2.fillConvexPoly(frame, cv2.convexHull(pixels[list(PALM)]), SKIN_BGR)
+        for a, b in HAND_BONES:
+            cv2.line(frame, tuple(pixels[a]), tuple(pixels[b]), SKIN_BGR, thickness)
+        for point in pixels:
+            cv2.circle(frame, tuple(point), thickness // 2, SKIN_BGR, -1)
+
+        # Without the blur's soft edges MediaPipe doesn't take the drawing
+        # for a hand; with it nearly every frame is detected.
+        frames.append(cv2.GaussianBlur(frame, (9, 9), 0))
+        landmarks.append(points)
+    return frames, np.stack(landmarks)
+
+
+def read_clip(path, max_frames):
+    """Decode up to ``max_frames`` frames of a video file into memory."""
+    import cv2
+
+    capture = cv2.VideoCapture(path)
+    if not capture.isOpened():
+        raise RuntimeError(f"Cannot open video {path}")
+    frames = []
+    try:
+        while len(frames) < max_frames:
+            ok, frame = capture.read()
+            if not ok:
+                break
+            frames.append(frame)
+    finally:
+        capture.release()
+    if not frames:
+        raise RuntimeError(f"No frames in {path}")
+    return frames
+
+
+def summarize(durations):
+    """Latency statistics (microseconds) and throughput for one stage."""
+    us = np.asarray(durations, dtype=np.float64) * 1e6
+    mean = float(us.mean())
+    summary = {
+        "count": len(us),
+        "mean_us": round(mean, 2),
+        "throughput_per_s": round(1e6 / mean, 1) if mean > 0 else None,
+    }
+    for percentile, value in zip(PERCENTILES, np.percentile(us, PERCENTILES)):
+        summary[f"p{percentile}_us"] = round(float(value), 2)
+    return summary
+
+
+def _headless_app(detector, manager):
+    """A ``GestureRecognitionApp`` with the bench's components and no I/O."""
+    from gesture_recognition.app import GestureRecognitionApp
+
+    return GestureRecognitionApp.offline(detector, manager)
+
+
+def run_input(frames, fallback_landmarks, app, stages, warmup):
+    """Time ``stages`` (a set) over ``frames``; returns ``(summaries, hands_found)``.
+
+    ``fallback_landmarks`` (or ``None``) gives each frame's landmarks for the
+    classification stages when detection is skipped or finds no hand.
+    """
+    from gesture_recognition.landmarks import normalize_landmarks_batch
+
+    clock = time.perf_counter
+    timings = {stage: [] for stage in stages}
+    detect = app.detector is not None and bool(
+        stages & {"detect", "landmarks", "position"}
+    )
+    hands_found = 0
+    last = (
+        fallback_landmarks[0]
+        if fallback_landmarks is not None
+        else np.zeros((21, 2), np.float32)
+    )
+
+    measured = False
+    # The first hand's smoothing, as the app's tracker would give it
+    smoother = app._new_smoother()
+
+    def record(stage, start):
+        if measured and stage in timings:
+            timings[stage].append(clock() - start)
+
+    for i, source in enumerate([*frames[:warmup], *frames]):
+        measured = i >= warmup
+        index = (i - warmup) % len(frames)
+        frame = source.copy()
+        found = None
+
+        if detect:
+            start = clock()
+            frame = app.detector.findHands(frame)
+            record("detect", start)
+            start = clock()
+            found, _ = app.detector.findLandmarks(frame)
+            record("landmarks", start)
+            if "position" in stages:
+                start = clock()
+                app.detector.findPosition(frame)
+                record("position", start)
+
+        if found is not None and len(found):
+            last = found[0, :, :2]
+            hands_found += measured
+        elif fallback_landmarks is not None:
+            last = fallback_landmarks[index]
+        landmarks = last[np.newaxis]
+
+        start = clock()
+        normalized = normalize_landmarks_batch(landmarks)
+        record("normalize", start)
+
+        prediction = None
+        if app.gesture_manager is not None:
+            start = clock()
+            class_name, confidence = app.gesture_manager.predict_batch(normalized)[0]
+            record("predict", start)
+            start = clock()
+            smoother.update(class_name, confidence)
+            anchor = tuple(int(v) for v in last.min(axis=0))
+            prediction = [(1, smoother.get_dominant_gesture(), confidence, anchor)]
+            record("smooth", start)
+
+        if "overlay" in stages:
+            start = clock()
+            app._draw_overlays(frame, prediction)
+            record("overlay", start)
+
+    if "loop" in stages and app.detector is not None:
+        # The app's own per-frame path, as `recognize` runs it minus imshow
+        for i, source in enumerate([*frames[:warmup], *frames]):
+            start = clock()
+            frame, landmarks, handedness = app._detect(source.copy())
+            prediction = app._classify(landmarks, handedness)
+            app._draw_overlays(frame, prediction)
+            app.perf_analyzer.end_frame()
+            if i >= warmup:
+                timings["loop"].append(clock() - start)
+
+    return {
+        stage: summarize(timings[stage])
+        for stage in STAGES
+        if timings.get(stage)
+    }, hands_found
+
+
+def compare(results, baseline, threshold, min_delta_us, stage_thresholds=None):
+    """Return regression messages for ``results`` against ``baseline``.
+
+    A stage regressed when a gated percentile grew by more than its
+    threshold (a fraction, ``stage_thresholds`` overriding ``threshold``)
+    and by more than ``min_delta_us`` — microsecond-scale stages jitter by
+    large fractions that don't matter.
+    """
+    stage_thresholds = stage_thresholds or {}
+    regressions = []
+    for name, result in results["inputs"].items():
+        base = baseline.get("inputs", {}).get(name)
+        if base is None:
+            continue
+        for stage, summary in result["stages"].items():
+            base_summary = base["stages"].get(stage)
+            if base_summary is None:
+                continue
+            limit = stage_thresholds.get(stage, threshold)
+            for percentile in GATED_PERCENTILES:
+                key = f"p{percentile}_us"
+                now, before = summary[key], base_summary[key]
+                if now - before > min_delta_us and now > before * (1 + limit):
+                    regressions.append(
+                        f"{name}/{stage} {key}: {before:.1f} -> {now:.1f} "
+                        f"(+{now / before - 1:.0%}, limit +{limit:.0%})"
+                    )
+    return regressions
+
+
+def format_results(results, baseline=None):
+    lines = [
+        (
+            f"{'input':<16}{'stage':<11}{'per s':>9}{'p50 (us)':>11}"
+            f"{'p95 (us)':>11}{'p99 (us)':>11}{'vs base p50':>13}"
+        )
+    ]
+    for name, result in results["inputs"].items():
+        base = (baseline or {}).get("inputs", {}).get(name, {}).get("stages", {})
+        for stage, s in result["stages"].items():
+            change = "-"
+            if stage in base and base[stage]["p50_us"] > 0:
+                change = f"{s['p50_us'] / base[stage]['p50_us'] - 1:+.0%}"
+            lines.append(
+                f"{name:<16}{stage:<11}{s['throughput_per_s'] or 0:>9.0f}"
+                f"{s['p50_us']:>11.1f}{s['p95_us']:>11.1f}{s['p99_us']:>11.1f}"
+                f"{change:>13}"
+            )
+    return "\n".join(lines)
+
+
+def _parse_stage_thresholds(values):
+    thresholds = {}
+    for value in values:
+        stage, _, fraction = value.partition("=")
+        if stage not in STAGES or not fraction:
+            raise argparse.ArgumentTypeError(f"expected STAGE=FRACTION, got {value!r}")
+        thresholds[stage] = float(fraction)
+    return thresholds
+
+
+def main(argv=None):
+    from gesture_recognition import config
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--video", action="append", default=[], help="Video clip to replay (repeatable)"
+    )
+    parser.add_argument(
+        "--frames", type=int, default=300, help="Synthetic frames / max frames per clip"
+    )
+    parser.add_argument("--warmup", type=int, default=10, help="Untimed frames first")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic frame seed")
+    parser.add_argument(
+        "--stages", nargs="+", choices=STAGES, default=list(STAGES), help="Stages to run"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=config.INFERENCE_BACKENDS,
+        default=config.INFERENCE_BACKEND,
+        help="Classifier backend",
+    )
+    parser.add_argument("--model", default=config.MODEL_PATH, help="Model path")
+    parser.add_argument(
+        "--names", default=config.GESTURE_NAMES_PATH, help="Gesture names file"
+    )
+    parser.add_argument("--output", default=OUTPUT_PATH, help="Results JSON file")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON file")
+    parser.add_argument(
+        "--record", action="store_true", help="Write the results as the new baseline"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed p50/p95 slowdown as a fraction (default 0.15 = 15%%)",
+    )
+    parser.add_argument(
+        "--stage-threshold",
+        action="append",
+        default=[],
+        metavar="STAGE=FRACTION",
+        help="Per-stage override of --threshold (repeatable)",
+    )
+    parser.add_argument(
+        "--min-delta-us",
+        type=float,
+        default=DEFAULT_MIN_DELTA_US,
+        help="Ignore slowdowns smaller than this many microseconds",
+    )
+    parser.add_argument(
+        "--detect-interval",
+        type=int,
+        default=config.DETECT_INTERVAL,
+        help="Run the detector at least every N frames, filtering in between",
+    )
+    parser.add_argument(
+        "--landmark-filter",
+        choices=("one_euro", "kalman"),
+        default=config.LANDMARK_FILTER,
+        help="Filter predicting landmarks between detections",
+    )
+    args = parser.parse_args(argv)
+    stage_thresholds = _parse_stage_thresholds(args.stage_threshold)
+    stages = set(args.stages)
+
+    detector = manager = None
+    if stages & set(DETECTOR_STAGES):
+        from gesture_recognition.tracking.hand_detector import handDetector
+
+        detector = handDetector(
+            detectionCon=config.DETECTION_CONFIDENCE,
+            trackCon=config.TRACKING_CONFIDENCE,
+            maxHands=config.MAX_HANDS,
+        )
+    if stages & {"predict", "smooth", "overlay", "loop"}:
+        from gesture_recognition.services.gesture_manager import GestureManager
+
+        manager = GestureManager(
+            args.model,
+            args.names,
+            backend=args.backend,
+            tflite_variant=config.TFLITE_VARIANT,
+            num_threads=config.TFLITE_THREADS,
+        )
+
+    frames, landmarks = synthetic_frames(args.frames, seed=args.seed)
+    inputs = {"synthetic": (frames, landmarks)}
+    for path in args.video:
+        inputs[os.path.basename(path)] = (read_clip(path, args.frames), None)
+
+    results = {
+        "meta": {
+            "time": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+            "backend": args.backend,
+            "detect_interval": args.detect_interval,
+            "model": os.path.relpath(args.model, ROOT_DIR),
+        },
+        "inputs": {},
+    }
+    for name, (frames, fallback) in inputs.items():
+        # A fresh app per input, so smoothing/tracking state doesn't carry over
+        input_detector = detector
+        if detector is not None and args.detect_interval > 1:
+            from gesture_recognition.tracking.landmark_filter import FilteredDetector
+
+            # Replayed frames come faster than a camera's; timestamp them at
+            # the nominal camera rate so the filter sees real-time motion
+            input_detector = FilteredDetector(
+                detector,
+                interval=args.detect_interval,
+                filter=args.landmark_filter,
+                clock=itertools.count(0, 1 / REPLAY_FPS).__next__,
+            )
+        app = _headless_app(input_detector, manager)
+        summaries, hands_found = run_input(frames, fallback, app, stages, args.warmup)
+        results["inputs"][name] = {
+            "frames": len(frames),
+            "hands_found": hands_found,
+            "detector_load": round(getattr(input_detector, "detector_load", 1.0), 3),
+            "stages": summaries,
+        }
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print(format_results(results, baseline))
+    for name, result in results["inputs"].items():
+        if result["detector_load"] < 1:
+            print(f"{name}: detector ran on {result['detector_load']:.0%} of frames")
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"Wrote results to {args.output}")
+
+    if args.record:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"Wrote baseline to {args.baseline}")
+        return 0
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --record to create one")
+        return 0
+    regressions = compare(
+        results, baseline, args.threshold, args.min_delta_us, stage_thresholds
+    )
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+"""Speed and landmark error of ROI tracking against full-frame detection.
+
+Replays the same frames through two ``handDetector`` instances, one
+processing every full frame and one in ROI mode (``roi=True``, which crops
+around the previous frame's hand), and reports for each input:
+
+- per-frame detection latency (``findHands`` + ``findLandmarks``, p50/p95)
+  of both modes and the ROI mode's p50 speedup,
+- how many frames each mode found a hand in, and how often the ROI mode
+  fell back to the full frame,
+- the distance between the two modes' landmarks on frames where both found
+  a hand, in pixels and relative to the hand size (the diagonal of the
+  full-frame landmarks' bounding box).
+
+Inputs are video clips given with ``--video`` (decoded into memory first)
+and deterministic synthetic frames at ``--size``, as in
+``pipeline_bench.py``. Run it at the camera resolutions you care about:
+full-frame cost grows with the resolution, ROI cost shouldn't.
+
+Usage:
+    python benchmarks/roi_bench.py --video clip.mp4 --size 1280x720
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+from pipeline_bench import (
+    ROOT_DIR,
+    read_clip,
+    summarize,
+    synthetic_frames,
+)
+
+OUTPUT_PATH = os.path.join(ROOT_DIR, "logs", "roi_bench.json")
+
+
+def run_detector(detector, frames, warmup):
+    """Time ``detector`` over ``frames``; returns ``(durations, landmarks)``.
+
+    ``landmarks`` holds each measured frame's first-hand ``(21, 2)`` pixel
+    landmarks, or ``None`` when no hand was found.
+    """
+    clock = time.perf_counter
+    durations, landmarks = [], []
+    for i, source in enumerate([*frames[:warmup], *frames]):
+        frame = source.copy()
+        start = clock()
+        detector.findHands(frame, draw=False)
+        found, _ = detector.findLandmarks(frame)
+        duration = clock() - start
+        if i >= warmup:
+            durations.append(duration)
+            landmarks.append(found[0, :, :2].copy() if len(found) else None)
+    return durations, landmarks
+
+
+def landmark_error(reference, candidate):
+    """Compare per-frame landmarks of ``candidate`` against ``reference``."""
+    errors, relative = [], []
+    missed = extra = 0
+    for ref, cand in zip(reference, candidate):
+        if ref is None or cand is None:
+            missed += ref is not None
+            extra += cand is not None
+            continue
+        error = float(np.linalg.norm(cand - ref, axis=1).mean())
+        diagonal = float(np.linalg.norm(ref.max(axis=0) - ref.min(axis=0)))
+        errors.append(error)
+        relative.append(error / diagonal if diagonal > 0 else 0.0)
+    result = {"compared": len(errors), "missed": missed, "extra": extra}
+    if errors:
+        result.update(
+            mean_px=round(float(np.mean(errors)), 2),
+            p95_px=round(float(np.percentile(errors, 95)), 2),
+            mean_relative=round(float(np.mean(relative)), 4),
+        )
+    return result
+
+
+def compare_input(frames, full, roi, warmup):
+    """Run both detectors over ``frames`` and summarize the comparison."""
+    full_times, full_landmarks = run_detector(full, frames, warmup)
+    roi_times, roi_landmarks = run_detector(roi, frames, warmup)
+    full_summary, roi_summary = summarize(full_times), summarize(roi_times)
+    return {
+        "frames": len(frames),
+        "size": f"{frames[0].shape[1]}x{frames[0].shape[0]}",
+        "full": {
+            **full_summary,
+            "hands_found": sum(lm is not None for lm in full_landmarks),
+        },
+        "roi": {
+            **roi_summary,
+            "hands_found": sum(lm is not None for lm in roi_landmarks),
+            "roi_frames": roi.roiFrames,
+            "full_searches": roi.fullSearches,
+            "roi_misses": roi.roiMisses,
+        },
+        "speedup_p50": round(full_summary["p50_us"] / roi_summary["p50_us"], 3),
+        "error": landmark_error(full_landmarks, roi_landmarks),
+    }
+
+
+def format_results(results):
+    lines = [
+        (
+            f"{'input':<16}{'size':>10}{'full p50':>10}{'roi p50':>9}{'speedup':>9}"
+            f"{'hands':>11}{'roi frames':>12}{'err px':>8}{'err rel':>9}"
+        )
+    ]
+    for name, r in results.items():
+        error = r["error"]
+        lines.append(
+            f"{name:<16}{r['size']:>10}"
+            f"{r['full']['p50_us'] / 1000:>8.2f}ms{r['roi']['p50_us'] / 1000:>7.2f}ms"
+            f"{r['speedup_p50']:>8.2f}x"
+            f"{r['full']['hands_found']:>5}/{r['roi']['hands_found']:<5}"
+            f"{r['roi']['roi_frames']:>12}"
+            f"{error.get('mean_px', float('nan')):>8.1f}"
+            f"{error.get('mean_relative', float('nan')):>9.1%}"
+        )
+    return "\n".join(lines)
+
+
+def _parse_size(value):
+    width, _, height = value.partition("x")
+    try:
+        return int(width), int(height)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got {value!r}")
+
+
+def main(argv=None):
+    from gesture_recognition import config
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--video", action="append", default=[], help="Video clip to replay (repeatable)"
+    )
+    parser.add_argument(
+        "--frames", type=int, default=300, help="Synthetic frames / max frames per clip"
+    )
+    parser.add_argument(
+        "--size",
+        type=_parse_size,
+        default=(1280, 720),
+        help="Synthetic frame size (default 1280x720)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic frame seed")
+    parser.add_argument("--warmup", type=int, default=10, help="Untimed frames first")
+    parser.add_argument("--roi-size", type=int, default=config.ROI_SIZE)
+    parser.add_argument("--roi-padding", type=float, default=config.ROI_PADDING)
+    parser.add_argument("--roi-refresh", type=int, default=config.ROI_REFRESH_FRAMES)
+    parser.add_argument("--output", default=OUTPUT_PATH, help="Results JSON file")
+    args = parser.parse_args(argv)
+
+    from gesture_recognition.tracking.hand_detector import handDetector
+
+    inputs = {"synthetic": synthetic_frames(args.frames, args.size, args.seed)[0]}
+    for path in args.video:
+        inputs[os.path.basename(path)] = read_clip(path, args.frames)
+
+    results = {}
+    for name, frames in inputs.items():
+        # Fresh detectors per input, so tracking state doesn't carry over
+        options = {
+            "detectionCon": config.DETECTION_CONFIDENCE,
+            "trackCon": config.TRACKING_CONFIDENCE,
+            "maxHands": config.MAX_HANDS,
+        }
+        full = handDetector(**options)
+        roi = handDetector(
+            **options,
+            roi=True,
+            roiSize=args.roi_size,
+            roiPadding=args.roi_padding,
+            roiRefresh=args.roi_refresh,
+        )
+        results[name] = compare_input(frames, full, roi, args.warmup)
+
+    print(format_results(results))
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"Wrote results to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
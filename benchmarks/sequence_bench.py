@@ -0,0 +1,194 @@
+"""Per-frame cost of streaming dynamic-gesture recognition.
+
+Times three ways of classifying the newest frame of a moving hand, on the
+NumPy backend with random weights of the default architectures:
+
+- ``static``: the pose classifier as ``recognize`` runs it (normalize one
+  hand, one ``NumpyDenseModel`` call, smoothing),
+- ``streaming``: ``SequenceRecognizer.update`` (features, one
+  ``TemporalStream`` step per layer, smoothing),
+- ``window``: the same temporal model re-run on the whole receptive field
+  every frame, as a non-streaming implementation would.
+
+Frames are fed at ``--fps`` (the model's step rate), so every streaming
+update is exactly one model step. Use ``--window-dilations`` to see how
+the window cost grows with the receptive field while streaming stays flat.
+
+Usage:
+    python benchmarks/sequence_bench.py --frames 2000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+from pipeline_bench import ROOT_DIR, summarize
+
+OUTPUT_PATH = os.path.join(ROOT_DIR, "logs", "sequence_bench.json")
+
+CLASSES = 6
+
+
+def random_temporal_model(filters, kernel_size, dilations, classes=CLASSES, seed=0):
+    from gesture_recognition.sequences import FEATURE_SIZE
+    from gesture_recognition.services.temporal_model import NumpyTemporalModel
+
+    rng = np.random.default_rng(seed)
+    convs, width = [], FEATURE_SIZE
+    for dilation in dilations:
+        kernel = rng.normal(0, 0.2, (kernel_size, width, filters))
+        convs.append((kernel, rng.normal(0, 0.1, filters), dilation, "relu"))
+        width = filters
+    head = [(rng.normal(0, 0.2, (width, classes)), np.zeros(classes), "softmax")]
+    return NumpyTemporalModel(convs, head)
+
+
+def random_dense_model(hidden_layers=(64, 32), classes=CLASSES, seed=0):
+    from gesture_recognition.services.numpy_model import NumpyDenseModel
+
+    rng = np.random.default_rng(seed)
+    sizes = [42, *hidden_layers, classes]
+    activations = ["relu"] * len(hidden_layers) + ["softmax"]
+    return NumpyDenseModel(
+        [
+            (rng.normal(0, 0.2, (n_in, n_out)), np.zeros(n_out), activation)
+            for n_in, n_out, activation in zip(sizes, sizes[1:], activations)
+        ]
+    )
+
+
+def moving_hand(frames, seed=0):
+    """``(frames, 21, 2)`` pixel landmarks of a hand drifting and flexing."""
+    rng = np.random.default_rng(seed)
+    pose = rng.uniform(-60, 60, (21, 2))
+    t = np.arange(frames)[:, np.newaxis]
+    wrist = np.stack([320 + 150 * np.sin(t / 15), 240 + 40 * np.cos(t / 9)], -1)
+    flex = 1 + 0.1 * np.sin(t / 7)[..., np.newaxis]
+    return (wrist + pose * flex).astype(np.float32)
+
+
+def time_calls(fn, inputs, warmup):
+    clock = time.perf_counter
+    durations = []
+    for i, item in enumerate([*inputs[:warmup], *inputs]):
+        start = clock()
+        fn(i, item)
+        if i >= warmup:
+            durations.append(clock() - start)
+    return durations
+
+
+def run(frames, fps, filters, kernel_size, dilations, warmup):
+    from gesture_recognition.landmarks import normalize_landmarks_batch
+    from gesture_recognition.sequences import frame_features
+    from gesture_recognition.services.gesture_smoothing import GestureSmoother
+    from gesture_recognition.services.sequence_recognizer import SequenceRecognizer
+
+    hands = moving_hand(frames)
+    names = [f"gesture_{i}" for i in range(CLASSES)]
+    dense = random_dense_model()
+    temporal = random_temporal_model(filters, kernel_size, dilations)
+    recognizer = SequenceRecognizer(temporal, names, fps=fps)
+    smoother = GestureSmoother()
+
+    def static(i, hand):
+        probabilities = dense(normalize_landmarks_batch(hand[np.newaxis]))[0]
+        class_id = int(np.argmax(probabilities))
+        smoother.update(names[class_id], float(probabilities[class_id]))
+        smoother.get_dominant_gesture()
+
+    def streaming(i, hand):
+        recognizer.update(hand, i / fps)
+
+    # The non-streaming baseline keeps the last receptive field of features
+    field = temporal.receptive_field
+    history = np.zeros((1, field, temporal.feature_size), np.float32)
+    previous = [hands[0]]
+
+    def window(i, hand):
+        history[0, :-1] = history[0, 1:]
+        history[0, -1] = frame_features(hand[np.newaxis], previous[0][np.newaxis])[0]
+        previous[0] = hand
+        temporal(history)
+
+    results = {
+        "receptive_field": field,
+        "static": summarize(time_calls(static, hands, warmup)),
+        "streaming": summarize(time_calls(streaming, hands, warmup)),
+        "window": summarize(time_calls(window, hands, warmup)),
+    }
+    results["streaming_vs_static_p50"] = round(
+        results["streaming"]["p50_us"] / results["static"]["p50_us"], 2
+    )
+    results["model_steps"] = recognizer.steps
+    return results
+
+
+def format_results(results):
+    lines = [f"{'model':<24}{'p50':>10}{'p95':>10}{'vs static':>11}"]
+    for name, r in results.items():
+        static = r["static"]["p50_us"]
+        for mode in ("static", "streaming", "window"):
+            lines.append(
+                f"{name + ' ' + mode:<24}{r[mode]['p50_us']:>8.1f}us"
+                f"{r[mode]['p95_us']:>8.1f}us{r[mode]['p50_us'] / static:>10.2f}x"
+            )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    from gesture_recognition import config
+    from gesture_recognition.sequences import (
+        DEFAULT_DILATIONS,
+        DEFAULT_FILTERS,
+        DEFAULT_KERNEL_SIZE,
+    )
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=2000, help="Timed frames")
+    parser.add_argument("--warmup", type=int, default=50, help="Untimed frames first")
+    parser.add_argument("--fps", type=float, default=config.SEQUENCE_FPS)
+    parser.add_argument("--filters", type=int, default=DEFAULT_FILTERS)
+    parser.add_argument("--kernel-size", type=int, default=DEFAULT_KERNEL_SIZE)
+    parser.add_argument(
+        "--window-dilations",
+        type=int,
+        nargs="+",
+        action="append",
+        help="Extra dilation stacks to compare (repeatable), e.g. 1 2 4 8 16",
+    )
+    parser.add_argument("--output", default=OUTPUT_PATH, help="Results JSON file")
+    args = parser.parse_args(argv)
+
+    stacks = [tuple(DEFAULT_DILATIONS), *map(tuple, args.window_dilations or [])]
+    results = {}
+    for dilations in stacks:
+        name = "d" + "-".join(map(str, dilations))
+        results[name] = run(
+            args.frames,
+            args.fps,
+            args.filters,
+            args.kernel_size,
+            dilations,
+            args.warmup,
+        )
+
+    print(format_results(results))
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"Wrote results to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
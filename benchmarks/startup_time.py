@@ -0,0 +1,128 @@
+"""Cold-start import time per `main.py` subcommand, checked against a budget.
+
+Each subcommand imports only the modules it uses (see main.py). This script
+imports each subcommand's modules in a fresh interpreter with
+``python -X importtime`` and reports the total import time (the sum of the
+"self" column, i.e. time spent in module bodies) alongside the wall time of
+the whole process. Every measurement is the best of ``--runs`` cold starts.
+
+Usage:
+    python benchmarks/startup_time.py            # compare to startup_budget.json
+    python benchmarks/startup_time.py --record   # write a new budget
+
+Exits with status 1 when any subcommand is over its budget, so it can run as
+a CI/kiosk-image check.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_PATH = os.path.join(ROOT_DIR, "benchmarks", "startup_budget.json")
+
+# Modules each subcommand imports before doing any work
+SUBCOMMANDS = {
+    "help": ["main"],
+    "settings": [
+        "main",
+        "gesture_recognition.ui.settings_dialog",
+        "gesture_recognition.user_profile",
+    ],
+    "record": ["main", "gesture_recognition.recorder"],
+    "train": ["main", "gesture_recognition.trainer"],
+    "recognize": [
+        "main",
+        "gesture_recognition.app",
+        "gesture_recognition.user_profile",
+    ],
+    "analyze": ["main", "gesture_recognition.analyze"],
+    "host": ["main", "gesture_recognition.host"],
+    "export": ["main", "gesture_recognition.export"],
+    "dataset": ["main", "gesture_recognition.dataset"],
+}
+
+# Budget = measured time x HEADROOM when recording, to absorb machine noise
+HEADROOM = 1.5
+
+
+def measure(modules, runs=3):
+    """Return ``(import_ms, wall_ms)`` for importing ``modules``, best of runs."""
+    code = "; ".join(f"import {module}" for module in modules)
+    best_import = best_wall = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=ROOT_DIR,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        wall = time.perf_counter() - start
+        if result.returncode != 0:
+            raise RuntimeError(f"import failed for {modules}:\n{result.stderr}")
+        best_import = min(best_import, _total_import_us(result.stderr) / 1000)
+        best_wall = min(best_wall, wall * 1000)
+    return best_import, best_wall
+
+
+def _total_import_us(report):
+    # Lines look like "import time:   self [us] | cumulative | imported package"
+    total = 0
+    for line in report.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us = line.split(":", 1)[1].split("|")[0].strip()
+        if self_us.isdigit():
+            total += int(self_us)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--record", action="store_true", help="Write the measured times as budget"
+    )
+    parser.add_argument("--runs", type=int, default=3, help="Cold starts per command")
+    parser.add_argument("--budget", default=BUDGET_PATH, help="Budget JSON file")
+    parser.add_argument(
+        "commands", nargs="*", help="Subcommands to measure (default: all)"
+    )
+    args = parser.parse_args()
+
+    budget = {}
+    if os.path.exists(args.budget):
+        with open(args.budget) as f:
+            budget = json.load(f)
+
+    over = []
+    results = {}
+    print(f"{'command':<12}{'import (ms)':>13}{'wall (ms)':>12}{'budget (ms)':>13}")
+    for command in args.commands or SUBCOMMANDS:
+        import_ms, wall_ms = measure(SUBCOMMANDS[command], args.runs)
+        results[command] = round(wall_ms * HEADROOM)
+        limit = budget.get(command)
+        status = ""
+        if limit is not None and wall_ms > limit:
+            over.append(command)
+            status = "  OVER"
+        limit_text = "-" if limit is None else str(limit)
+        print(f"{command:<12}{import_ms:>13.0f}{wall_ms:>12.0f}{limit_text:>13}{status}")
+
+    if args.record:
+        budget.update(results)
+        with open(args.budget, "w") as f:
+            json.dump(budget, f, indent=2)
+            f.write("\n")
+        print(f"Wrote budget to {args.budget}")
+    elif over:
+        print(f"Over budget: {', '.join(over)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""Headless gesture recognition over recorded video files (`main.py analyze`).
+
+Runs the same detector -> normalize -> classifier -> smoother chain as the
+live app, without a window, and writes one prediction per frame as JSONL or
+CSV. Long videos are split into frame-range chunks that a pool of worker
+processes analyzes in parallel; every worker builds its own ``handDetector``
+and ``GestureManager`` once and reuses them for all chunks it receives.
+
+The detector tracks hands from frame to frame, so it is reset at the start
+of every chunk: a chunk never continues from whichever chunk its worker
+ran before. Smoothing depends on the preceding frames too, so workers only
+return raw per-frame predictions and the smoother is run afterwards over
+the merged, in-order results. The output is therefore identical for any
+worker count.
+
+With a trace path, every worker records spans (model load, chunk, read,
+flip, detect, predict) and returns them with its rows; they are merged into
+one Chrome trace with a track per worker process.
+
+OpenCV, MediaPipe and TensorFlow are imported inside the worker functions
+only: the module itself stays importable (and testable) without them, and
+spawned workers don't pay for imports twice.
+"""
+
+import csv
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from gesture_recognition import config
+from gesture_recognition.services.gesture_smoothing import GestureSmoother
+from gesture_recognition.services.tracer import NULL_TRACER, Tracer
+
+OUTPUT_FIELDS = [
+    "video",
+    "frame",
+    "time",
+    "hand",
+    "gesture",
+    "confidence",
+    "smoothed",
+]
+
+# Per-process detector/classifier, created once by _init_worker
+_worker = {}
+
+
+def plan_chunks(frame_count, chunk_frames=config.ANALYZE_CHUNK_FRAMES):
+    """Split ``frame_count`` frames into ``[start, end)`` ranges."""
+    if chunk_frames < 1:
+        raise ValueError("chunk_frames must be at least 1")
+    return [
+        (start, min(start + chunk_frames, frame_count))
+        for start in range(0, frame_count, chunk_frames)
+    ]
+
+
+def _init_worker(model_path, names_path, normalize, flip, backend, trace=False):
+    tracer = Tracer(process_name=f"analyze worker {os.getpid()}") if trace else NULL_TRACER
+    _worker["tracer"] = tracer
+
+    with tracer.span("init detector", "init"):
+        from gesture_recognition.tracking.hand_detector import handDetector
+
+        _worker["detector"] = handDetector(
+            detectionCon=config.DETECTION_CONFIDENCE,
+            trackCon=config.TRACKING_CONFIDENCE,
+            maxHands=config.MAX_HANDS,
+            roi=config.ROI_TRACKING,
+        )
+    with tracer.span("init classifier", "init"):
+        from gesture_recognition.services.gesture_manager import GestureManager
+
+        _worker["manager"] = GestureManager(
+            model_path,
+            names_path,
+            backend=backend,
+            tflite_variant=config.TFLITE_VARIANT,
+            num_threads=config.TFLITE_THREADS,
+        )
+    _worker["normalize"] = normalize
+    _worker["flip"] = flip
+
+
+def _analyze_chunk(video, start, end):
+    """Return raw ``(frame, gesture, confidence)`` rows for one chunk.
+
+    ``gesture`` is ``None`` for frames without a detected hand. Returns
+    ``(rows, trace)`` where ``trace`` holds the worker's spans recorded
+    since the last chunk (see ``Tracer.drain``).
+    """
+    import cv2
+
+    from gesture_recognition.camera import FrameSource
+    from gesture_recognition.landmarks import normalize_landmarks_batch
+
+    detector = _worker["detector"]
+    manager = _worker["manager"]
+    tracer = _worker["tracer"]
+
+    rows = []
+    chunk = {"video": os.path.basename(video), "start": start, "end": end}
+    with tracer.span("chunk", "chunk", chunk), FrameSource(video) as source:
+        # Start from a clean tracking state, whichever chunk ran before
+        detector.reset()
+        source.seek(start)
+        while len(rows) < end - start:
+            with tracer.span("read"):
+                frame = source.read()
+            if frame is None:
+                break
+            image = frame.image
+            if _worker["flip"]:
+                with tracer.span("flip"):
+                    image = cv2.flip(image, 1)
+
+            with tracer.span("detect"):
+                detector.findHands(image, draw=False)
+                landmarks, _ = detector.findLandmarks(image)
+            if not len(landmarks):
+                rows.append((frame.seq, None, 0.0))
+                continue
+
+            with tracer.span("predict"):
+                landmarks = landmarks[:1, :, :2]
+                if _worker["normalize"]:
+                    landmarks = normalize_landmarks_batch(landmarks)
+                gesture, confidence = manager.predict_batch(landmarks)[0]
+            rows.append((frame.seq, gesture, confidence))
+    return rows, tracer.drain()
+
+
+def _video_info(video):
+    from gesture_recognition.camera import FrameSource
+
+    with FrameSource(video) as source:
+        return source.frame_count, source.fps
+
+
+def smooth_predictions(
+    video,
+    rows,
+    fps,
+    history_length,
+    confidence_threshold,
+    strategy=config.SMOOTHING_STRATEGY,
+):
+    """Turn merged raw rows into output records, applying the smoother.
+
+    Rows keep only the top class, so the averaging strategies average its
+    confidence rather than the full distribution.
+    """
+    smoother = GestureSmoother(
+        history_length=history_length,
+        confidence_threshold=confidence_threshold,
+        strategy=strategy,
+    )
+    records = []
+    for frame, gesture, confidence in rows:
+        hand = gesture is not None
+        smoothed = ""
+        if hand:
+            smoother.update(gesture, confidence)
+            smoothed = smoother.get_dominant_gesture()
+        records.append(
+            {
+                "video": video,
+                "frame": frame,
+                "time": round(frame / fps, 3) if fps else None,
+                "hand": hand,
+                "gesture": gesture or "",
+                "confidence": round(confidence, 4),
+                "smoothed": smoothed,
+            }
+        )
+    return records
+
+
+def write_predictions(records, path, fmt=None):
+    """Write records as JSON lines or CSV (format inferred from ``path``)."""
+    if fmt is None:
+        fmt = "csv" if path.lower().endswith(".csv") else "jsonl"
+
+    with open(path, "w", newline="") as f:
+        if fmt == "csv":
+            writer = csv.DictWriter(f, fieldnames=OUTPUT_FIELDS)
+            writer.writeheader()
+            writer.writerows(records)
+        elif fmt == "jsonl":
+            f.writelines(json.dumps(record) + "\n" for record in records)
+        else:
+            raise ValueError(f"Unknown output format: {fmt}")
+
+
+def analyze_videos(
+    videos,
+    model_path=None,
+    names_path=None,
+    normalize=False,
+    workers=None,
+    chunk_frames=config.ANALYZE_CHUNK_FRAMES,
+    flip=False,
+    backend=None,
+    trace_path=None,
+):
+    """Analyze ``videos`` and return the per-frame records, in order.
+
+    With ``trace_path``, writes a Chrome trace of all workers' spans there.
+    """
+    model_path = model_path or config.MODEL_PATH
+    names_path = names_path or config.GESTURE_NAMES_PATH
+    backend = backend or config.INFERENCE_BACKEND
+    init_args = (model_path, names_path, normalize, flip, backend, bool(trace_path))
+
+    jobs = []
+    owners = []  # index into ``videos`` of each job (paths may repeat)
+    fps = []
+    for index, video in enumerate(videos):
+        frame_count, video_fps = _video_info(video)
+        fps.append(video_fps)
+        for start, end in plan_chunks(frame_count, chunk_frames):
+            jobs.append((video, start, end))
+            owners.append(index)
+    if not jobs:
+        return []
+
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    print(
+        f"Analyzing {len(videos)} video(s) in {len(jobs)} chunk(s) "
+        f"with {workers} worker(s)"
+    )
+
+    if workers == 1:
+        _init_worker(*init_args)
+        results = [_analyze_chunk(*job) for job in jobs]
+    else:
+        # spawn, not fork: TensorFlow and MediaPipe don't survive forking a
+        # process that has already started their thread pools.
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=init_args,
+        ) as pool:
+            # map() yields results in submission order, i.e. frame order
+            results = list(pool.map(_analyze_chunk, *zip(*jobs)))
+
+    tracer = Tracer(process_name="analyze") if trace_path else NULL_TRACER
+    rows = [[] for _ in videos]
+    for index, (chunk_rows, trace) in zip(owners, results):
+        rows[index].extend(chunk_rows)
+        if trace_path:
+            tracer.merge(trace)
+
+    records = []
+    for index, video in enumerate(videos):
+        with tracer.span("smooth", args={"video": os.path.basename(video)}):
+            records.extend(
+                smooth_predictions(
+                    video,
+                    rows[index],
+                    fps[index],
+                    config.SMOOTHING_HISTORY_LENGTH,
+                    config.CONFIDENCE_THRESHOLD,
+                )
+            )
+    if trace_path:
+        spans = tracer.save(trace_path)
+        print(f"Wrote {spans} trace spans to {trace_path}")
+    return records
@@ -1,10 +1,21 @@
+import threading
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+
 import cv2
+from gesture_recognition.camera import FrameSource
 from gesture_recognition.tracking.hand_detector import handDetector
-from gesture_recognition.landmarks import normalize_landmarks
+from gesture_recognition.tracking.hand_tracker import HandTracker
+from gesture_recognition.tracking.landmark_filter import filtered_detector
+from gesture_recognition.landmarks import normalize_landmarks_batch
+from gesture_recognition.pipeline import Pipeline
 from gesture_recognition.services.gesture_manager import GestureManager
 from gesture_recognition.services.gesture_smoothing import GestureSmoother
 from gesture_recognition.services.audio_manager import AudioManager
 from gesture_recognition.services.performance_analyzer import PerformanceAnalyzer
+from gesture_recognition.services.ring_buffer import RingBuffer
+from gesture_recognition.services.tracer import NULL_TRACER, Tracer
 from gesture_recognition import config
 
 # After this many consecutive frames without a hand, the last announced
@@ -12,62 +23,265 @@ from gesture_recognition import config
 HAND_ABSENT_RESET_FRAMES = 30
 
 
+def _start_init(name, fn, init_times, tracer=NULL_TRACER):
+    """Run one startup step on its own thread; returns a Future of its result.
+
+    The thread is a daemon so that when another step fails, the app can exit
+    right away instead of waiting for (say) the model load to finish.
+    ``init_times[name]`` is set to the step's duration in seconds.
+    """
+    future = Future()
+
+    def run():
+        start = time.perf_counter()
+        try:
+            result = fn()
+        except BaseException as e:  # noqa: BLE001 - handed to the waiter
+            future.set_exception(e)
+        else:
+            end = time.perf_counter()
+            init_times[name] = end - start
+            tracer.add(f"init {name}", "init", start, end)
+            future.set_result(result)
+
+    threading.Thread(target=run, name=f"init-{name}", daemon=True).start()
+    return future
+
+
+def _release_camera(future):
+    if future.exception() is None:
+        future.result().release()
+
+
 class GestureRecognitionApp:
-    def __init__(self, profile=None, model_path=None, names_path=None, normalize=False):
+    def __init__(
+        self,
+        profile=None,
+        model_path=None,
+        names_path=None,
+        normalize=False,
+        pipelined=False,
+        backend=None,
+        metrics_port=None,
+        trace_path=None,
+    ):
         # Profile settings override config defaults when present
         self.profile = profile
 
         def setting(name, default):
             return profile.get(name, default) if profile is not None else default
 
-        # Model + class names. `normalize` must match how the model was
-        # trained: the bundled pretrained model expects raw pixel coordinates,
-        # models trained by GestureTrainer expect normalized landmarks.
-        self.gesture_manager = GestureManager(
-            model_path or config.MODEL_PATH,
-            names_path or config.GESTURE_NAMES_PATH,
-        )
-        self.normalize = normalize
-
-        # Initialize the camera
+        # Voice settings
+        self.enable_voice = setting("enable_voice", config.ENABLE_VOICE_DEFAULT)
+        self.voice_language = setting("voice_language", config.VOICE_LANGUAGE)
         self.camera_index = setting("camera_index", config.CAMERA_INDEX)
-        self.cap = self._open_camera()
+        self.normalize = normalize
 
-        # Initialize hand detector
-        self.detector = handDetector(
-            detectionCon=setting("detection_confidence", config.DETECTION_CONFIDENCE),
-            trackCon=config.TRACKING_CONFIDENCE,
-            maxHands=config.MAX_HANDS,
+        # With a trace path, every stage of every frame (plus startup and
+        # audio) is recorded as a span and written there on exit.
+        self.trace_path = trace_path
+        self.tracer = Tracer(process_name="recognize") if trace_path else NULL_TRACER
+
+        # The model load, camera open, MediaPipe graph build and audio setup
+        # are independent, so they run concurrently (startup takes the
+        # longest of them instead of their sum). Frames are shown as soon as
+        # the camera and detector are ready; the classifier may still be
+        # loading then, which the overlay reports. `normalize` must match how
+        # the model was trained: the bundled pretrained model expects raw
+        # pixel coordinates, models trained by GestureTrainer expect
+        # normalized landmarks.
+        self.init_times = {}
+        self.gesture_manager = None
+        self._classifier = _start_init(
+            "classifier",
+            lambda: GestureManager(
+                model_path or config.MODEL_PATH,
+                names_path or config.GESTURE_NAMES_PATH,
+                backend=backend or config.INFERENCE_BACKEND,
+                tflite_variant=config.TFLITE_VARIANT,
+                num_threads=config.TFLITE_THREADS,
+            ),
+            self.init_times,
+            self.tracer,
         )
+        parts = {
+            "camera": _start_init(
+                "camera", self._open_camera, self.init_times, self.tracer
+            ),
+            "detector": _start_init(
+                "detector",
+                lambda: filtered_detector(
+                    handDetector(
+                        detectionCon=setting(
+                            "detection_confidence", config.DETECTION_CONFIDENCE
+                        ),
+                        trackCon=config.TRACKING_CONFIDENCE,
+                        maxHands=config.MAX_HANDS,
+                        roi=config.ROI_TRACKING,
+                        # Pipelined mode keeps landmarks queued between stages
+                        # (queue + the frame in each stage) while the detector
+                        # fills the next frame's buffer.
+                        buffers=config.PIPELINE_QUEUE_SIZE + 2 if pipelined else 1,
+                    )
+                ),
+                self.init_times,
+                self.tracer,
+            ),
+            "audio": _start_init(
+                "audio",
+                lambda: AudioManager(
+                    cooldown_time=config.VOICE_COOLDOWN_TIME,
+                    cache_size=config.AUDIO_CACHE_SIZE,
+                    tracer=self.tracer,
+                ),
+                self.init_times,
+                self.tracer,
+            ),
+        }
+        self._wait_for_init(parts)
+        self.camera = parts["camera"].result()
+        self.detector = parts["detector"].result()
+        self.audio_manager = parts["audio"].result()
+        print(f"Ready to show frames: {self._format_init_times(parts)}")
+        try:
+            self._poll_classifier()
+        except BaseException:
+            self.camera.release()
+            raise
+
+        self.pipelined = pipelined
+        self._init_frame_state()
+
+        # Optional Prometheus endpoint, served from its own thread
+        self.metrics_server = None
+        if metrics_port is None:
+            metrics_port = config.METRICS_PORT
+        if metrics_port is not None:
+            from gesture_recognition.services.metrics_server import (
+                MetricsServer,
+                app_metrics,
+            )
 
-        # Voice settings
-        self.enable_voice = setting("enable_voice", config.ENABLE_VOICE_DEFAULT)
-        self.voice_language = setting("voice_language", config.VOICE_LANGUAGE)
-        self.audio_manager = AudioManager(
-            cooldown_time=config.VOICE_COOLDOWN_TIME, cache_size=config.AUDIO_CACHE_SIZE
+            self.metrics_server = MetricsServer(
+                lambda: app_metrics(self), metrics_port, config.METRICS_HOST
+            ).start()
+            print(
+                f"Serving metrics on http://{config.METRICS_HOST}:"
+                f"{self.metrics_server.port}/metrics"
+            )
+
+    @classmethod
+    def offline(cls, detector, gesture_manager, normalize=False):
+        """An app around ready-made components, without camera or windows.
+
+        For benchmarks and tests that call the per-frame methods
+        (``_detect``, ``_classify``, ``_draw_overlays``) directly. Startup
+        runs nothing in the background, voice is off and nothing is traced;
+        the per-frame state is the same as in ``__init__``.
+        """
+        app = cls.__new__(cls)
+        app.profile = None
+        app.enable_voice = False
+        app.voice_language = config.VOICE_LANGUAGE
+        app.normalize = normalize
+        app.trace_path = None
+        app.tracer = NULL_TRACER
+        app.init_times = {}
+        app.gesture_manager = gesture_manager
+        # Without a classifier, _classify returns None like a loading one
+        app._classifier = Future()
+        app._classifier.set_result(gesture_manager)
+        app.detector = detector
+        app.audio_manager = AudioManager(
+            cooldown_time=config.VOICE_COOLDOWN_TIME,
+            cache_size=config.AUDIO_CACHE_SIZE,
         )
+        app.metrics_server = None
+        app.pipelined = False
+        app._init_frame_state()
+        return app
+
+    def _init_frame_state(self):
+        """Set up the smoothing, dynamic-gesture, timing and counter state."""
+        # Every detected hand keeps an ID and its own gesture smoothing
+        self.hand_tracker = HandTracker(self._new_smoother)
+        self._primary_id = None  # the hand driving voice and dynamic gestures
+
+        # Dynamic gestures, streamed frame by frame alongside the static
+        # classifier; a recognized motion takes precedence over the pose
+        self.sequence_recognizer = None
+        if config.SEQUENCE_RECOGNITION:
+            from gesture_recognition.services.sequence_recognizer import (
+                SequenceRecognizer,
+            )
 
-        # Gesture smoothing
-        self.smoother = GestureSmoother(
+            self.sequence_recognizer = SequenceRecognizer.load(
+                config.SEQUENCE_MODEL_PATH
+            )
+
+        # Add performance analyzer. Every frame records capture, detect,
+        # predict, smooth and render timings; `p` toggles their breakdown
+        # in the overlay.
+        self.perf_analyzer = PerformanceAnalyzer(tracer=self.tracer)
+        self.show_timings = False
+
+        self.no_hand_frames = 0
+        # Counters for the metrics endpoint (each updated by one thread)
+        self.classified_frames = 0
+        self.hand_frames = 0
+        self.hand_presence = RingBuffer(config.METRICS_WINDOW)
+        self.prediction_counts = Counter()
+
+        # Pipelined mode runs capture, detection and classification on
+        # separate threads joined by bounded, stale-frame-dropping queues.
+        self.queue_size = config.PIPELINE_QUEUE_SIZE
+        self.pipeline = None
+        self.queue_stats = {}
+
+    @staticmethod
+    def _new_smoother():
+        return GestureSmoother(
             history_length=config.SMOOTHING_HISTORY_LENGTH,
             confidence_threshold=config.CONFIDENCE_THRESHOLD,
+            strategy=config.SMOOTHING_STRATEGY,
         )
 
-        # Add performance analyzer
-        self.perf_analyzer = PerformanceAnalyzer()
+    def _open_camera(self):
+        return FrameSource(self.camera_index).open()
 
-        self.no_hand_frames = 0
+    def _wait_for_init(self, parts):
+        """Block until every startup step in ``parts`` is done.
 
-    def _open_camera(self):
-        cap = cv2.VideoCapture(self.camera_index)
-        cap.set(cv2.CAP_PROP_FRAME_WIDTH, config.CAMERA_WIDTH)
-        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, config.CAMERA_HEIGHT)
-        if not cap.isOpened():
-            raise RuntimeError(
-                f"Could not open camera index {self.camera_index}. "
-                "Set GESTURE_CAM_INDEX or the profile's camera_index."
-            )
-        return cap
+        Fails fast: the first error from any step (the classifier included)
+        is raised as soon as it happens, without waiting for the others.
+        """
+        futures = [*parts.values(), self._classifier]
+        while True:
+            failed = [f for f in futures if f.done() and f.exception() is not None]
+            if failed:
+                # Release the camera now, or as soon as it finishes opening
+                parts["camera"].add_done_callback(_release_camera)
+                raise failed[0].exception()
+            if all(f.done() for f in parts.values()):
+                return
+            wait([f for f in futures if not f.done()], return_when=FIRST_COMPLETED)
+
+    def _format_init_times(self, names):
+        return ", ".join(
+            f"{name} {self.init_times[name]:.2f}s"
+            for name in names
+            if name in self.init_times
+        )
+
+    def _poll_classifier(self):
+        """Pick up the classifier once its background load has finished.
+
+        Re-raises the load error, if any, so a failed model stops the app.
+        """
+        if self.gesture_manager is None and self._classifier.done():
+            self.gesture_manager = self._classifier.result()
+            print(f"Classifier ready: {self._format_init_times(['classifier'])}")
+        return self.gesture_manager is not None
 
     def speak_gesture(self, gesture_name):
         """Generate and play audio for a gesture using the audio manager"""
@@ -77,100 +291,275 @@ class GestureRecognitionApp:
     def run(self):
         """Main application loop"""
         try:
-            self._loop()
+            if self.pipelined:
+                self._loop_pipelined()
+            else:
+                self._loop()
         finally:
             # Always release resources, even on error or Ctrl-C
-            self.cap.release()
+            self.camera.release()
             cv2.destroyAllWindows()
+            if self.metrics_server is not None:
+                self.metrics_server.stop()
+            cache = getattr(self.gesture_manager, "cache", None)
+            if cache is not None:
+                print(cache.format_stats())
+            if self.trace_path:
+                spans = self.tracer.save(self.trace_path)
+                print(f"Wrote {spans} trace spans to {self.trace_path}")
 
     def _loop(self):
+        frame_index = 0
         while True:
             self.perf_analyzer.start_frame()
 
-            # Read frame
-            success, frame = self.cap.read()
-            if not success:
-                print("Failed to capture image")
-                continue
+            with self.tracer.span("frame", args={"frame": frame_index}):
+                frame = self._capture()
+                if frame is None:
+                    continue
 
-            # Flip frame horizontally
-            frame = cv2.flip(frame, 1)
+                frame, landmarks, handedness = self._detect(frame)
+                prediction = self._classify(landmarks, handedness)
 
-            # Find hands
-            frame = self.detector.findHands(frame)
-            lmList = self.detector.findPosition(frame, draw=False)
+                if not self._present(frame, prediction):
+                    break
+            frame_index += 1
 
-            # Process hand if detected
-            if lmList:
-                self.no_hand_frames = 0
+    def _loop_pipelined(self):
+        """Run capture, detection and classification on worker threads.
 
-                # Convert landmarks to format expected by model
-                landmarks = [[lm[1], lm[2]] for lm in lmList]
-                if self.normalize:
-                    landmarks = normalize_landmarks(landmarks)
+        Each stage hands its output to the next through a bounded queue that
+        drops stale frames, so detection of frame N+1 overlaps with the
+        prediction and rendering of frame N. Presentation (imshow/waitKey)
+        stays on this thread because OpenCV windows must be driven from it.
+        """
+        self._start_pipeline()
+        self.perf_analyzer.start_frame()
+        try:
+            while True:
+                result = self.pipeline.get()
+                if result is None:
+                    continue
+                self.queue_stats = self.pipeline.queue_stats()
+
+                frame, prediction = result
+                if not self._present(frame, prediction):
+                    break
+                # Frames arrive already processed, so the frame time here is
+                # the interval between presented frames.
+                self.perf_analyzer.start_frame()
+        finally:
+            self.pipeline.stop()
+
+    def _start_pipeline(self):
+        self.pipeline = Pipeline(
+            self._capture,
+            [
+                ("detect", self._detect),
+                ("classify", lambda item: (item[0], self._classify(*item[1:]))),
+            ],
+            queue_size=self.queue_size,
+        )
+        self.pipeline.start()
+
+    def _capture(self):
+        """Read and mirror the newest camera frame (``None`` on failure)."""
+        with self.perf_analyzer.stage("capture"):
+            with self.tracer.span("read"):
+                frame = self.camera.read()
+            if frame is None:
+                if self.camera.finished:
+                    raise RuntimeError("Camera stopped delivering frames")
+                print("Failed to capture image")
+                return None
+            with self.tracer.span("flip"):
+                return cv2.flip(frame.image, 1)
+
+    def _detect(self, frame):
+        """Run hand detection; returns the annotated frame, landmarks and handedness.
+
+        ``landmarks`` is the detector's ``(hands, 21, 3)`` array and
+        ``handedness`` each hand's right-hand probability (see
+        ``handDetector.findLandmarks``).
+        """
+        with self.perf_analyzer.stage("detect"):
+            frame = self.detector.findHands(frame)
+            landmarks, handedness = self.detector.findLandmarks(frame)
+        return frame, landmarks, handedness
+
+    def _classify(self, landmarks, handedness=None):
+        """Predict and smooth the gesture of every hand in one frame.
+
+        All hands are classified in one batched model call, and each is
+        smoothed under its ``HandTracker`` ID. Returns a list of
+        ``(hand_id, smooth_gesture, confidence, anchor)``, one per hand, or
+        ``None`` when no hand was detected or the classifier is still
+        loading. The primary hand (tracked longest) drives voice feedback
+        and dynamic gestures.
+        """
+        if not self._poll_classifier():
+            return None
+
+        self.classified_frames += 1
+        hands = self.hand_tracker.update(landmarks, handedness)
+        if not hands:
+            self.hand_presence.append(0.0)
+            if self.sequence_recognizer is not None:
+                self.sequence_recognizer.reset()
+            # Re-announce the gesture if the hand left and came back
+            self.no_hand_frames += 1
+            if self.no_hand_frames == HAND_ABSENT_RESET_FRAMES:
+                self.audio_manager.reset_last_spoken()
+            return None
 
-                # Predict gesture
-                className, confidence = self.gesture_manager.predict_gesture(landmarks)
+        self.no_hand_frames = 0
+        self.hand_frames += 1
+        self.hand_presence.append(1.0)
+
+        primary = self.hand_tracker.primary
+        motion = None
+        if self.sequence_recognizer is not None:
+            # A motion belongs to one hand: start over when that hand changes
+            if primary.id != self._primary_id:
+                self.sequence_recognizer.reset()
+            with self.perf_analyzer.stage("sequence"):
+                motion = self.sequence_recognizer.update(
+                    primary.landmarks[:, :2], time.monotonic()
+                )
+        self._primary_id = primary.id
 
-                # Update gesture history
-                self.smoother.update(className, confidence)
-                smooth_gesture = self.smoother.get_dominant_gesture()
+        with self.perf_analyzer.stage("predict"):
+            # The model takes the x, y pixel coordinates of each hand; all
+            # hands go in one batch
+            batch = landmarks[:, :, :2]
+            if self.normalize:
+                batch = normalize_landmarks_batch(batch)
 
-                # Voice feedback
-                if smooth_gesture:
-                    self.speak_gesture(smooth_gesture)
+            predictions = self.gesture_manager.predict_batch(
+                batch, distributions=hands[0].smoother.uses_probabilities
+            )
 
-                # Display prediction
+        # Update each hand's gesture history
+        with self.perf_analyzer.stage("smooth"):
+            for hand, prediction in zip(hands, predictions):
+                self.prediction_counts[prediction[0]] += 1
+                hand.update_prediction(prediction)
+
+        results = [
+            (hand.id, hand.gesture, hand.confidence, hand.anchor) for hand in hands
+        ]
+        smooth_gesture = primary.gesture
+        if motion is not None and motion[0]:
+            smooth_gesture = motion[0]
+            i = hands.index(primary)
+            results[i] = (primary.id, *motion, primary.anchor)
+
+        # Voice feedback
+        if smooth_gesture:
+            with self.tracer.span("speak"):
+                self.speak_gesture(smooth_gesture)
+
+        return results
+
+    def _present(self, frame, prediction):
+        """Draw overlays, show the frame and handle key presses.
+
+        Returns ``False`` when the user asked to quit.
+        """
+        with self.perf_analyzer.stage("render"):
+            with self.tracer.span("draw"):
+                frame = self._draw_overlays(frame, prediction)
+
+            # Show frame (waitKey is where most backends actually paint it)
+            with self.tracer.span("imshow/waitKey"):
+                cv2.imshow("Hand Gesture Recognition", frame)
+                key = cv2.waitKey(1)
+
+        # End frame timing
+        self.perf_analyzer.end_frame()
+
+        # Handle key presses
+        if key == ord("q"):
+            return False
+        elif key == ord("p"):
+            self.show_timings = not self.show_timings
+        elif key == ord("v"):
+            self.enable_voice = not self.enable_voice
+            print(f"Voice feedback {'enabled' if self.enable_voice else 'disabled'}")
+        elif key == ord("r"):
+            # Pause the app and start recording mode. Release the camera
+            # first — the recorder opens it itself, and most platforms
+            # can't open the same camera twice.
+            if self.pipelined:
+                self.pipeline.stop()
+            cv2.destroyWindow("Hand Gesture Recognition")
+            self.camera.release()
+            from gesture_recognition.recorder import record_gesture
+
+            record_gesture()
+            # Resume the app when recording is done
+            self.camera = self._open_camera()
+            if self.pipelined:
+                self._start_pipeline()
+        return True
+
+    def _draw_overlays(self, frame, prediction):
+        """Draw the prediction, UI and performance overlays on ``frame``."""
+        if prediction is not None:
+            # Each hand's label above its bounding box, with the hand's ID
+            # when there are several
+            for hand_id, smooth_gesture, confidence, (x, y) in prediction:
+                label = f"{smooth_gesture} ({confidence:.2f})"
+                if len(prediction) > 1:
+                    label = f"{hand_id}: {label}"
                 cv2.putText(
                     frame,
-                    f"{smooth_gesture} ({confidence:.2f})",
-                    (10, 50),
+                    label,
+                    (x, max(y - 10, 30)),
                     config.FONT,
                     config.FONT_SCALE,
                     config.FONT_COLOR,
                     config.FONT_THICKNESS,
                 )
-            else:
-                # Re-announce the gesture if the hand left and came back
-                self.no_hand_frames += 1
-                if self.no_hand_frames == HAND_ABSENT_RESET_FRAMES:
-                    self.audio_manager.reset_last_spoken()
-
-            # Display UI elements
-            self.draw_ui(frame)
-
-            # Before displaying the frame
-            frame = self.perf_analyzer.draw_metrics(frame)
-
-            # End frame timing
-            self.perf_analyzer.end_frame()
-
-            # Show frame
-            cv2.imshow("Hand Gesture Recognition", frame)
-
-            # Handle key presses
-            key = cv2.waitKey(1)
-            if key == ord("q"):
-                break
-            elif key == ord("v"):
-                self.enable_voice = not self.enable_voice
-                print(
-                    f"Voice feedback {'enabled' if self.enable_voice else 'disabled'}"
-                )
-            elif key == ord("r"):
-                # Pause the app and start recording mode. Release the camera
-                # first — the recorder opens it itself, and most platforms
-                # can't open the same camera twice.
-                cv2.destroyWindow("Hand Gesture Recognition")
-                self.cap.release()
-                from gesture_recognition.recorder import record_gesture
-
-                record_gesture()
-                # Resume the app when recording is done
-                self.cap = self._open_camera()
+
+        # Display UI elements
+        self.draw_ui(frame)
+
+        # Before displaying the frame
+        return self.perf_analyzer.draw_metrics(frame, breakdown=self.show_timings)
 
     def draw_ui(self, frame):
         """Draw UI elements on the frame"""
+        if self.gesture_manager is None:
+            cv2.putText(
+                frame,
+                "Loading classifier...",
+                (10, 50),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                0.8,
+                (0, 255, 255),
+                2,
+                cv2.LINE_AA,
+            )
+
+        # Queue fill levels (pipelined mode only)
+        if self.queue_stats:
+            fill = "  ".join(
+                f"{name} {size}/{maxsize}"
+                for name, (size, maxsize, _) in self.queue_stats.items()
+            )
+            dropped = sum(dropped for _, _, dropped in self.queue_stats.values())
+            cv2.putText(
+                frame,
+                f"Queues: {fill}  dropped: {dropped}",
+                (10, frame.shape[0] - 90),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                0.5,
+                (255, 255, 255),
+                1,
+                cv2.LINE_AA,
+            )
+
         # Voice status
         status = "ON" if self.enable_voice else "OFF"
         cv2.putText(
@@ -187,7 +576,7 @@ class GestureRecognitionApp:
         # Instructions
         cv2.putText(
             frame,
-            "Press 'v' to toggle voice, 'r' to record, 'q' to quit",
+            "Press 'v' to toggle voice, 'p' timings, 'r' to record, 'q' to quit",
             (10, frame.shape[0] - 30),
             cv2.FONT_HERSHEY_SIMPLEX,
             0.6,
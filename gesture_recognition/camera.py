@@ -0,0 +1,270 @@
+"""Camera / video frame source shared by the recognizer, recorder and scripts.
+
+``cap.read()`` on a raw ``cv2.VideoCapture`` can return a frame that has been
+sitting in the driver's buffer for several frame intervals. ``FrameSource``
+instead grabs frames continuously on a background thread and only ever serves
+the newest one, tagged with a monotonic capture timestamp and a sequence
+number so consumers can measure latency and notice skipped frames.
+"""
+
+import threading
+import time
+from collections import namedtuple
+
+import cv2
+
+from gesture_recognition import config
+
+# One captured frame. ``timestamp`` is ``time.monotonic()`` taken right after
+# the frame was grabbed; ``seq`` counts grabbed frames from 0, so a gap in
+# consecutive ``seq`` values means frames were skipped.
+Frame = namedtuple("Frame", ["image", "timestamp", "seq"])
+
+# Capture modes tried during negotiation. MJPG usually lets USB webcams run
+# at full frame rate at higher resolutions; YUYV is the uncompressed fallback.
+FOURCC_CANDIDATES = ("MJPG", "YUYV")
+FPS_CANDIDATES = (60, 30)
+
+# Frames timed per candidate mode while negotiating
+PROBE_FRAMES = 4
+
+# Consecutive failed grabs before a camera is considered gone
+MAX_FAILED_GRABS = 50
+
+
+def decode_fourcc(value):
+    """Turn the float returned by ``CAP_PROP_FOURCC`` back into a string."""
+    code = int(value)
+    return "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4))
+
+
+def _probe_frame_interval(cap, frames=PROBE_FRAMES):
+    """Median seconds between grabbed frames, or ``None`` if grabbing fails."""
+    if not cap.grab():
+        return None
+    stamps = [time.monotonic()]
+    for _ in range(frames):
+        if not cap.grab():
+            return None
+        stamps.append(time.monotonic())
+    intervals = sorted(stamps[i + 1] - stamps[i] for i in range(frames))
+    return intervals[len(intervals) // 2]
+
+
+def _set_mode(cap, fourcc, fps, size):
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+    cap.set(cv2.CAP_PROP_FPS, fps)
+    if size is not None:
+        set_frame_size(cap, *size)
+
+
+def set_frame_size(cap, width, height):
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+
+
+def negotiate_mode(
+    cap, fourccs=FOURCC_CANDIDATES, fps_options=FPS_CANDIDATES, size=None
+):
+    """Pick the lowest-latency capture mode the device supports.
+
+    Shrinks the driver buffer to one frame where the backend allows it, then
+    tries each FOURCC / FPS combination. Modes the device silently ignores
+    (read-back FOURCC differs) are skipped; of the rest, the one with the
+    shortest measured interval between frames wins and is applied. Some
+    backends reset the frame size on a FOURCC change, so a ``(width,
+    height)`` ``size`` is set again after each one, and modes are timed at
+    that size.
+
+    Returns a dict describing the chosen mode (values as reported by the
+    device), or ``None`` if no candidate could be verified.
+    """
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+    best = None
+    for fourcc in fourccs:
+        for fps in fps_options:
+            _set_mode(cap, fourcc, fps, size)
+            if decode_fourcc(cap.get(cv2.CAP_PROP_FOURCC)) != fourcc:
+                continue
+            interval = _probe_frame_interval(cap)
+            if interval is not None and (best is None or interval < best[2]):
+                best = (fourcc, fps, interval)
+
+    if best is None:
+        return None
+
+    fourcc, fps, interval = best
+    _set_mode(cap, fourcc, fps, size)
+    return {
+        "fourcc": decode_fourcc(cap.get(cv2.CAP_PROP_FOURCC)),
+        "fps": cap.get(cv2.CAP_PROP_FPS),
+        "buffer_size": cap.get(cv2.CAP_PROP_BUFFERSIZE),
+        "frame_interval": interval,
+    }
+
+
+class FrameSource:
+    """Serve frames from a camera index or a video file.
+
+    Cameras are read on a background thread and :meth:`read` returns only
+    the newest frame (older ones are counted in ``dropped``). Video files are
+    read sequentially by default so every frame is delivered, which makes the
+    class usable in tests and offline processing; pass ``latest_only=True``
+    to simulate a live source from a file.
+    """
+
+    def __init__(
+        self,
+        source=None,
+        width=None,
+        height=None,
+        latest_only=None,
+        negotiate=None,
+    ):
+        if source is None:
+            source = config.CAMERA_INDEX
+        # Numeric strings (e.g. from the CLI or env) are camera indices
+        if isinstance(source, str) and source.isdigit():
+            source = int(source)
+        self.source = source
+        self.is_camera = isinstance(source, int)
+        self.width = width or config.CAMERA_WIDTH
+        self.height = height or config.CAMERA_HEIGHT
+        self.latest_only = self.is_camera if latest_only is None else latest_only
+        if negotiate is None:
+            negotiate = config.CAMERA_NEGOTIATE
+        self.negotiate = negotiate and self.is_camera
+
+        self.cap = None
+        self.mode = None
+        self.dropped = 0
+        self.finished = False
+
+        self._seq = 0
+        self._latest = None
+        self._last_served = -1
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def open(self):
+        """Open the device/file and start the grab thread if needed."""
+        self.cap = cv2.VideoCapture(self.source)
+        if not self.cap.isOpened():
+            raise RuntimeError(
+                f"Could not open video source {self.source!r}. "
+                "Set GESTURE_CAM_INDEX or the profile's camera_index."
+            )
+        if self.is_camera:
+            size = (self.width, self.height)
+            if self.negotiate:
+                self.mode = negotiate_mode(self.cap, size=size)
+            # After negotiating: a FOURCC change may reset the size
+            set_frame_size(self.cap, *size)
+
+        if self.latest_only:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._grab_loop, name="frame-source", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    @property
+    def fps(self):
+        """Frame rate reported by the device or file (0 if unknown)."""
+        return self.cap.get(cv2.CAP_PROP_FPS) if self.cap is not None else 0.0
+
+    @property
+    def frame_count(self):
+        """Number of frames in a video file (0 or -1 for live cameras)."""
+        return int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT)) if self.cap else 0
+
+    def read(self, timeout=1.0):
+        """Return the next :class:`Frame`, or ``None`` on timeout / end.
+
+        In latest-only mode this waits for a frame newer than the last one
+        returned, so the same frame is never processed twice.
+        """
+        if not self.latest_only:
+            return self._grab()
+
+        with self._cond:
+            deadline = time.monotonic() + timeout
+            while self._latest is None or self._latest.seq <= self._last_served:
+                remaining = deadline - time.monotonic()
+                if self.finished or remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            frame = self._latest
+            self._last_served = frame.seq
+            return frame
+
+    def seek(self, index):
+        """Jump to frame ``index`` of a sequentially read video file.
+
+        Sequence numbers continue from ``index``, so they stay equal to the
+        frame's position in the file.
+        """
+        if self.is_camera or self.latest_only:
+            raise ValueError("seek() is only supported for sequential files")
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+        self._seq = index
+        self.finished = False
+
+    def release(self):
+        """Stop the grab thread and release the device."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+    def _grab(self):
+        if self.cap is None or not self.cap.grab():
+            if not self.is_camera:
+                self.finished = True
+            return None
+        timestamp = time.monotonic()
+        success, image = self.cap.retrieve()
+        if not success:
+            return None
+        frame = Frame(image, timestamp, self._seq)
+        self._seq += 1
+        return frame
+
+    def _grab_loop(self):
+        # Files have no real-time pacing of their own; play them back at
+        # their nominal frame rate so they behave like a live camera.
+        interval = 1.0 / self.fps if not self.is_camera and self.fps > 0 else 0.0
+        next_due = time.monotonic()
+        failed = 0
+        while not self._stop.is_set():
+            if interval:
+                next_due += interval
+                time.sleep(max(0.0, next_due - time.monotonic()))
+            frame = self._grab()
+            if frame is None:
+                failed += 1
+                if self.finished or failed >= MAX_FAILED_GRABS:
+                    break
+                continue
+            failed = 0
+            with self._cond:
+                if self._latest is not None and self._latest.seq > self._last_served:
+                    self.dropped += 1
+                self._latest = frame
+                self._cond.notify_all()
+
+        with self._cond:
+            self.finished = True
+            self._cond.notify_all()
@@ -2,7 +2,6 @@
 Configuration settings for the Hand Gesture Recognition application.
 """
 
-import cv2
 import os
 
 # Project root (the directory containing this package). Data and model paths are
@@ -19,15 +18,75 @@ def get_env(key, default):
 CAMERA_INDEX = int(get_env("GESTURE_CAM_INDEX", "0"))
 CAMERA_WIDTH = int(get_env("GESTURE_CAM_WIDTH", "640"))
 CAMERA_HEIGHT = int(get_env("GESTURE_CAM_HEIGHT", "480"))
+# Probe FOURCC / FPS / buffer-size settings on open and keep the mode with the
+# lowest frame latency (see gesture_recognition.camera.negotiate_mode)
+CAMERA_NEGOTIATE = get_env("GESTURE_CAM_NEGOTIATE", "True").lower() == "true"
 
 # Hand detection settings
 MAX_HANDS = int(get_env("GESTURE_MAX_HANDS", "1"))
 DETECTION_CONFIDENCE = float(get_env("GESTURE_DETECTION_CONF", "0.7"))
 TRACKING_CONFIDENCE = float(get_env("GESTURE_TRACKING_CONF", "0.5"))
 
+# ROI tracking: while a hand is tracked, process only a square crop around
+# its last landmarks (padded by ROI_PADDING times the hand size on each
+# side), resized to ROI_SIZE pixels, instead of the whole frame. The full
+# frame is searched when the hand is lost or reaches the crop's edge, and
+# every ROI_REFRESH_FRAMES frames to pick up other hands.
+ROI_TRACKING = get_env("GESTURE_ROI_TRACKING", "False").lower() == "true"
+ROI_SIZE = int(get_env("GESTURE_ROI_SIZE", "256"))
+ROI_PADDING = float(get_env("GESTURE_ROI_PADDING", "0.5"))
+ROI_REFRESH_FRAMES = int(get_env("GESTURE_ROI_REFRESH", "30"))
+
+# Detection skipping: run the hand detector at least every DETECT_INTERVAL
+# frames (1 = every frame, skipping off) and predict the landmarks with
+# LANDMARK_FILTER ("one_euro" or "kalman") in between. Detection runs early
+# when the predicted movement since the last detection exceeds
+# DETECT_MAX_MOTION times the hand size, or the last detection's
+# confidence is below DETECT_MIN_CONFIDENCE.
+DETECT_INTERVAL = int(get_env("GESTURE_DETECT_INTERVAL", "1"))
+LANDMARK_FILTER = get_env("GESTURE_LANDMARK_FILTER", "one_euro")
+DETECT_MAX_MOTION = float(get_env("GESTURE_DETECT_MAX_MOTION", "0.1"))
+DETECT_MIN_CONFIDENCE = float(get_env("GESTURE_DETECT_MIN_CONFIDENCE", "0.6"))
+
+# Multiple hands (MAX_HANDS > 1): each hand keeps an ID and its own gesture
+# smoothing across frames. A detection continues a tracked hand when their
+# mean landmark distance is at most HAND_MATCH_DISTANCE hand sizes; the
+# difference of their right-hand probabilities, times HAND_HANDEDNESS_WEIGHT,
+# breaks ties. A hand missing for more than HAND_MAX_MISSED frames is dropped.
+HAND_MATCH_DISTANCE = float(get_env("GESTURE_HAND_MATCH_DISTANCE", "1.0"))
+HAND_HANDEDNESS_WEIGHT = float(get_env("GESTURE_HAND_HANDEDNESS_WEIGHT", "0.5"))
+HAND_MAX_MISSED = int(get_env("GESTURE_HAND_MAX_MISSED", "5"))
+
 # Model settings
 MODEL_PATH = get_env("GESTURE_MODEL_PATH", os.path.join(BASE_DIR, "models", "mp_hand_gesture"))
 GESTURE_NAMES_PATH = get_env("GESTURE_NAMES_PATH", os.path.join(BASE_DIR, "data", "gesture.names"))
+# Inference backend. "keras" runs the SavedModel with TensorFlow; "numpy"
+# runs weights exported with `main.py export-npz` and never imports
+# TensorFlow; "tflite" runs a model converted with `main.py export-tflite`.
+INFERENCE_BACKENDS = ("keras", "numpy", "tflite")
+INFERENCE_BACKEND = get_env("GESTURE_BACKEND", "keras")
+# TFLite backend: which converted variant to load (float32/float16/int8, see
+# `main.py export-tflite`) and how many interpreter threads to use
+TFLITE_VARIANT = get_env("GESTURE_TFLITE_VARIANT", "int8")
+TFLITE_THREADS = int(get_env("GESTURE_TFLITE_THREADS", "1"))
+
+# Prediction memo: reuse the classifier output for inputs that round to the
+# same grid cell (PREDICTION_CACHE_STEP, in model input units) as a recent
+# one. Up to PREDICTION_CACHE_SIZE cells are kept (0 = off).
+PREDICTION_CACHE_SIZE = int(get_env("GESTURE_PREDICTION_CACHE", "0"))
+PREDICTION_CACHE_STEP = float(get_env("GESTURE_PREDICTION_CACHE_STEP", "0.05"))
+
+# Dynamic gestures (`train --sequences`): when SEQUENCE_RECOGNITION is on,
+# recognize also streams the primary hand's landmarks through the sequence
+# model at SEQUENCE_MODEL_PATH (.npz weights + _gestures.txt names), stepped
+# SEQUENCE_FPS times a second like its training data. SEQUENCE_IDLE_CLASS
+# is the recorded "no gesture" class, which is never shown.
+SEQUENCE_RECOGNITION = get_env("GESTURE_SEQUENCES", "False").lower() == "true"
+SEQUENCE_MODEL_PATH = get_env(
+    "GESTURE_SEQUENCE_MODEL_PATH", os.path.join(BASE_DIR, "models", "sequence_model")
+)
+SEQUENCE_FPS = float(get_env("GESTURE_SEQUENCE_FPS", "30"))
+SEQUENCE_IDLE_CLASS = get_env("GESTURE_SEQUENCE_IDLE", "idle")
 
 # Voice feedback settings
 ENABLE_VOICE_DEFAULT = get_env("GESTURE_VOICE_ENABLED", "False").lower() == "true"
@@ -36,7 +95,7 @@ VOICE_LANGUAGE = get_env("GESTURE_VOICE_LANG", "en")
 AUDIO_CACHE_SIZE = int(get_env("GESTURE_AUDIO_CACHE_SIZE", "20"))
 
 # UI settings
-FONT = cv2.FONT_HERSHEY_SIMPLEX
+FONT = 0  # cv2.FONT_HERSHEY_SIMPLEX; a literal so config doesn't import cv2
 FONT_COLOR = (0, 0, 255)  # Red (BGR)
 FONT_SCALE = 1
 FONT_THICKNESS = 2
@@ -44,3 +103,48 @@ FONT_THICKNESS = 2
 # Advanced settings
 SMOOTHING_HISTORY_LENGTH = int(get_env("GESTURE_SMOOTHING_LENGTH", "15"))
 CONFIDENCE_THRESHOLD = float(get_env("GESTURE_CONFIDENCE_THRESHOLD", "0.5"))
+
+# Gesture smoothing strategy: "majority" (vote over the last
+# SMOOTHING_HISTORY_LENGTH frames), "weighted" (confidence-weighted vote),
+# "ema" (moving average of the class probabilities with factor
+# SMOOTHING_ALPHA) or "hysteresis" (the same average, shown from
+# SMOOTHING_ENTER_THRESHOLD until it drops below SMOOTHING_EXIT_THRESHOLD).
+# The averaging strategies react in a few frames instead of half a window.
+SMOOTHING_STRATEGY = get_env("GESTURE_SMOOTHING_STRATEGY", "majority")
+SMOOTHING_ALPHA = float(get_env("GESTURE_SMOOTHING_ALPHA", "0.25"))
+SMOOTHING_ENTER_THRESHOLD = float(get_env("GESTURE_SMOOTHING_ENTER", "0.6"))
+SMOOTHING_EXIT_THRESHOLD = float(get_env("GESTURE_SMOOTHING_EXIT", "0.35"))
+
+# Pipelined recognition (`recognize --pipelined`): capacity of each queue
+# between stages. Small queues keep latency low; full queues drop the oldest
+# frame instead of building a backlog.
+PIPELINE_QUEUE_SIZE = int(get_env("GESTURE_PIPELINE_QUEUE_SIZE", "2"))
+
+# Metrics endpoint (`recognize --metrics-port`): Prometheus text format at
+# http://METRICS_HOST:port/metrics. No port (the default) disables it; the
+# host defaults to loopback so the endpoint isn't exposed on the network.
+METRICS_PORT = int(get_env("GESTURE_METRICS_PORT", "") or 0) or None
+METRICS_HOST = get_env("GESTURE_METRICS_HOST", "127.0.0.1")
+# Frames over which the hand-present ratio is computed
+METRICS_WINDOW = int(get_env("GESTURE_METRICS_WINDOW", "300"))
+
+# Tracing (`--trace out.json`): spans kept in memory; the oldest are dropped
+# when the buffer is full. ~10 spans per frame at 30 fps is ~10 minutes.
+TRACE_BUFFER_EVENTS = int(get_env("GESTURE_TRACE_EVENTS", "200000"))
+
+# Sampling CPU profiler (`--profile-cpu out.txt`): how long to sample
+# (0 = until exit), the sampling interval and the size of the hot-function
+# summary
+PROFILE_SECONDS = float(get_env("GESTURE_PROFILE_SECONDS", "30"))
+PROFILE_INTERVAL = float(get_env("GESTURE_PROFILE_INTERVAL_MS", "10")) / 1000
+PROFILE_TOP = int(get_env("GESTURE_PROFILE_TOP", "20"))
+
+# Offline analysis (`analyze`): frames per work chunk. 30 s of 30 fps video
+# is long enough that the per-chunk seek and tracker warm-up are negligible,
+# short enough to balance across workers.
+ANALYZE_CHUNK_FRAMES = int(get_env("GESTURE_ANALYZE_CHUNK_FRAMES", "900"))
+
+# Architecture sweep (`train --sweep`): cross-validation folds, and how far
+# (absolute accuracy) below the best candidate the chosen, smaller model may be
+SWEEP_FOLDS = int(get_env("GESTURE_SWEEP_FOLDS", "5"))
+SWEEP_ACCURACY_MARGIN = float(get_env("GESTURE_SWEEP_MARGIN", "0.01"))
@@ -7,12 +7,21 @@ without installing the heavy ML dependencies.
 import json
 import os
 
-from gesture_recognition.landmarks import normalize_landmarks
+import numpy as np
+
+from gesture_recognition.landmark_store import STORE_DIRNAME, LandmarkStore
+from gesture_recognition.landmarks import (
+    NORMALIZATION_VERSION,
+    normalize_landmarks_batch,
+)
 
 # Recordings are saved as <gesture_name>_<YYYYmmdd>_<HHMMSS>.json, so the
 # timestamp is always the last two underscore-separated parts.
 TIMESTAMP_PARTS = 2
 
+# Parsed-recording cache inside a recordings directory
+CACHE_DIRNAME = ".cache"
+
 
 def gesture_name_from_filename(filename):
     """Extract the gesture name from a recording filename.
@@ -24,30 +33,225 @@ def gesture_name_from_filename(filename):
     return stem.rsplit("_", TIMESTAMP_PARTS)[0]
 
 
-def load_samples(data_dir, normalize=True):
-    """Load all recorded samples from ``data_dir``.
+def recording_files(data_dir):
+    """Sorted JSON recording filenames in ``data_dir``."""
+    return sorted(f for f in os.listdir(data_dir) if f.endswith(".json"))
 
-    Files are processed in sorted order so the label indices are reproducible
-    across runs. Returns ``(x, y, gestures)`` where ``x`` is a list of
-    landmark samples, ``y`` the matching label indices, and ``gestures`` the
-    ordered label names.
+
+def open_store(data_dir):
+    """Return the ``LandmarkStore`` of ``data_dir``, or ``None`` if it has none.
+
+    Warns about JSON recordings that aren't in the store yet.
     """
-    x, y, gestures = [], [], []
+    path = os.path.join(data_dir, STORE_DIRNAME)
+    if not LandmarkStore.exists(path):
+        return None
+    store = LandmarkStore(path)
+    missing = [
+        f
+        for f in recording_files(data_dir)
+        if not store.has_session(os.path.splitext(f)[0])
+    ]
+    if missing:
+        print(
+            f"Warning: {len(missing)} recording(s) in {data_dir} are not in the "
+            "sample store; run 'main.py dataset convert' to add them"
+        )
+    return store
+
+
+def convert_recordings(data_dir):
+    """Copy JSON recordings into the binary store of ``data_dir``.
+
+    Creates the store if needed. Recordings already in the store are
+    skipped, so this can be re-run to pick up new ones. Returns
+    ``(sessions, samples)`` added.
+    """
+    store = LandmarkStore(os.path.join(data_dir, STORE_DIRNAME))
+    sessions = samples = 0
+    for filename in recording_files(data_dir):
+        session = os.path.splitext(filename)[0]
+        if store.has_session(session):
+            continue
+        data = _read_recording(os.path.join(data_dir, filename))
+        samples += store.append(data, gesture_name_from_filename(filename), session)
+        sessions += 1
+    return sessions, samples
+
+
+class SampleCache:
+    """Persistent cache of parsed (and optionally normalized) recordings.
+
+    Each recording's samples are kept as a ``.npy`` file under
+    ``<data_dir>/.cache/``, indexed by ``index.json``. An entry is reused only
+    while the recording's size and mtime and the normalization version are
+    unchanged, so editing or re-recording a file re-parses just that file.
+    Cache write failures (e.g. a read-only data directory) are ignored.
+    """
+
+    def __init__(self, data_dir):
+        self.data_dir = os.fspath(data_dir)
+        self.path = os.path.join(self.data_dir, CACHE_DIRNAME)
+        self.index_path = os.path.join(self.path, "index.json")
+        self.index = {}
+        self.dirty = False
+        try:
+            with open(self.index_path) as f:
+                self.index = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    @staticmethod
+    def _key(filename, normalize):
+        return f"{filename}:{'normalized' if normalize else 'raw'}"
+
+    def _signature(self, filename, normalize):
+        stat = os.stat(os.path.join(self.data_dir, filename))
+        return {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "normalization_version": NORMALIZATION_VERSION if normalize else None,
+        }
+
+    def _array_path(self, key):
+        return os.path.join(self.path, key.replace(":", ".") + ".npy")
+
+    def get(self, filename, normalize):
+        """Cached samples of ``filename``, or ``None`` if missing or stale."""
+        key = self._key(filename, normalize)
+        if self.index.get(key) != self._signature(filename, normalize):
+            return None
+        try:
+            return np.load(self._array_path(key))
+        except (OSError, ValueError):
+            return None
+
+    def put(self, filename, normalize, samples):
+        key = self._key(filename, normalize)
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            np.save(self._array_path(key), samples)
+        except OSError:
+            return
+        self.index[key] = self._signature(filename, normalize)
+        self.dirty = True
+
+    def evict(self, filenames):
+        """Drop entries of recordings that are no longer in ``filenames``."""
+        keep = set(filenames)
+        for key in list(self.index):
+            if key.rsplit(":", 1)[0] not in keep:
+                del self.index[key]
+                self.dirty = True
+                try:
+                    os.remove(self._array_path(key))
+                except OSError:
+                    pass
+
+    def save(self):
+        if not self.dirty:
+            return
+        try:
+            tmp_path = f"{self.index_path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self.index, f)
+            os.replace(tmp_path, self.index_path)
+        except OSError:
+            pass
+        self.dirty = False
 
-    files = sorted(f for f in os.listdir(data_dir) if f.endswith(".json"))
-    for filename in files:
+
+def _read_recording(path):
+    with open(path, "r") as f:
+        samples = np.asarray(json.load(f), dtype=np.float32)
+    return samples.reshape(len(samples), 21, -1) if len(samples) else samples
+
+
+def _load_recordings(data_dir, normalize, cache):
+    """``(x, y, sessions, gestures)`` from the JSON recordings of ``data_dir``.
+
+    ``sessions`` holds the index of each sample's recording file.
+    """
+    files = recording_files(data_dir)
+    sample_cache = SampleCache(data_dir) if cache else None
+
+    chunks, labels, sessions, gestures = [], [], [], []
+    for session, filename in enumerate(files):
         gesture_name = gesture_name_from_filename(filename)
         if gesture_name not in gestures:
             gestures.append(gesture_name)
         label = gestures.index(gesture_name)
 
-        with open(os.path.join(data_dir, filename), "r") as f:
-            samples = json.load(f)
+        samples = sample_cache.get(filename, normalize) if cache else None
+        if samples is None:
+            samples = _read_recording(os.path.join(data_dir, filename))
+            if normalize and len(samples):
+                samples = normalize_landmarks_batch(samples)
+            if cache:
+                sample_cache.put(filename, normalize, samples)
+        if not len(samples):
+            continue
+        chunks.append(samples)
+        labels.append(np.full(len(samples), label))
+        sessions.append(np.full(len(samples), session))
+
+    if cache:
+        sample_cache.evict(files)
+        sample_cache.save()
+
+    if not chunks:
+        empty = np.zeros(0, int)
+        return np.zeros((0, 21, 2), np.float32), empty, empty, gestures
+    return (
+        np.concatenate(chunks),
+        np.concatenate(labels),
+        np.concatenate(sessions),
+        gestures,
+    )
+
+
+def load_sample_arrays(data_dir, normalize=True, cache=True):
+    """Load all recorded samples from ``data_dir`` as arrays.
 
-        for sample in samples:
-            if normalize:
-                sample = normalize_landmarks(sample)
-            x.append(sample)
-            y.append(label)
+    Files are processed in sorted order so the label indices are reproducible
+    across runs. Returns ``(x, y, gestures)`` where ``x`` is a contiguous
+    float32 ``(N, 21, 2)`` array of landmark samples, ``y`` an int array of
+    the matching label indices, and ``gestures`` the ordered label names.
+    Each file is converted and normalized as one array, so there is no
+    per-sample Python work, and with ``cache`` the result is kept in a
+    ``SampleCache`` so later runs only parse new or changed recordings.
 
+    If ``data_dir`` has a binary store (see ``main.py dataset convert``), the
+    samples are read from it instead of the JSON files.
+    """
+    store = open_store(data_dir)
+    if store is not None:
+        return store.load(normalize=normalize)
+    x, y, _, gestures = _load_recordings(data_dir, normalize, cache)
     return x, y, gestures
+
+
+def load_training_arrays(data_dir, cache=True):
+    """Raw samples plus session indices, for streaming training input.
+
+    Returns ``(x, y, sessions, gestures)``: ``x`` holds the raw (not
+    normalized) ``(N, 21, 2)`` samples — a read-only memory map when
+    ``data_dir`` has a binary store, so nothing is loaded into RAM — ``y``
+    the label indices (same order as ``load_sample_arrays``), ``sessions``
+    the index of the recording session each sample came from.
+    """
+    store = open_store(data_dir)
+    if store is not None:
+        landmarks, _, sessions = store.arrays()
+        return landmarks, store.label_indices(), np.asarray(sessions), store.gestures()
+    return _load_recordings(data_dir, False, cache)
+
+
+def load_samples(data_dir, normalize=True, cache=True):
+    """Load all recorded samples from ``data_dir`` as lists.
+
+    Same as ``load_sample_arrays`` but returns ``x`` as a list of landmark
+    samples and ``y`` as a list of label indices.
+    """
+    x, y, gestures = load_sample_arrays(data_dir, normalize=normalize, cache=cache)
+    return x.tolist(), y.tolist(), gestures
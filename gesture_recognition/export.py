@@ -0,0 +1,247 @@
+"""Export trained Keras models to lighter inference formats.
+
+``export_npz`` writes the weights of a dense (Flatten -> Dense*) SavedModel
+to a ``.npz`` file that ``NumpyDenseModel`` runs without TensorFlow;
+``temporal_layers`` does the same for the Conv1D sequence models run by
+``NumpyTemporalModel``.
+``export_tflite`` converts a SavedModel to float32 / float16 / full-int8
+TFLite files, and ``compare_variants`` reports their size, latency and
+accuracy against the Keras original.
+
+TensorFlow is imported inside the functions that need it.
+"""
+
+import os
+import time
+
+import numpy as np
+
+from gesture_recognition import config
+from gesture_recognition.dataset import load_sample_arrays
+from gesture_recognition.services.numpy_model import NumpyDenseModel, weights_path
+from gesture_recognition.services.tflite_model import (
+    TFLITE_VARIANTS,
+    TFLiteModel,
+    tflite_path,
+)
+
+# Layers that are no-ops at inference time for a dense network
+PASSTHROUGH_LAYERS = ("InputLayer", "Flatten", "Dropout")
+
+
+def dense_layers(model):
+    """Return ``[(kernel, bias, activation), ...]`` for a dense Keras model.
+
+    Raises ``ValueError`` if the model has layers the NumPy backend can't
+    reproduce (e.g. the LSTM of older custom models — retrain those with
+    ``main.py train``).
+    """
+    layers = []
+    for layer in model.layers:
+        kind = type(layer).__name__
+        if kind in PASSTHROUGH_LAYERS:
+            continue
+        if kind != "Dense":
+            raise ValueError(
+                f"Layer '{layer.name}' ({kind}) is not supported by the NumPy "
+                "backend; only Flatten/Dense/Dropout models can be exported."
+            )
+        weights = layer.get_weights()
+        kernel = weights[0]
+        bias = weights[1] if len(weights) > 1 else np.zeros(kernel.shape[1])
+        layers.append((kernel, bias, layer.get_config()["activation"]))
+    return layers
+
+
+def temporal_layers(model):
+    """Return ``(convs, dense)`` for a sequence model (see ``NumpyTemporalModel``).
+
+    Raises ``ValueError`` for layers other than unpadded Conv1D followed by
+    Flatten/Dense, which is what ``SequenceTrainer`` builds.
+    """
+    convs, dense = [], []
+    for layer in model.layers:
+        kind = type(layer).__name__
+        if kind in PASSTHROUGH_LAYERS:
+            continue
+        settings = layer.get_config()
+        if kind == "Conv1D" and not dense and settings["padding"] == "valid":
+            kernel, bias = layer.get_weights()
+            convs.append(
+                (kernel, bias, settings["dilation_rate"][0], settings["activation"])
+            )
+        elif kind == "Dense":
+            kernel, bias = layer.get_weights()
+            dense.append((kernel, bias, settings["activation"]))
+        else:
+            raise ValueError(
+                f"Layer '{layer.name}' ({kind}) is not supported by the NumPy "
+                "sequence backend; only Conv1D (valid padding) followed by "
+                "Flatten/Dense layers can be exported."
+            )
+    return convs, dense
+
+
+def export_npz(model_path, output_path=None):
+    """Export the SavedModel at ``model_path`` to ``.npz`` weights.
+
+    Defaults to ``<model_path>.npz`` (where ``GestureManager`` looks for it
+    with ``backend="numpy"``). Returns the output path.
+    """
+    from keras.models import load_model
+
+    output_path = output_path or weights_path(model_path)
+    NumpyDenseModel(dense_layers(load_model(model_path))).save(output_path)
+    return output_path
+
+
+# Representative samples used to calibrate int8 quantization ranges
+REPRESENTATIVE_SAMPLES = 500
+
+# Single-sample calls timed per variant in the comparison report
+LATENCY_RUNS = 200
+
+
+def load_representative_samples(data_dir, normalize):
+    """Load recorded samples as ``(x, y, gestures)`` arrays for calibration.
+
+    ``normalize`` must match what the model expects (see ``model_settings``
+    in main.py). Returns empty arrays when there are no recordings.
+    """
+    if not os.path.isdir(data_dir):
+        return np.zeros((0, 21, 2), np.float32), np.zeros(0, int), []
+    return load_sample_arrays(data_dir, normalize=normalize)
+
+
+def export_tflite(model_path, samples, variants=TFLITE_VARIANTS):
+    """Convert a SavedModel to TFLite, one file per variant.
+
+    ``float16`` stores weights as half floats; ``int8`` is full-integer
+    post-training quantization (int8 weights, activations, input and output)
+    calibrated on ``samples``, and is skipped when there are none. Returns
+    ``{variant: path}`` for the files written.
+    """
+    import tensorflow as tf
+
+    rng = np.random.default_rng(0)
+    calibration = samples[rng.permutation(len(samples))[:REPRESENTATIVE_SAMPLES]]
+
+    def representative_dataset():
+        for sample in calibration:
+            yield [sample[np.newaxis]]
+
+    paths = {}
+    for variant in variants:
+        converter = tf.lite.TFLiteConverter.from_saved_model(model_path)
+        if variant == "float16":
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            converter.target_spec.supported_types = [tf.float16]
+        elif variant == "int8":
+            if not len(calibration):
+                print("Skipping int8: no recorded samples to calibrate with")
+                continue
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            converter.representative_dataset = representative_dataset
+            converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+            converter.inference_input_type = tf.int8
+            converter.inference_output_type = tf.int8
+
+        path = tflite_path(model_path, variant)
+        with open(path, "wb") as f:
+            f.write(converter.convert())
+        paths[variant] = path
+    return paths
+
+
+def median_latency_us(model, sample):
+    """Median time of single-sample calls to ``model``, in microseconds."""
+    batch = sample[np.newaxis]
+    model(batch)  # warm-up (first call allocates / traces)
+    times = []
+    for _ in range(LATENCY_RUNS):
+        start = time.perf_counter()
+        model(batch)
+        times.append(time.perf_counter() - start)
+    return float(np.median(times)) * 1e6
+
+
+def _model_size(path):
+    if os.path.isdir(path):
+        return sum(
+            os.path.getsize(os.path.join(root, name))
+            for root, _, names in os.walk(path)
+            for name in names
+        )
+    return os.path.getsize(path)
+
+
+def compare_variants(
+    model_path, paths, x, y, gestures, class_names, normalize, num_threads=1
+):
+    """Measure size, latency and accuracy of each variant against Keras.
+
+    Accuracy is measured against the recorded labels when every recorded
+    gesture is one of the model's classes; ``agreement`` (top-1 match with
+    the Keras model) is always reported. Returns one dict per model.
+    """
+    from keras.models import load_model
+
+    if not len(x):
+        # No recordings: still report size, latency and parity on random
+        # poses in the model's input range
+        low, high = (-1, 1) if normalize else (0, config.CAMERA_WIDTH)
+        rng = np.random.default_rng(0)
+        x = rng.uniform(low, high, (100, 21, 2)).astype(np.float32)
+        y = None
+    labels = None
+    if y is not None and all(g in class_names for g in gestures):
+        labels = np.array([class_names.index(gestures[i]) for i in y])
+
+    keras_model = load_model(model_path)
+    reference = np.argmax(np.asarray(keras_model(x, training=False)), axis=1)
+
+    models = [("keras", model_path, keras_model)]
+    models += [
+        (variant, path, TFLiteModel(path, num_threads=num_threads))
+        for variant, path in paths.items()
+    ]
+
+    rows = []
+    for name, path, model in models:
+        predicted = reference if model is keras_model else np.concatenate(
+            [np.argmax(model(sample[np.newaxis]), axis=1) for sample in x]
+        )
+        rows.append(
+            {
+                "variant": name,
+                "size_kb": _model_size(path) / 1024,
+                "latency_us": median_latency_us(model, x[0]),
+                "agreement": float(np.mean(predicted == reference)),
+                "accuracy": (
+                    float(np.mean(predicted == labels)) if labels is not None else None
+                ),
+            }
+        )
+    return rows
+
+
+def format_report(rows):
+    """Format ``compare_variants`` rows as a side-by-side text table."""
+    base = rows[0]
+    lines = [
+        (
+            f"{'variant':<10}{'size (KB)':>12}{'latency (us)':>14}"
+            f"{'agreement':>11}{'accuracy':>10}{'delta':>8}"
+        )
+    ]
+    for row in rows:
+        if row["accuracy"] is None:
+            accuracy = delta = "n/a"
+        else:
+            accuracy = f"{row['accuracy']:.1%}"
+            delta = f"{row['accuracy'] - base['accuracy']:+.1%}"
+        lines.append(
+            f"{row['variant']:<10}{row['size_kb']:>12.1f}{row['latency_us']:>14.1f}"
+            f"{row['agreement']:>11.1%}{accuracy:>10}{delta:>8}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,152 @@
+"""Serve several camera / video streams from one process (`main.py host`).
+
+Each stream keeps its own ``FrameSource``, ``handDetector`` and
+``HandTracker`` (one ``GestureSmoother`` per hand), but all streams share a
+single ``GestureManager``: every tick, the landmark vectors of every hand
+of every stream that produced a new frame are gathered into one batch and
+classified with a single model call. That keeps
+one TensorFlow runtime per machine instead of one per camera.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from gesture_recognition import config
+from gesture_recognition.camera import FrameSource
+from gesture_recognition.landmarks import normalize_landmarks_batch
+from gesture_recognition.services.gesture_manager import GestureManager
+from gesture_recognition.services.gesture_smoothing import GestureSmoother
+from gesture_recognition.tracking.hand_detector import handDetector
+from gesture_recognition.tracking.hand_tracker import HandTracker
+from gesture_recognition.tracking.landmark_filter import filtered_detector
+
+# Sleep between ticks when no stream had a new frame, to avoid spinning
+IDLE_SLEEP = 0.002
+
+
+class Stream:
+    """Per-stream state: frame source, detector, hand tracker and last hands."""
+
+    def __init__(self, name, source):
+        self.name = name
+        self.source = FrameSource(source, latest_only=True)
+        self.detector = filtered_detector(
+            handDetector(
+                detectionCon=config.DETECTION_CONFIDENCE,
+                trackCon=config.TRACKING_CONFIDENCE,
+                maxHands=config.MAX_HANDS,
+                roi=config.ROI_TRACKING,
+            )
+        )
+        self.hand_tracker = HandTracker(
+            lambda: GestureSmoother(
+                history_length=config.SMOOTHING_HISTORY_LENGTH,
+                confidence_threshold=config.CONFIDENCE_THRESHOLD,
+                strategy=config.SMOOTHING_STRATEGY,
+            )
+        )
+        self.image = None
+        self.hands = []  # TrackedHands of the last frame, in detection order
+
+
+class MultiStreamHost:
+    """Recognize gestures on N streams with one batched model call per tick."""
+
+    def __init__(
+        self,
+        sources,
+        model_path=None,
+        names_path=None,
+        normalize=False,
+        headless=False,
+        flip=True,
+        backend=None,
+    ):
+        self.gesture_manager = GestureManager(
+            model_path or config.MODEL_PATH,
+            names_path or config.GESTURE_NAMES_PATH,
+            backend=backend or config.INFERENCE_BACKEND,
+            tflite_variant=config.TFLITE_VARIANT,
+            num_threads=config.TFLITE_THREADS,
+        )
+        self.normalize = normalize
+        self.headless = headless
+        self.flip = flip
+        self.streams = [Stream(f"stream {i}", src) for i, src in enumerate(sources)]
+        # MediaPipe releases the GIL while it runs, so per-stream detection
+        # on a small thread pool overlaps across streams.
+        self.detect_pool = ThreadPoolExecutor(
+            max_workers=len(self.streams), thread_name_prefix="host-detect"
+        )
+
+    def run(self):
+        """Run until 'q' is pressed (or every stream has ended)."""
+        for stream in self.streams:
+            stream.source.open()
+        try:
+            while not all(s.source.finished for s in self.streams):
+                ready = self.tick()
+                if not ready:
+                    time.sleep(IDLE_SLEEP)
+                    continue
+                if not self.headless and not self._show(ready):
+                    break
+        finally:
+            self.detect_pool.shutdown()
+            for stream in self.streams:
+                stream.source.release()
+            if not self.headless:
+                cv2.destroyAllWindows()
+
+    def tick(self):
+        """Process the newest frame of every stream that has one.
+
+        Returns the streams that were updated this tick.
+        """
+        frames = [(s, s.source.read(timeout=0)) for s in self.streams]
+        ready = [(s, f) for s, f in frames if f is not None]
+        list(self.detect_pool.map(lambda item: self._detect(*item), ready))
+        ready = [s for s, _ in ready]
+
+        hands = [(s, hand) for s in ready for hand in s.hands]
+        if hands:
+            batch = np.stack([hand.landmarks[:, :2] for _, hand in hands])
+            if self.normalize:
+                batch = normalize_landmarks_batch(batch)
+            predictions = self.gesture_manager.predict_batch(
+                batch, distributions=hands[0][1].smoother.uses_probabilities
+            )
+            for (stream, hand), prediction in zip(hands, predictions):
+                previous = hand.gesture
+                hand.update_prediction(prediction)
+                if self.headless and hand.gesture != previous:
+                    print(f"[{stream.name} #{hand.id}] {hand.gesture or '-'}")
+        return ready
+
+    def _detect(self, stream, frame):
+        image = cv2.flip(frame.image, 1) if self.flip else frame.image
+        stream.image = stream.detector.findHands(image, draw=not self.headless)
+        landmarks, handedness = stream.detector.findLandmarks(stream.image)
+        stream.hands = stream.hand_tracker.update(landmarks, handedness)
+
+    def _show(self, ready):
+        for stream in ready:
+            for hand in stream.hands:
+                label = f"{hand.gesture} ({hand.confidence:.2f})"
+                if len(stream.hands) > 1:
+                    label = f"{hand.id}: {label}"
+                x, y = hand.anchor
+                cv2.putText(
+                    stream.image,
+                    label,
+                    (x, max(y - 10, 30)),
+                    config.FONT,
+                    config.FONT_SCALE,
+                    config.FONT_COLOR,
+                    config.FONT_THICKNESS,
+                )
+            cv2.imshow(stream.name, stream.image)
+        return cv2.waitKey(1) != ord("q")
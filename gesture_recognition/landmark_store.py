@@ -0,0 +1,206 @@
+"""Compact, memory-mapped storage for recorded gesture samples.
+
+A store is a directory holding three flat little-endian arrays plus a JSON
+manifest:
+
+- ``landmarks.f32`` — float32 samples, ``21 x 2`` raw pixel coordinates each
+- ``labels.i32``    — int32 gesture index of each sample (into ``gestures``)
+- ``sessions.i32``  — int32 session index of each sample (into ``sessions``)
+- ``manifest.json`` — sample count, gesture names and one entry per recorded
+  session (``name``, ``gesture``, ``start``, ``count``)
+
+Sessions are appended by writing to the end of the array files and then
+atomically replacing the manifest, whose ``count`` is authoritative: bytes
+past it (from an interrupted append) are ignored and overwritten by the next
+append. Reads go through ``np.memmap``, so training can stream batches from
+datasets larger than RAM.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from gesture_recognition.landmarks import normalize_landmarks_batch
+
+# Store directory inside a recordings directory (see ``dataset.open_store``)
+STORE_DIRNAME = "store"
+
+SAMPLE_SHAPE = (21, 2)
+FORMAT_VERSION = 1
+
+_FILES = {
+    "landmarks": ("landmarks.f32", np.dtype("<f4")),
+    "labels": ("labels.i32", np.dtype("<i4")),
+    "sessions": ("sessions.i32", np.dtype("<i4")),
+}
+
+
+class LandmarkStore:
+    """Append-only sample store backed by memory-mapped flat arrays."""
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        manifest_path = os.path.join(self.path, "manifest.json")
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as f:
+                self.manifest = json.load(f)
+            if self.manifest.get("version") != FORMAT_VERSION:
+                raise ValueError(
+                    f"Unsupported landmark store version in {self.path}: "
+                    f"{self.manifest.get('version')}"
+                )
+        else:
+            self.manifest = {
+                "version": FORMAT_VERSION,
+                "sample_shape": list(SAMPLE_SHAPE),
+                "count": 0,
+                "gestures": [],
+                "sessions": [],
+            }
+
+    @staticmethod
+    def exists(path):
+        return os.path.exists(os.path.join(path, "manifest.json"))
+
+    def __len__(self):
+        return self.manifest["count"]
+
+    @property
+    def sessions(self):
+        """Session entries in recording order."""
+        return self.manifest["sessions"]
+
+    def has_session(self, name):
+        return any(session["name"] == name for session in self.sessions)
+
+    def append(self, samples, gesture, session):
+        """Append one recording session of ``(n, 21, 2)`` samples.
+
+        ``session`` names the session (the recording's file stem, e.g.
+        ``wave_20260101_120000``); empty sessions are recorded too, so they
+        count as converted. Returns the number of samples written.
+        """
+        samples = np.asarray(samples, dtype=np.float32).reshape(-1, *SAMPLE_SHAPE)
+
+        if gesture not in self.manifest["gestures"]:
+            self.manifest["gestures"].append(gesture)
+        label = self.manifest["gestures"].index(gesture)
+        session_id = len(self.sessions)
+
+        os.makedirs(self.path, exist_ok=True)
+        count = len(self)
+        columns = {
+            "landmarks": samples,
+            "labels": np.full(len(samples), label),
+            "sessions": np.full(len(samples), session_id),
+        }
+        for key, values in columns.items():
+            filename, dtype = _FILES[key]
+            row_size = dtype.itemsize * int(np.prod(values.shape[1:]))
+            with open(os.path.join(self.path, filename), "ab") as f:
+                # Drop any tail left by an interrupted append
+                f.truncate(count * row_size)
+                f.write(np.ascontiguousarray(values, dtype=dtype).tobytes())
+
+        self.sessions.append(
+            {"name": session, "gesture": gesture, "start": count, "count": len(samples)}
+        )
+        self.manifest["count"] = count + len(samples)
+        self._write_manifest()
+        return len(samples)
+
+    def _write_manifest(self):
+        manifest_path = os.path.join(self.path, "manifest.json")
+        tmp_path = f"{manifest_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.manifest, f, indent=1)
+        os.replace(tmp_path, manifest_path)
+
+    def _map(self, key, shape):
+        filename, dtype = _FILES[key]
+        if not len(self):
+            return np.zeros(shape, dtype)
+        return np.memmap(
+            os.path.join(self.path, filename), dtype=dtype, mode="r", shape=shape
+        )
+
+    def arrays(self):
+        """Read-only ``(landmarks, labels, sessions)`` memory maps.
+
+        Labels index ``gestures`` as stored (in order of first recording);
+        use ``gestures()`` / ``load()`` for the reproducible order.
+        """
+        n = len(self)
+        return (
+            self._map("landmarks", (n, *SAMPLE_SHAPE)),
+            self._map("labels", (n,)),
+            self._map("sessions", (n,)),
+        )
+
+    def gestures(self):
+        """Gesture names in ``dataset.load_samples`` order.
+
+        That is the order of first appearance over the recordings sorted by
+        filename, so converting the recordings keeps every label index (and
+        models trained before the conversion stay valid).
+        """
+        order = []
+        for session in sorted(self.sessions, key=lambda session: session["name"]):
+            if session["gesture"] not in order:
+                order.append(session["gesture"])
+        return order
+
+    def _label_map(self):
+        # Stored label index -> index into the gestures() list
+        order = self.gestures()
+        return np.array(
+            [order.index(g) for g in self.manifest["gestures"]], dtype=int
+        )
+
+    def label_indices(self):
+        """Label of every sample as an index into ``gestures()``."""
+        _, labels, _ = self.arrays()
+        return self._label_map()[labels] if len(self) else np.zeros(0, int)
+
+    def load(self, normalize=True):
+        """Read every sample into memory, like ``dataset.load_sample_arrays``.
+
+        Samples come in the same order as from the JSON recordings (sessions
+        sorted by name), even for sessions appended after a conversion.
+        """
+        landmarks, _, _ = self.arrays()
+        sessions = sorted(self.sessions, key=lambda session: session["name"])
+        order = np.concatenate(
+            [
+                np.arange(s["start"], s["start"] + s["count"], dtype=np.int64)
+                for s in sessions
+            ]
+            or [np.zeros(0, np.int64)]
+        )
+        x = np.array(landmarks[order])
+        if normalize:
+            x = normalize_landmarks_batch(x)
+        return x, self.label_indices()[order], self.gestures()
+
+    def batches(self, batch_size, normalize=True, indices=None):
+        """Yield ``(x, y)`` batches without loading the whole store.
+
+        ``indices`` selects (and orders) the samples to read, e.g. a shuffled
+        training split; by default all samples are read in order. Each batch
+        is gathered from the memory maps with sorted indices, so only the
+        pages it touches are read.
+        """
+        landmarks, labels, _ = self.arrays()
+        label_map = self._label_map()
+        if indices is None:
+            indices = np.arange(len(self))
+        for start in range(0, len(indices), batch_size):
+            batch = indices[start : start + batch_size]
+            order = np.argsort(batch, kind="stable")
+            x = np.empty((len(batch), *SAMPLE_SHAPE), np.float32)
+            x[order] = landmarks[batch[order]]
+            y = label_map[labels[batch]]
+            if normalize:
+                x = normalize_landmarks_batch(x)
+            yield x, y
@@ -2,23 +2,35 @@
 
 import numpy as np
 
+# Bump whenever the output of the normalization below changes, so cached
+# normalized samples (see dataset.load_sample_arrays) are rebuilt.
+NORMALIZATION_VERSION = 1
 
-def normalize_landmarks(landmarks):
-    """Make landmarks translation- and scale-invariant.
 
-    Takes the 21 MediaPipe hand landmarks as ``[x, y]`` pixel pairs (wrist
-    first, landmark id 0), translates them so the wrist is the origin and
-    scales them so the largest coordinate magnitude is 1. The result no longer
-    depends on where the hand is in the frame, how far it is from the camera,
-    or the camera resolution.
+def normalize_landmarks_batch(landmarks):
+    """Make a batch of hands translation- and scale-invariant.
+
+    Takes an ``(N, 21, 2)`` or ``(N, 21, 3)`` array of MediaPipe hand
+    landmarks (wrist first, landmark id 0), translates each hand so its wrist
+    is the origin and scales it so its largest coordinate magnitude is 1. The
+    result no longer depends on where the hand is in the frame, how far it is
+    from the camera, or the camera resolution. Hands whose landmarks all
+    coincide (zero scale) come out as all zeros.
 
-    Returns a list of ``[x, y]`` float pairs.
+    Returns a new float32 array of the same shape.
     """
-    points = np.asarray(landmarks, dtype=np.float32)
-    points = points - points[0]
+    points = np.array(landmarks, dtype=np.float32)
+    points -= points[:, :1]
+
+    scale = np.abs(points).max(axis=(1, 2), keepdims=True)
+    np.divide(points, scale, out=points, where=scale > 0)
+    return points
 
-    scale = np.abs(points).max()
-    if scale > 0:
-        points = points / scale
 
-    return points.tolist()
+def normalize_landmarks(landmarks):
+    """Normalize a single hand (see ``normalize_landmarks_batch``).
+
+    Takes the 21 landmarks as ``[x, y]`` pixel pairs and returns a list of
+    ``[x, y]`` float pairs.
+    """
+    return normalize_landmarks_batch(np.asarray(landmarks)[np.newaxis])[0].tolist()
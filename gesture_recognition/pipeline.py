@@ -0,0 +1,157 @@
+"""Pipelined execution of per-frame processing stages.
+
+Each stage runs on its own thread and hands its output to the next stage
+through a small bounded queue, so a slow stage (e.g. hand detection) for
+frame N+1 overlaps with the later stages (prediction, rendering) of frame N.
+
+Kept free of OpenCV/TensorFlow imports: the stages are plain callables
+supplied by the caller, which also makes this unit-testable.
+"""
+
+import threading
+import time
+from collections import deque
+
+
+class StageQueue:
+    """Bounded FIFO queue that drops the oldest item when full.
+
+    A real-time pipeline should always work on the newest frame: if a
+    consumer falls behind, blocking the producer would only build a backlog
+    of stale frames, so the oldest queued item is discarded instead (and
+    counted in ``dropped``).
+    """
+
+    def __init__(self, name, maxsize=2):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.name = name
+        self.maxsize = maxsize
+        self.dropped = 0
+        self._items = deque()
+        self._cond = threading.Condition()
+
+    def put(self, item):
+        """Add an item, dropping the oldest one if the queue is full."""
+        with self._cond:
+            if len(self._items) >= self.maxsize:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """Remove and return the oldest item, or ``None`` on timeout."""
+        with self._cond:
+            if not self._items:
+                self._cond.wait(timeout)
+            if not self._items:
+                return None
+            return self._items.popleft()
+
+    def qsize(self):
+        with self._cond:
+            return len(self._items)
+
+    def stats(self):
+        """Return ``(size, maxsize, dropped)`` for reporting."""
+        with self._cond:
+            return len(self._items), self.maxsize, self.dropped
+
+
+class Pipeline:
+    """Run a source and a chain of stages on worker threads.
+
+    ``source`` is called repeatedly and returns the next item (or ``None`` to
+    skip, e.g. on a failed camera read). Each entry of ``stages`` is a
+    ``(name, fn)`` pair; ``fn`` receives the previous stage's output and
+    returns its own, or ``None`` to discard the item. Results of the last
+    stage are collected with :meth:`get`, typically on the main thread
+    (OpenCV windows must be driven from there).
+
+    Every stage is a single thread reading a FIFO queue, so items can be
+    dropped but never reordered: results always come out in frame order.
+    """
+
+    # How long idle threads block before re-checking the stop flag
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, source, stages, queue_size=2):
+        self.source = source
+        self.stages = list(stages)
+        self.queues = [StageQueue(name, queue_size) for name, _ in self.stages]
+        self.output = StageQueue("output", queue_size)
+        self.error = None
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        """Start the source and stage threads."""
+        self._threads = [
+            threading.Thread(
+                target=self._run_source, name="pipeline-source", daemon=True
+            )
+        ]
+        outputs = self.queues[1:] + [self.output]
+        for (name, fn), inbox, outbox in zip(self.stages, self.queues, outputs):
+            self._threads.append(
+                threading.Thread(
+                    target=self._run_stage,
+                    args=(fn, inbox, outbox),
+                    name=f"pipeline-{name}",
+                    daemon=True,
+                )
+            )
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self, timeout=1.0):
+        """Signal all threads to stop and wait for them to exit."""
+        self._stop.set()
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        self._threads = []
+
+    def get(self, timeout=None):
+        """Return the next finished item, or ``None`` on timeout.
+
+        Re-raises the first exception raised by the source or any stage so
+        errors surface on the consuming thread instead of dying silently.
+        """
+        item = self.output.get(self.POLL_INTERVAL if timeout is None else timeout)
+        if self.error is not None:
+            raise self.error
+        return item
+
+    def queue_stats(self):
+        """Return ``{queue name: (size, maxsize, dropped)}`` for every queue."""
+        return {q.name: q.stats() for q in [*self.queues, self.output]}
+
+    def _fail(self, exc):
+        if self.error is None:
+            self.error = exc
+        self._stop.set()
+
+    def _run_source(self):
+        first = self.queues[0] if self.queues else self.output
+        try:
+            while not self._stop.is_set():
+                item = self.source()
+                if item is not None:
+                    first.put(item)
+        except Exception as exc:  # noqa: BLE001 - re-raised by get()
+            self._fail(exc)
+
+    def _run_stage(self, fn, inbox, outbox):
+        try:
+            while not self._stop.is_set():
+                item = inbox.get(self.POLL_INTERVAL)
+                if item is None:
+                    continue
+                result = fn(item)
+                if result is not None:
+                    outbox.put(result)
+        except Exception as exc:  # noqa: BLE001 - re-raised by get()
+            self._fail(exc)
@@ -2,6 +2,9 @@ import cv2
 import os
 import json
 import time
+from gesture_recognition.camera import FrameSource
+from gesture_recognition.dataset import open_store
+from gesture_recognition.sequences import save_takes, sequences_dir
 from gesture_recognition.tracking.hand_detector import handDetector
 from gesture_recognition import config
 
@@ -19,12 +22,10 @@ def record_gesture():
     os.makedirs(RECORDINGS_DIR, exist_ok=True)
 
     # Initialize webcam and hand detector from config (env-var overridable)
-    cap = cv2.VideoCapture(config.CAMERA_INDEX)
-    if not cap.isOpened():
-        print(
-            f"Could not open camera index {config.CAMERA_INDEX}. "
-            "Set GESTURE_CAM_INDEX to change it."
-        )
+    try:
+        camera = FrameSource(config.CAMERA_INDEX).open()
+    except RuntimeError as e:
+        print(e)
         return
     detector = handDetector(
         detectionCon=config.DETECTION_CONFIDENCE, maxHands=config.MAX_HANDS
@@ -34,7 +35,7 @@ def record_gesture():
     gesture_name = input("Enter the name of the gesture to record: ").strip()
     if not gesture_name:
         print("No gesture name given, aborting.")
-        cap.release()
+        camera.release()
         return
 
     sample_count = 0
@@ -48,20 +49,17 @@ def record_gesture():
 
     recording_active = False
     last_sample_time = 0.0
-    failed_reads = 0
 
     while True:
-        success, img = cap.read()
-        if not success:
-            failed_reads += 1
-            if failed_reads > 50:
+        frame = camera.read()
+        if frame is None:
+            if camera.finished:
                 print("Camera stopped delivering frames, aborting.")
                 break
             continue
-        failed_reads = 0
 
         # Flip image horizontally
-        img = cv2.flip(img, 1)
+        img = cv2.flip(frame.image, 1)
 
         # Find hands
         img = detector.findHands(img)
@@ -162,14 +160,118 @@ def record_gesture():
         filename = os.path.join(
             RECORDINGS_DIR, f"{gesture_name}_{time.strftime('%Y%m%d_%H%M%S')}.json"
         )
+        # Keep the binary store (if converted to one) in sync
+        store = open_store(RECORDINGS_DIR)
         with open(filename, "w") as f:
             json.dump(samples, f)
         print(f"Saved {sample_count} samples to {filename}")
+        if store is not None:
+            session = os.path.splitext(os.path.basename(filename))[0]
+            store.append(samples, gesture_name, session)
     else:
         print("No samples recorded.")
 
     # Release resources
-    cap.release()
+    camera.release()
+    cv2.destroyAllWindows()
+
+
+def _put_lines(img, lines):
+    for i, (text, color) in enumerate(lines):
+        cv2.putText(
+            img, text, (10, 30 + 30 * i), cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2
+        )
+
+
+def record_sequences(gesture_name=None):
+    """Record timed takes of a dynamic gesture (see ``gesture_recognition.sequences``).
+
+    'r' starts a take and stops it again; every frame with a hand in
+    between is kept with its capture time. All takes of the session are
+    saved to one file when recording ends with 'q'.
+    """
+    directory = sequences_dir(RECORDINGS_DIR)
+    os.makedirs(directory, exist_ok=True)
+
+    try:
+        camera = FrameSource(config.CAMERA_INDEX).open()
+    except RuntimeError as e:
+        print(e)
+        return
+    detector = handDetector(
+        detectionCon=config.DETECTION_CONFIDENCE, maxHands=config.MAX_HANDS
+    )
+
+    if not gesture_name:
+        gesture_name = input("Enter the name of the dynamic gesture to record: ")
+        gesture_name = gesture_name.strip()
+    if not gesture_name:
+        print("No gesture name given, aborting.")
+        camera.release()
+        return
+
+    print(
+        f"Recording takes of '{gesture_name}'. Press 'r' to start and stop a "
+        f"take, 'q' to finish. Record '{config.SEQUENCE_IDLE_CLASS}' takes of "
+        "ordinary hand movement too, so the model learns when there is no gesture."
+    )
+
+    takes = []
+    take = None  # (times, landmarks) of the take in progress
+    while True:
+        frame = camera.read()
+        if frame is None:
+            if camera.finished:
+                print("Camera stopped delivering frames, aborting.")
+                break
+            continue
+
+        img = detector.findHands(cv2.flip(frame.image, 1))
+        landmarks, _ = detector.findLandmarks(img)
+        if take is not None and len(landmarks):
+            take[0].append(frame.timestamp)
+            take[1].append(landmarks[0, :, :2])
+
+        if take is None:
+            status = ("READY: press 'r' to start a take", (0, 255, 0))
+        else:
+            status = (f"RECORDING take ({len(take[0])} frames)", (0, 0, 255))
+        _put_lines(
+            img,
+            [
+                (f"Gesture: {gesture_name}", (0, 255, 0)),
+                (f"Takes: {len(takes)}", (0, 255, 0)),
+                status,
+                ("Press 'q' to quit", (255, 255, 255)),
+            ],
+        )
+        cv2.imshow("Sequence Recorder", img)
+
+        key = cv2.waitKey(1)
+        if key == ord("r"):
+            if take is None:
+                take = ([], [])
+            else:
+                if len(take[0]) >= 2:
+                    times = [t - take[0][0] for t in take[0]]
+                    takes.append((times, take[1]))
+                    print(f"Take {len(takes)}: {times[-1]:.2f}s, {len(times)} frames")
+                else:
+                    print("Take discarded: no hand seen")
+                take = None
+        elif key == ord("q"):
+            break
+
+    if takes:
+        filename = os.path.join(
+            directory, f"{gesture_name}_{time.strftime('%Y%m%d_%H%M%S')}.json"
+        )
+        save_takes(filename, gesture_name, takes)
+        print(f"Saved {len(takes)} takes to {filename}")
+    else:
+        print("No takes recorded.")
+
+    camera.release()
     cv2.destroyAllWindows()
 
 
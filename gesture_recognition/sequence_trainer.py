@@ -0,0 +1,134 @@
+import os
+
+import numpy as np
+from keras.callbacks import EarlyStopping
+from keras.layers import Conv1D, Dense, Flatten, Input
+from keras.models import Sequential
+from keras.optimizers import Adam
+
+from gesture_recognition import config
+from gesture_recognition.export import temporal_layers
+from gesture_recognition.sequences import (
+    DEFAULT_DILATIONS,
+    DEFAULT_FILTERS,
+    DEFAULT_KERNEL_SIZE,
+    FEATURE_SIZE,
+    load_sequences,
+    receptive_field,
+    sequence_dataset,
+)
+from gesture_recognition.services.numpy_model import weights_path
+from gesture_recognition.services.temporal_model import NumpyTemporalModel
+from gesture_recognition.training_data import session_split
+
+# Resampling factors for time-stretch augmentation (slower and faster
+# performances of each take)
+STRETCHES = (0.8, 1.0, 1.25)
+
+# Frames between the ends of consecutive training windows of a take
+WINDOW_STRIDE = 2
+
+
+def build_sequence_model(
+    num_classes,
+    filters=DEFAULT_FILTERS,
+    kernel_size=DEFAULT_KERNEL_SIZE,
+    dilations=DEFAULT_DILATIONS,
+    learning_rate=0.001,
+):
+    """Build and compile a causal dilated Conv1D classifier.
+
+    The convolutions have no padding and the input is exactly one
+    receptive field long, so the last layer outputs a single step that
+    depends on past frames only. That is what lets ``TemporalStream``
+    run the same model one frame at a time.
+    """
+    model = Sequential(
+        [
+            Input(shape=(receptive_field(kernel_size, dilations), FEATURE_SIZE)),
+            *[
+                Conv1D(filters, kernel_size, dilation_rate=d, activation="relu")
+                for d in dilations
+            ],
+            Flatten(),
+            Dense(num_classes, activation="softmax"),
+        ]
+    )
+
+    model.compile(
+        optimizer=Adam(learning_rate=learning_rate),
+        loss="sparse_categorical_crossentropy",
+        metrics=["accuracy"],
+    )
+
+    return model
+
+
+class SequenceTrainer:
+    """Train a dynamic-gesture model on recorded landmark sequences"""
+
+    def __init__(self, data_dir=None, model_path=None, fps=config.SEQUENCE_FPS):
+        self.data_dir = data_dir or os.path.join(config.BASE_DIR, "recorded_gestures")
+        self.model_path = model_path or config.SEQUENCE_MODEL_PATH
+        self.fps = fps
+
+    def train(self, epochs=50, batch_size=32, augmentation=True):
+        """Train the model"""
+        sequences = load_sequences(self.data_dir)
+        if not sequences:
+            print(
+                f"No sequence recordings found in {self.data_dir}/sequences; "
+                "record some with 'main.py record --sequence'"
+            )
+            return False
+
+        stretches = STRETCHES if augmentation else (1.0,)
+        x, y, sessions, gestures = sequence_dataset(
+            sequences, self.fps, receptive_field(), WINDOW_STRIDE, stretches
+        )
+        if config.SEQUENCE_IDLE_CLASS not in gestures:
+            print(
+                f"Warning: no '{config.SEQUENCE_IDLE_CLASS}' recordings; without "
+                "a no-gesture class every movement is recognized as a gesture"
+            )
+        train_indices, val_indices = session_split(y, sessions)
+        print(
+            f"Training on {len(train_indices)} windows of {len(sequences)} takes "
+            f"for {len(gestures)} gestures, validating on {len(val_indices)}"
+        )
+
+        model = build_sequence_model(len(gestures))
+        order = np.random.default_rng(0).permutation(train_indices)
+        validation = None
+        callbacks = []
+        if len(val_indices):
+            validation = (x[val_indices], y[val_indices])
+            callbacks.append(
+                EarlyStopping(
+                    monitor="val_loss", patience=10, restore_best_weights=True
+                )
+            )
+        model.fit(
+            x[order],
+            y[order],
+            validation_data=validation,
+            epochs=epochs,
+            batch_size=batch_size,
+            callbacks=callbacks,
+        )
+
+        # Save the model, plus its weights for streaming recognition
+        os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
+        model.save(self.model_path)
+        NumpyTemporalModel(*temporal_layers(model)).save(weights_path(self.model_path))
+
+        with open(f"{self.model_path}_gestures.txt", "w") as f:
+            f.write("\n".join(gestures))
+
+        print(f"Sequence model saved to {self.model_path}")
+        return True
+
+
+if __name__ == "__main__":
+    trainer = SequenceTrainer()
+    trainer.train()
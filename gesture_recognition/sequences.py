@@ -0,0 +1,169 @@
+"""Recorded landmark sequences for dynamic (motion) gestures.
+
+A static pose is one frame of landmarks; a wave or a swipe only shows in
+how the landmarks move. ``main.py record --sequence`` saves timed takes of
+one gesture per file under ``recorded_gestures/sequences/``::
+
+    {"gesture": "swipe_left",
+     "takes": [{"t": [0.0, 0.034, ...], "landmarks": [[[x, y], ...21], ...]}]}
+
+``t`` is seconds since the start of the take and ``landmarks`` the first
+hand's raw pixel coordinates on every frame it was found.
+
+Cameras don't deliver frames at a steady rate, so takes are resampled to
+``fps`` before training, and recognition steps its model on the same clock
+(see ``SequenceRecognizer``). Each step's features are the normalized pose
+plus the wrist's movement since the previous step in hand sizes, so a
+swipe looks the same anywhere in the frame and at any distance.
+
+Kept free of TensorFlow imports, like ``dataset``.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from gesture_recognition.dataset import gesture_name_from_filename
+
+SEQUENCES_DIRNAME = "sequences"
+
+# 21 normalized (x, y) landmarks + the wrist's (dx, dy)
+FEATURE_SIZE = 44
+
+# Conv1D filters, kernel size and per-layer dilations of the default
+# sequence model (see ``sequence_trainer``): a receptive field of
+# 1 + 2 * (1 + 3 + 9) = 27 steps, about a second at 30 fps, in three
+# layers (each one costs a matrix multiply per streamed frame)
+DEFAULT_FILTERS = 32
+DEFAULT_KERNEL_SIZE = 3
+DEFAULT_DILATIONS = (1, 3, 9)
+
+
+def receptive_field(kernel_size=DEFAULT_KERNEL_SIZE, dilations=DEFAULT_DILATIONS):
+    """Steps one prediction of a Conv1D stack depends on (its training window)."""
+    return 1 + (kernel_size - 1) * sum(dilations)
+
+
+def sequences_dir(data_dir):
+    return os.path.join(data_dir, SEQUENCES_DIRNAME)
+
+
+def save_takes(path, gesture, takes):
+    """Write ``takes`` (a list of ``(times, landmarks)``) of one gesture."""
+    with open(path, "w") as f:
+        json.dump(
+            {
+                "gesture": gesture,
+                "takes": [
+                    {
+                        "t": [round(float(t), 4) for t in times],
+                        "landmarks": np.asarray(landmarks).tolist(),
+                    }
+                    for times, landmarks in takes
+                ],
+            },
+            f,
+        )
+
+
+def load_sequences(data_dir):
+    """Recorded takes as ``[(gesture, session, times, landmarks), ...]``.
+
+    ``times`` is a float64 ``(frames,)`` array and ``landmarks`` a float32
+    ``(frames, 21, 2)`` array. The session is the recording's file name, so
+    validation can hold out whole sessions as for static gestures.
+    """
+    directory = sequences_dir(data_dir)
+    if not os.path.isdir(directory):
+        return []
+    sequences = []
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith(".json"):
+            continue
+        with open(os.path.join(directory, filename)) as f:
+            recording = json.load(f)
+        gesture = recording.get("gesture") or gesture_name_from_filename(filename)
+        session = os.path.splitext(filename)[0]
+        for take in recording["takes"]:
+            landmarks = np.asarray(take["landmarks"], dtype=np.float32)
+            if len(landmarks) < 2:
+                continue
+            times = np.asarray(take["t"], dtype=np.float64)
+            sequences.append((gesture, session, times, landmarks[..., :2]))
+    return sequences
+
+
+def resample(times, landmarks, fps):
+    """Linearly interpolate a take onto a steady ``fps`` clock from its start."""
+    times = np.asarray(times, dtype=np.float64)
+    ticks = times[0] + np.arange(int((times[-1] - times[0]) * fps) + 1) / fps
+    flat = landmarks.reshape(len(landmarks), -1)
+    resampled = np.empty((len(ticks), flat.shape[1]), np.float32)
+    for column in range(flat.shape[1]):
+        resampled[:, column] = np.interp(ticks, times, flat[:, column])
+    return resampled.reshape(len(ticks), *landmarks.shape[1:])
+
+
+def frame_features(landmarks, previous):
+    """Features of a batch of hands, given the same hands one step earlier.
+
+    Both are ``(n, 21, 2)`` raw pixel landmarks; returns ``(n, 44)``
+    float32 features: the normalized pose and the wrist's displacement
+    divided by the hand's size (its normalization scale).
+    """
+    landmarks = np.asarray(landmarks, dtype=np.float32)
+    features = np.empty((len(landmarks), FEATURE_SIZE), np.float32)
+    # The steps of normalize_landmarks_batch, sharing the scale with the
+    # motion (this runs on every model step)
+    pose = features[:, :42].reshape(-1, 21, 2)
+    np.subtract(landmarks, landmarks[:, :1], out=pose)
+    np.subtract(landmarks[:, 0], np.asarray(previous)[:, 0], out=features[:, 42:])
+    scale = np.abs(pose).max(axis=(1, 2))[:, np.newaxis]
+    np.divide(features, scale, out=features, where=scale > 0)
+    return features
+
+
+def sequence_features(landmarks):
+    """Features of every frame of one ``(frames, 21, 2)`` resampled take."""
+    previous = np.concatenate([landmarks[:1], landmarks[:-1]])
+    return frame_features(landmarks, previous)
+
+
+def windows(features, length, stride=1):
+    """Training windows ``(n, length, features)`` ending every ``stride`` frames.
+
+    Takes shorter than ``length`` give a single window, padded at the start
+    by repeating the first frame (a still hand before the motion).
+    """
+    if len(features) < length:
+        pad = np.repeat(features[:1], length - len(features), axis=0)
+        return np.concatenate([pad, features])[np.newaxis]
+    ends = np.arange(len(features), length - 1, -stride)[::-1]
+    return np.stack([features[end - length : end] for end in ends])
+
+
+def sequence_dataset(sequences, fps, length, stride=1, stretches=(1.0,)):
+    """Windows, labels and sessions for training a sequence model.
+
+    Every take is resampled once per factor in ``stretches``, at ``fps``
+    times the factor. A factor above 1 spreads the motion over more steps,
+    i.e. trains on a slower performance of the gesture.
+
+    Returns ``(x, labels, sessions, gestures)`` with ``x`` a float32
+    ``(n, length, 44)`` array and ``labels`` indices into the sorted
+    ``gestures`` list.
+    """
+    gestures = sorted({gesture for gesture, *_ in sequences})
+    xs, labels, sessions = [], [], []
+    for gesture, session, times, landmarks in sequences:
+        for stretch in stretches:
+            features = sequence_features(resample(times, landmarks, fps * stretch))
+            take = windows(features, length, stride)
+            xs.append(take)
+            labels.extend([gestures.index(gesture)] * len(take))
+            sessions.extend([session] * len(take))
+    if not xs:
+        empty = np.zeros(0, np.int64)
+        return np.zeros((0, length, FEATURE_SIZE), np.float32), empty, empty, gestures
+    return np.concatenate(xs), np.array(labels), np.array(sessions), gestures
@@ -8,7 +8,7 @@ import threading
 import time
 from collections import defaultdict
 
-from gtts import gTTS
+from gesture_recognition.services.tracer import NULL_TRACER
 
 
 class AudioManager:
@@ -16,8 +16,9 @@ class AudioManager:
     Handles text-to-speech conversion and audio playback in a non-blocking manner.
     """
 
-    def __init__(self, cooldown_time=2, cache_size=20):
+    def __init__(self, cooldown_time=2, cache_size=20, tracer=NULL_TRACER):
         self.cooldown_time = cooldown_time
+        self.tracer = tracer
         self.last_spoken_time = 0
         self.last_spoken_text = None
         self.audio_cache = {}
@@ -70,11 +71,22 @@ class AudioManager:
         self.last_spoken_text = text
 
         self.audio_thread = threading.Thread(
-            target=self._process_audio, args=(text, lang, slow), daemon=True
+            target=self._process_audio,
+            args=(text, lang, slow),
+            name="audio",
+            daemon=True,
         )
         self.audio_thread.start()
         return True
 
+    def queue_depth(self):
+        """Announcements being synthesized or played (0 or 1).
+
+        Requests made while one is in progress are dropped, not queued.
+        """
+        thread = self.audio_thread
+        return int(thread is not None and thread.is_alive())
+
     def reset_last_spoken(self):
         """Forget the last spoken phrase so it can be announced again."""
         self.last_spoken_text = None
@@ -98,15 +110,21 @@ class AudioManager:
 
                 if not os.path.exists(audio_path):
                     try:
-                        tts = gTTS(text=text, lang=lang, slow=slow)
-                        tts.save(audio_path)
+                        # Imported on first use: gTTS pulls in requests and
+                        # friends, which most runs (voice off) never need.
+                        with self.tracer.span("tts", "audio", {"text": text}):
+                            from gtts import gTTS
+
+                            tts = gTTS(text=text, lang=lang, slow=slow)
+                            tts.save(audio_path)
                     except Exception as e:
                         print(f"Text-to-speech failed for '{text}': {e}")
                         return
 
                 self._update_cache(cache_key, audio_path)
 
-            self._play(audio_path)
+            with self.tracer.span("play", "audio", {"text": text}):
+                self._play(audio_path)
 
     def _play(self, audio_path):
         if self._player is None:
@@ -1,46 +1,129 @@
+import time
+
 import numpy as np
-from keras.models import load_model
+
+from gesture_recognition import config
+from gesture_recognition.config import INFERENCE_BACKENDS as BACKENDS
+from gesture_recognition.services.prediction_cache import PredictionCache
 
 
 class GestureManager:
-    """Manages gesture data, model loading, and prediction"""
+    """Manages gesture data, model loading, and prediction
 
-    def __init__(self, model_path, names_path):
+    With ``cache_size`` > 0, predictions are memoized per input quantized to
+    ``cache_step`` (see ``PredictionCache``) in ``self.cache``, which is
+    cleared whenever the model is (re)loaded or the class list changes.
+    """
+
+    def __init__(
+        self,
+        model_path,
+        names_path,
+        backend="keras",
+        tflite_variant="int8",
+        num_threads=1,
+        cache_size=config.PREDICTION_CACHE_SIZE,
+        cache_step=config.PREDICTION_CACHE_STEP,
+    ):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
         self.model_path = model_path
         self.names_path = names_path
+        self.backend = backend
+        self.tflite_variant = tflite_variant
+        self.num_threads = num_threads
         self.model = None
         self.class_names = []
+        self.cache = PredictionCache(cache_size, cache_step) if cache_size else None
         self.load_resources()
 
     def load_resources(self):
         """Load model and class names"""
-        self.model = load_model(self.model_path)
+        # Backends are imported lazily so the NumPy path never pays for
+        # importing TensorFlow.
+        if self.backend == "numpy":
+            from gesture_recognition.services.numpy_model import (
+                NumpyDenseModel,
+                weights_path,
+            )
+
+            self.model = NumpyDenseModel.load(weights_path(self.model_path))
+        elif self.backend == "tflite":
+            from gesture_recognition.services.tflite_model import (
+                TFLiteModel,
+                tflite_path,
+            )
+
+            self.model = TFLiteModel(
+                tflite_path(self.model_path, self.tflite_variant),
+                num_threads=self.num_threads,
+            )
+        else:
+            from keras.models import load_model
+
+            self.model = load_model(self.model_path)
 
         # Load class names (ignore blank lines from trailing newlines)
         with open(self.names_path, "r") as f:
             self.class_names = [line.strip() for line in f if line.strip()]
 
+        if self.cache is not None:
+            self.cache.clear()
         print(f"Loaded {len(self.class_names)} gestures: {', '.join(self.class_names)}")
 
     def predict_gesture(self, landmarks):
-        """Predict gesture from landmarks.
+        """Predict gesture from one hand's landmarks (a list or array)."""
+        return self.predict_batch(np.asarray(landmarks, dtype=np.float32)[np.newaxis])[0]
 
-        Calls the model directly instead of ``model.predict()`` — for
-        single-sample, per-frame inference the ``predict()`` machinery adds
-        significant overhead.
+    def predict_batch(self, landmarks_batch, distributions=False):
+        """Predict gestures for several hands/streams in one model call.
+
+        Calls the model directly instead of ``model.predict()`` — for small,
+        per-frame batches the ``predict()`` machinery adds significant
+        overhead. Returns a list of ``(class_name, confidence)`` pairs in
+        input order; with ``distributions``, ``(class_name, confidence,
+        {class_name: probability})`` triples for the averaging smoothers.
         """
-        inputs = np.asarray([landmarks], dtype=np.float32)
-        prediction = np.asarray(self.model(inputs, training=False))
-        class_id = int(np.argmax(prediction[0]))
-        class_name = self.class_names[class_id]
-        confidence = float(prediction[0][class_id])
+        inputs = np.asarray(landmarks_batch, dtype=np.float32)
+        if self.cache is None:
+            prediction = np.asarray(self.model(inputs, training=False))
+        else:
+            prediction = self._predict_cached(inputs)
+        class_ids = np.argmax(prediction, axis=1)
+        confidences = prediction[np.arange(len(class_ids)), class_ids]
+
+        results = [
+            (self.class_names[int(class_id)], float(confidence))
+            for class_id, confidence in zip(class_ids, confidences)
+        ]
+        if distributions:
+            return [
+                (*result, dict(zip(self.class_names, row.tolist())))
+                for result, row in zip(results, prediction)
+            ]
+        return results
 
-        return class_name, confidence
+    def _predict_cached(self, inputs):
+        """Model outputs for ``inputs``, calling the model only on cache misses."""
+        cache = self.cache
+        keys = [cache.key(row) for row in inputs]
+        rows = [cache.get(key) for key in keys]
+        missing = [i for i, row in enumerate(rows) if row is None]
+        if missing:
+            start = time.perf_counter()
+            computed = np.asarray(self.model(inputs[missing], training=False))
+            cache.record_model_time(time.perf_counter() - start)
+            for i, row in zip(missing, computed):
+                rows[i] = row
+                cache.put(keys[i], row)
+        return np.stack(rows)
 
     def add_gesture(self, name):
         """Add a new gesture to the class names file"""
         if name not in self.class_names:
             self.class_names.append(name)
+            if self.cache is not None:
+                self.cache.clear()
             with open(self.names_path, "w") as f:
                 f.write("\n".join(self.class_names))
             print(f"Added new gesture: {name}")
@@ -1,4 +1,198 @@
-from collections import Counter, deque
+"""Smoothing of per-frame gesture predictions into a steady displayed gesture.
+
+``GestureSmoother`` delegates to one of several strategies, chosen by name:
+
+``majority``
+    The most frequent gesture among the last ``history_length`` confident
+    predictions, if it makes up at least ``dominance`` of them.
+``weighted``
+    Like ``majority``, but each prediction votes with its confidence.
+``ema``
+    Exponential moving average (factor ``alpha``) of the class probability
+    vector; the top class is shown once its average reaches
+    ``confidence_threshold``. Uses the full distribution when the caller
+    passes it, otherwise the top class's confidence.
+``hysteresis``
+    The same average, but a gesture is only shown once it reaches
+    ``enter_threshold`` and stays until it falls below ``exit_threshold``.
+
+Every update costs the same however long the window is: the voting
+strategies keep running per-class totals that are adjusted as predictions
+enter and leave the window, and the averages are updated in place (both
+are linear in the number of classes seen, not in the history length).
+
+Each strategy reports ``delay_frames``: how many frames of a new gesture
+it takes, after a steady run of another one, before the new gesture is
+shown (at full confidence).
+"""
+
+import math
+from collections import deque
+
+from gesture_recognition import config
+
+# Averaged scores below this are dropped, so classes that stopped appearing
+# don't cost anything per update
+_MIN_SCORE = 1e-4
+
+# An old score has to decay strictly below half to be overtaken
+_OVERTAKE = 0.5 - 1e-6
+
+
+class MajorityVote:
+    """Majority vote over a sliding window, with running per-class counts."""
+
+    uses_probabilities = False
+
+    def __init__(self, history_length=10, confidence_threshold=0.5, dominance=0.4):
+        self.history_length = history_length
+        self.confidence_threshold = confidence_threshold
+        self.dominance = dominance
+        self.reset()
+
+    def reset(self):
+        self.history = deque()  # (gesture, weight), oldest first
+        self.counts = {}  # gesture -> frames in the window
+        self.weights = {}  # gesture -> summed weight in the window
+        self.total = 0.0
+        self._updates = 0
+
+    def _weight(self, confidence):
+        return 1.0
+
+    def update(self, gesture_name, confidence, probabilities=None):
+        # Only consider predictions with sufficient confidence
+        if confidence < self.confidence_threshold:
+            return
+        if len(self.history) == self.history_length:
+            old, old_weight = self.history.popleft()
+            self.counts[old] -= 1
+            if self.counts[old]:
+                self.weights[old] -= old_weight
+            else:
+                del self.counts[old], self.weights[old]
+            self.total -= old_weight
+
+        weight = self._weight(confidence)
+        self.history.append((gesture_name, weight))
+        self.counts[gesture_name] = self.counts.get(gesture_name, 0) + 1
+        self.weights[gesture_name] = self.weights.get(gesture_name, 0.0) + weight
+        self.total += weight
+
+        self._updates += 1
+        if self._updates == self.history_length:
+            # Re-sum once per window (amortized O(1)) so rounding errors
+            # from the add/subtract updates don't accumulate
+            self._updates = 0
+            self.weights = dict.fromkeys(self.counts, 0.0)
+            for gesture, w in self.history:
+                self.weights[gesture] += w
+            self.total = sum(self.weights.values())
+
+    def result(self):
+        if not self.weights:
+            return ""
+        gesture = max(self.weights, key=self.weights.__getitem__)
+        if self.weights[gesture] >= self.total * self.dominance:
+            return gesture
+        return ""
+
+    @property
+    def delay_frames(self):
+        # The new gesture must outnumber the old one and reach `dominance`
+        n = self.history_length
+        return max(n // 2 + 1, math.ceil(n * self.dominance))
+
+
+class WeightedVote(MajorityVote):
+    """Sliding-window vote where each prediction counts with its confidence."""
+
+    def _weight(self, confidence):
+        return float(confidence)
+
+
+class EmaVote:
+    """Exponential moving average of the class probabilities."""
+
+    uses_probabilities = True
+
+    def __init__(self, alpha=0.25, confidence_threshold=0.5):
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+        self.alpha = alpha
+        self.confidence_threshold = confidence_threshold
+        self.reset()
+
+    def reset(self):
+        self.scores = {}
+        self.current = ""
+
+    def _average(self, gesture_name, confidence, probabilities):
+        keep = 1.0 - self.alpha
+        scores = self.scores
+        for gesture in list(scores):
+            scores[gesture] *= keep
+            if scores[gesture] < _MIN_SCORE:
+                del scores[gesture]
+        if probabilities is None:
+            probabilities = {gesture_name: confidence}
+        for gesture, probability in probabilities.items():
+            scores[gesture] = scores.get(gesture, 0.0) + self.alpha * probability
+
+    def _best(self):
+        if not self.scores:
+            return "", 0.0
+        gesture = max(self.scores, key=self.scores.__getitem__)
+        return gesture, self.scores[gesture]
+
+    def update(self, gesture_name, confidence, probabilities=None):
+        self._average(gesture_name, confidence, probabilities)
+        gesture, score = self._best()
+        self.current = gesture if score >= self.confidence_threshold else ""
+
+    def result(self):
+        return self.current
+
+    def _frames_to(self, remaining):
+        """Frames until an old score of 1 decays to ``remaining`` or below."""
+        if self.alpha == 1 or remaining >= 1:
+            return 1
+        if remaining <= 0:
+            return math.inf
+        # Tolerance so exact ratios don't round up a frame
+        return max(1, math.ceil(math.log(remaining) / math.log(1 - self.alpha) - 1e-9))
+
+    @property
+    def delay_frames(self):
+        # The new average must overtake the old one (ties keep the old
+        # gesture) and reach the threshold
+        return self._frames_to(min(_OVERTAKE, 1 - self.confidence_threshold))
+
+
+class HysteresisVote(EmaVote):
+    """Averaged probabilities with separate thresholds to show and hide a gesture."""
+
+    def __init__(self, alpha=0.25, enter_threshold=0.6, exit_threshold=0.35):
+        if exit_threshold > enter_threshold:
+            raise ValueError("exit_threshold must not exceed enter_threshold")
+        super().__init__(alpha=alpha, confidence_threshold=enter_threshold)
+        self.enter_threshold = enter_threshold
+        self.exit_threshold = exit_threshold
+
+    def update(self, gesture_name, confidence, probabilities=None):
+        self._average(gesture_name, confidence, probabilities)
+        if self.current and self.scores.get(self.current, 0.0) < self.exit_threshold:
+            self.current = ""
+        gesture, score = self._best()
+        if gesture != self.current and score >= self.enter_threshold:
+            self.current = gesture
+
+    @property
+    def delay_frames(self):
+        return self._frames_to(min(_OVERTAKE, 1 - self.enter_threshold))
+
+
+STRATEGIES = ("majority", "weighted", "ema", "hysteresis")
 
 
 class GestureSmoother:
@@ -6,30 +200,61 @@ class GestureSmoother:
     Smooths gesture predictions to prevent rapid flickering between gestures
     """
 
-    def __init__(self, history_length=10, confidence_threshold=0.5, dominance=0.4):
-        self.history = deque(maxlen=history_length)
+    def __init__(
+        self,
+        history_length=10,
+        confidence_threshold=0.5,
+        dominance=0.4,
+        strategy="majority",
+        alpha=config.SMOOTHING_ALPHA,
+        enter_threshold=config.SMOOTHING_ENTER_THRESHOLD,
+        exit_threshold=config.SMOOTHING_EXIT_THRESHOLD,
+    ):
+        if strategy == "majority":
+            self.strategy = MajorityVote(
+                history_length, confidence_threshold, dominance
+            )
+        elif strategy == "weighted":
+            self.strategy = WeightedVote(
+                history_length, confidence_threshold, dominance
+            )
+        elif strategy == "ema":
+            self.strategy = EmaVote(alpha, confidence_threshold)
+        elif strategy == "hysteresis":
+            self.strategy = HysteresisVote(alpha, enter_threshold, exit_threshold)
+        else:
+            raise ValueError(
+                f"Unknown smoothing strategy {strategy!r}, expected one of {STRATEGIES}"
+            )
+        self.strategy_name = strategy
         self.history_length = history_length
         self.confidence_threshold = confidence_threshold
         self.dominance = dominance
 
-    def update(self, gesture_name, confidence):
+    @property
+    def uses_probabilities(self):
+        """Whether ``update`` makes use of the full class distribution."""
+        return self.strategy.uses_probabilities
+
+    @property
+    def delay_frames(self):
+        """Frames a switch to a new gesture takes to show (see module docs)."""
+        return self.strategy.delay_frames
+
+    def update(self, gesture_name, confidence, probabilities=None):
         """
         Add a new gesture prediction to the history
+
+        ``probabilities`` optionally maps every gesture name to its
+        probability, for the averaging strategies.
         """
-        # Only consider predictions with sufficient confidence
-        if confidence >= self.confidence_threshold:
-            self.history.append(gesture_name)
+        self.strategy.update(gesture_name, confidence, probabilities)
 
     def get_dominant_gesture(self):
         """
-        Return the most frequent gesture in the history, but only if it is
-        dominant enough (appears in at least `dominance` of recent frames).
+        Return the smoothed gesture, or "" when no gesture is steady enough.
         """
-        if not self.history:
-            return ""
-
-        dominant_gesture, max_count = Counter(self.history).most_common(1)[0]
+        return self.strategy.result()
 
-        if max_count >= len(self.history) * self.dominance:
-            return dominant_gesture
-        return ""
+    def reset(self):
+        self.strategy.reset()
@@ -0,0 +1,229 @@
+"""Prometheus text-format metrics endpoint for the running recognizer.
+
+``MetricsServer`` serves ``GET /metrics`` from a daemon thread using the
+standard library's HTTP server, so there is nothing extra to install on a
+kiosk. Each scrape calls a ``collect`` function on the server thread, which
+reads the app's counters and ring buffers without locking: the frame loop
+does no extra work per frame beyond the counter updates it makes anyway.
+
+``app_metrics`` collects the metrics of a ``GestureRecognitionApp``: frame
+rate, per-stage and frame latency histograms, dropped frames, hand-present
+ratio, predictions per gesture, prediction cache hits (when enabled), audio
+queue depth and process RSS.
+"""
+
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+PREFIX = "gesture_"
+
+
+def process_rss_bytes():
+    """Resident set size of this process in bytes (``None`` if unknown).
+
+    Reads ``/proc/self/statm`` on Linux; elsewhere falls back to the peak
+    RSS from ``getrusage``.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsWriter:
+    """Builds a Prometheus text exposition, one metric family at a time."""
+
+    def __init__(self, prefix=PREFIX):
+        self.prefix = prefix
+        self.lines = []
+
+    def _header(self, name, kind, help_text):
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {kind}")
+
+    def add(self, name, kind, help_text, samples):
+        """Add a gauge or counter; ``samples`` is a number or ``(labels, value)`` pairs."""
+        name = self.prefix + name
+        self._header(name, kind, help_text)
+        if not isinstance(samples, list):
+            samples = [({}, samples)]
+        for labels, value in samples:
+            if value is not None:
+                self.lines.append(f"{name}{_labels(labels)} {_number(value)}")
+
+    def add_histogram(self, name, help_text, histograms):
+        """Add a histogram; ``histograms`` is ``(labels, LatencyHistogram)`` pairs."""
+        name = self.prefix + name
+        self._header(name, "histogram", help_text)
+        for labels, histogram in histograms:
+            # Snapshot first: the frame loop may observe while we format
+            counts = list(histogram.counts)
+            total, count = histogram.sum, histogram.count
+            cumulative = 0
+            for bound, bucket in zip([*histogram.buckets, float("inf")], counts):
+                cumulative += bucket
+                bucket_labels = {**labels, "le": _number(float(bound))}
+                self.lines.append(f"{name}_bucket{_labels(bucket_labels)} {cumulative}")
+            self.lines.append(f"{name}_sum{_labels(labels)} {_number(float(total))}")
+            self.lines.append(f"{name}_count{_labels(labels)} {count}")
+
+    def text(self):
+        return "\n".join(self.lines) + "\n"
+
+
+def app_metrics(app):
+    """Collect a ``GestureRecognitionApp``'s metrics as Prometheus text."""
+    perf = app.perf_analyzer
+    writer = MetricsWriter()
+
+    writer.add("fps", "gauge", "Frames per second over the recent frames.", perf.get_fps())
+    writer.add("frames_total", "counter", "Frames presented.", perf.frame_count)
+    writer.add_histogram(
+        "frame_seconds", "Frame time (start to end of a frame).", [({}, perf.frame_histogram)]
+    )
+    writer.add_histogram(
+        "stage_seconds",
+        "Time spent per frame in each stage.",
+        [({"stage": name}, h) for name, h in list(perf.histograms.items())],
+    )
+
+    dropped = [({"source": "camera"}, getattr(app.camera, "dropped", 0))]
+    dropped += [
+        ({"source": f"queue_{name}"}, stats[2])
+        for name, stats in list(app.queue_stats.items())
+    ]
+    writer.add(
+        "dropped_frames_total",
+        "counter",
+        "Frames dropped for newer ones (camera reader and pipeline queues).",
+        dropped,
+    )
+
+    writer.add(
+        "hand_frames_total", "counter", "Classified frames with a hand.", app.hand_frames
+    )
+    writer.add(
+        "classified_frames_total",
+        "counter",
+        "Frames that reached classification.",
+        app.classified_frames,
+    )
+    writer.add(
+        "hand_present_ratio",
+        "gauge",
+        "Fraction of recent classified frames with a hand.",
+        app.hand_presence.mean() if len(app.hand_presence) else None,
+    )
+    writer.add(
+        "predictions_total",
+        "counter",
+        "Classifier predictions per gesture (before smoothing).",
+        [({"gesture": g}, n) for g, n in list(app.prediction_counts.items())],
+    )
+    cache = getattr(app.gesture_manager, "cache", None)
+    if cache is not None:
+        writer.add(
+            "prediction_cache_lookups_total",
+            "counter",
+            "Prediction cache lookups by result.",
+            [({"result": "hit"}, cache.hits), ({"result": "miss"}, cache.misses)],
+        )
+        writer.add(
+            "prediction_cache_saved_seconds_total",
+            "counter",
+            "Estimated inference time saved by prediction cache hits.",
+            cache.saved_seconds,
+        )
+    writer.add(
+        "audio_queue_depth",
+        "gauge",
+        "Announcements being synthesized or played.",
+        app.audio_manager.queue_depth(),
+    )
+    writer.add(
+        "process_resident_memory_bytes",
+        "gauge",
+        "Resident set size of the process.",
+        process_rss_bytes(),
+    )
+    return writer.text()
+
+
+class MetricsServer:
+    """Serve ``collect()`` at ``http://host:port/metrics`` from a daemon thread.
+
+    Port 0 picks a free port (see ``port`` after ``start``).
+    """
+
+    def __init__(self, collect, port, host="127.0.0.1"):
+        self.collect = collect
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        collect = self.collect
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                try:
+                    body = collect().encode("utf-8")
+                except Exception as e:  # noqa: BLE001 - report, keep serving
+                    self.send_error(500, str(e))
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # scrapes every few seconds would flood the console
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="metrics-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = self._thread = None
@@ -0,0 +1,105 @@
+"""Pure-NumPy inference for dense (MLP) gesture classifiers.
+
+Both the bundled model and the ones trained by ``GestureTrainer`` are a
+Flatten followed by Dense layers, so their forward pass is a handful of
+matrix multiplies. Running it in NumPy from weights exported to ``.npz``
+(see ``gesture_recognition.export``) keeps TensorFlow out of the
+recognition path entirely: no multi-second import, far less memory, and
+single-sample inference in microseconds instead of a framework call.
+"""
+
+import os
+
+import numpy as np
+
+
+def _relu(x):
+    return np.maximum(x, 0, out=x)
+
+
+def _softmax(x):
+    x -= x.max(axis=1, keepdims=True)
+    np.exp(x, out=x)
+    x /= x.sum(axis=1, keepdims=True)
+    return x
+
+
+def _sigmoid(x):
+    np.negative(x, out=x)
+    np.exp(x, out=x)
+    x += 1
+    return np.reciprocal(x, out=x)
+
+
+ACTIVATIONS = {
+    "linear": lambda x: x,
+    "relu": _relu,
+    "softmax": _softmax,
+    "sigmoid": _sigmoid,
+    "tanh": lambda x: np.tanh(x, out=x),
+}
+
+
+def weights_path(model_path):
+    """Path of the exported ``.npz`` weights for a model path.
+
+    ``models/custom_model`` -> ``models/custom_model.npz``; paths that already
+    end in ``.npz`` are returned unchanged.
+    """
+    model_path = os.fspath(model_path).rstrip("/\\")
+    return model_path if model_path.endswith(".npz") else f"{model_path}.npz"
+
+
+class NumpyDenseModel:
+    """Forward pass of a Flatten -> Dense* network on NumPy arrays.
+
+    Called like a Keras model: ``model(inputs)`` takes a batch of samples of
+    any shape (flattened per sample) and returns the output of the last
+    layer as a ``(batch, classes)`` float32 array.
+    """
+
+    def __init__(self, layers):
+        self.layers = []
+        self.activations = []
+        for kernel, bias, activation in layers:
+            if activation not in ACTIVATIONS:
+                raise ValueError(f"Unsupported activation: {activation}")
+            self.layers.append(
+                (
+                    np.ascontiguousarray(kernel, dtype=np.float32),
+                    np.ascontiguousarray(bias, dtype=np.float32),
+                    ACTIVATIONS[activation],
+                )
+            )
+            self.activations.append(activation)
+
+    @classmethod
+    def load(cls, path):
+        """Load weights written by ``gesture_recognition.export.export_npz``."""
+        with np.load(path, allow_pickle=False) as data:
+            activations = [str(a) for a in data["activations"]]
+            layers = [
+                (data[f"kernel_{i}"], data[f"bias_{i}"], activation)
+                for i, activation in enumerate(activations)
+            ]
+        return cls(layers)
+
+    def save(self, path):
+        """Write the layers in the format :meth:`load` reads."""
+        arrays = {"activations": np.array(self.activations)}
+        for i, (kernel, bias, _) in enumerate(self.layers):
+            arrays[f"kernel_{i}"] = kernel
+            arrays[f"bias_{i}"] = bias
+        np.savez(path, **arrays)
+
+    @property
+    def input_size(self):
+        return self.layers[0][0].shape[0]
+
+    def __call__(self, inputs, training=False):
+        x = np.asarray(inputs, dtype=np.float32).reshape(len(inputs), -1)
+        for kernel, bias, activation in self.layers:
+            x = x @ kernel
+            x += bias
+            x = activation(x)
+        return x
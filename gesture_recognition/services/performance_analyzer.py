@@ -1,69 +1,199 @@
+import bisect
+import functools
 import time
-import numpy as np
+
 import cv2
 
+from gesture_recognition.services.ring_buffer import RingBuffer
+from gesture_recognition.services.tracer import NULL_TRACER
+
+PERCENTILES = (50, 95, 99)
+
+# Upper bounds (seconds) of the cumulative latency histogram buckets, from
+# sub-millisecond smoothing up to a whole dropped-frame budget
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.02, 0.033, 0.05, 0.1, 0.25, 0.5, 1.0,
+)  # fmt: skip
+
+
+class LatencyHistogram:
+    """Lifetime bucket counts of a stage's durations (for metrics export).
+
+    ``counts[i]`` counts durations ``<= buckets[i]`` that didn't fit an
+    earlier bucket; the last slot counts everything slower than the last
+    bound.
+    """
+
+    __slots__ = ("buckets", "count", "counts", "sum")
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, duration):
+        self.counts[bisect.bisect_left(self.buckets, duration)] += 1
+        self.count += 1
+        self.sum += duration
+
+
+class _StageTimer:
+    """Context manager recording the time spent in its block (see ``stage``)."""
+
+    __slots__ = ("analyzer", "name", "start")
+
+    def __init__(self, analyzer, name):
+        self.analyzer = analyzer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        end = time.perf_counter()
+        self.analyzer.record(self.name, end - self.start)
+        self.analyzer.tracer.add(self.name, "stage", self.start, end)
+        return False
+
 
 class PerformanceAnalyzer:
     """
     Tracks performance metrics for the application.
+
+    Frame times and named stage timings (e.g. ``detect``, ``predict``) are
+    kept in fixed-size ring buffers of the last ``max_samples`` values.
+    Statistics (mean, p50/p95/p99, jitter = standard deviation) are computed
+    on demand; the on-screen overlay recomputes them at most every
+    ``refresh_interval`` seconds instead of on every frame.
+
+    Every stage also feeds a ``LatencyHistogram`` over the whole run, and
+    ``frame_count`` counts frames, for the metrics endpoint.
+
+    Stages timed with ``stage`` / ``timed`` are also recorded as spans on
+    ``tracer`` (a no-op unless tracing is on).
+
+    Stages can be recorded from several threads (pipelined mode), as long
+    as each stage is recorded from one thread.
     """
 
-    def __init__(self, max_samples=100):
-        self.detection_times = []
-        self.prediction_times = []
-        self.frame_times = []
+    def __init__(self, max_samples=100, refresh_interval=0.5, tracer=NULL_TRACER):
         self.max_samples = max_samples
-        self.last_frame_time = time.time()
+        self.tracer = tracer
+        self.refresh_interval = refresh_interval
+        self.frame_times = RingBuffer(max_samples)
+        self.frame_histogram = LatencyHistogram()
+        self.frame_count = 0
+        self.stages = {}
+        self.histograms = {}
+        self.last_frame_time = time.perf_counter()
+        self._overlay_metrics = None
+        self._overlay_time = 0.0
 
     def start_frame(self):
         """Mark the start of a new frame"""
-        self.last_frame_time = time.time()
+        self.last_frame_time = time.perf_counter()
+
+    def end_frame(self):
+        """Mark the end of a frame; returns its duration in seconds."""
+        frame_duration = time.perf_counter() - self.last_frame_time
+        self.frame_times.append(frame_duration)
+        self.frame_histogram.observe(frame_duration)
+        self.frame_count += 1
+        return frame_duration
+
+    def record(self, name, duration):
+        """Record ``duration`` seconds spent in stage ``name``."""
+        buffer = self.stages.get(name)
+        if buffer is None:
+            # Histogram first: readers iterate ``stages`` and look up both
+            self.histograms[name] = LatencyHistogram()
+            buffer = self.stages[name] = RingBuffer(self.max_samples)
+        buffer.append(duration)
+        self.histograms[name].observe(duration)
+
+    def stage(self, name):
+        """Time a block as stage ``name``: ``with analyzer.stage("detect"): ...``"""
+        return _StageTimer(self, name)
+
+    def timed(self, name):
+        """Decorator recording every call of the function as stage ``name``."""
+
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with _StageTimer(self, name):
+                    return fn(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
 
     def log_detection_time(self, duration):
         """Log the time taken for hand detection"""
-        self.detection_times.append(duration)
-        if len(self.detection_times) > self.max_samples:
-            self.detection_times.pop(0)
+        self.record("detect", duration)
 
     def log_prediction_time(self, duration):
         """Log the time taken for gesture prediction"""
-        self.prediction_times.append(duration)
-        if len(self.prediction_times) > self.max_samples:
-            self.prediction_times.pop(0)
-
-    def end_frame(self):
-        """Mark the end of a frame and calculate FPS"""
-        now = time.time()
-        frame_duration = now - self.last_frame_time
-        self.frame_times.append(frame_duration)
-        if len(self.frame_times) > self.max_samples:
-            self.frame_times.pop(0)
-        return frame_duration
+        self.record("predict", duration)
 
     def get_fps(self):
         """Calculate average frames per second"""
-        if not self.frame_times:
-            return 0
-        avg_frame_time = np.mean(self.frame_times)
+        avg_frame_time = self.frame_times.mean()
         return 1.0 / avg_frame_time if avg_frame_time > 0 else 0
 
+    @staticmethod
+    def _summary(buffer):
+        p50, p95, p99 = buffer.percentiles(PERCENTILES)
+        return {
+            "count": len(buffer),
+            "mean": buffer.mean(),
+            "p50": float(p50),
+            "p95": float(p95),
+            "p99": float(p99),
+            "jitter": buffer.std(),
+        }
+
+    def stage_stats(self, name):
+        """Statistics (in seconds) of stage ``name``, ``None`` if never recorded."""
+        buffer = self.stages.get(name)
+        return self._summary(buffer) if buffer is not None and len(buffer) else None
+
     def get_metrics(self):
-        """Get a dictionary of performance metrics"""
-        metrics = {
+        """Get a dictionary of performance metrics (times in seconds)."""
+        stages = {
+            name: self._summary(buffer)
+            for name, buffer in list(self.stages.items())
+            if len(buffer)
+        }
+        return {
             "fps": self.get_fps(),
-            "avg_detection_time": (
-                np.mean(self.detection_times) if self.detection_times else 0
-            ),
-            "avg_prediction_time": (
-                np.mean(self.prediction_times) if self.prediction_times else 0
-            ),
-            "avg_frame_time": np.mean(self.frame_times) if self.frame_times else 0,
+            "avg_detection_time": self._mean("detect"),
+            "avg_prediction_time": self._mean("predict"),
+            "avg_frame_time": self.frame_times.mean(),
+            "frame": self._summary(self.frame_times),
+            "stages": stages,
         }
-        return metrics
 
-    def draw_metrics(self, frame):
-        """Draw performance metrics on the frame"""
-        metrics = self.get_metrics()
+    def _mean(self, name):
+        buffer = self.stages.get(name)
+        return buffer.mean() if buffer is not None else 0
+
+    def draw_metrics(self, frame, breakdown=False):
+        """Draw performance metrics on the frame.
+
+        With ``breakdown``, also draws each stage's p50/p95 and its share of
+        the mean frame time, to show which stage is eating the frame budget.
+        """
+        now = time.perf_counter()
+        if (
+            self._overlay_metrics is None
+            or now - self._overlay_time >= self.refresh_interval
+        ):
+            self._overlay_metrics = self.get_metrics()
+            self._overlay_time = now
+        metrics = self._overlay_metrics
 
         cv2.putText(
             frame,
@@ -74,5 +204,33 @@ class PerformanceAnalyzer:
             (0, 255, 0),
             1,
         )
+        if not breakdown:
+            return frame
 
+        frame_stats = metrics["frame"]
+        lines = [
+            (
+                f"frame p50 {frame_stats['p50'] * 1000:5.1f} "
+                f"p95 {frame_stats['p95'] * 1000:5.1f} "
+                f"jitter {frame_stats['jitter'] * 1000:4.1f} ms"
+            )
+        ]
+        frame_time = metrics["avg_frame_time"]
+        for name, stats in metrics["stages"].items():
+            share = stats["mean"] / frame_time if frame_time > 0 else 0
+            lines.append(
+                f"{name:<8} p50 {stats['p50'] * 1000:5.1f} "
+                f"p95 {stats['p95'] * 1000:5.1f} ms {share:4.0%}"
+            )
+        for i, line in enumerate(lines):
+            cv2.putText(
+                frame,
+                line,
+                (frame.shape[1] - 330, 55 + 20 * i),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                0.45,
+                (0, 255, 0),
+                1,
+                cv2.LINE_AA,
+            )
         return frame
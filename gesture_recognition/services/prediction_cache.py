@@ -0,0 +1,99 @@
+"""Memo of classifier outputs for near-identical hand poses.
+
+While a user holds a gesture, the classifier gets almost the same landmark
+vector frame after frame. ``PredictionCache`` rounds each model input to a
+grid of ``step`` units and keeps the model's probability row for every
+grid cell it has seen, in a bounded LRU. A hit skips the model for that hand.
+
+``step`` is in the model's input units. For normalized landmarks (wrist at
+the origin, largest coordinate 1) the default of 0.05 is a twentieth of
+the hand size. For a model on raw pixel coordinates it would be pixels.
+A coarser grid hits more often but may round two different poses into
+one cell.
+
+The cache knows nothing about the model. ``GestureManager`` clears it
+whenever the model or the class list changes.
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+
+
+class PredictionCache:
+    """Bounded LRU of probability rows keyed by quantized input vectors."""
+
+    def __init__(self, capacity, step):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        if step <= 0:
+            raise ValueError("step must be positive")
+        self.capacity = capacity
+        self.step = step
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        # Model time spent on misses, to estimate the time hits saved
+        self.miss_seconds = 0.0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def key(self, vector):
+        """The grid cell of one input vector, as a hashable key."""
+        cells = np.rint(np.asarray(vector, dtype=np.float32) / self.step)
+        return cells.astype(np.int32).tobytes()
+
+    def get(self, key):
+        """The cached probability row for ``key``, or ``None``."""
+        row = self._entries.get(key)
+        if row is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return row
+
+    def put(self, key, row):
+        self._entries[key] = row
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def record_model_time(self, seconds):
+        """Account ``seconds`` of model time spent on missed inputs."""
+        self.miss_seconds += seconds
+
+    def clear(self):
+        """Drop every entry (the model or its classes changed)."""
+        if self._entries:
+            self._entries.clear()
+            self.invalidations += 1
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def saved_seconds(self):
+        """Estimated model time the hits saved (hits x mean time per miss)."""
+        return self.hits * self.miss_seconds / self.misses if self.misses else 0.0
+
+    def stats(self):
+        return {
+            "entries": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "saved_seconds": self.saved_seconds,
+            "invalidations": self.invalidations,
+        }
+
+    def format_stats(self):
+        return (
+            f"Prediction cache: {self.hit_rate:.0%} hit rate "
+            f"({self.hits} of {self.hits + self.misses}), "
+            f"~{self.saved_seconds * 1000:.0f} ms of inference saved"
+        )
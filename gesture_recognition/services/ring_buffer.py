@@ -0,0 +1,82 @@
+import numpy as np
+
+
+class RingBuffer:
+    """Fixed-capacity buffer of the most recent float samples.
+
+    Samples live in a preallocated NumPy array that is overwritten in place
+    once full, so appending is O(1) with no allocation. A running sum and
+    sum of squares keep ``mean()`` and ``std()`` O(1) as well (they are
+    re-summed exactly once per lap through the buffer).
+    """
+
+    def __init__(self, capacity, dtype=np.float64):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=dtype)
+        self._next = 0
+        self._count = 0
+        self._sum = 0.0
+        self._sum_sq = 0.0
+
+    def __len__(self):
+        return self._count
+
+    def append(self, value):
+        if self._count == self.capacity:
+            old = float(self._data[self._next])
+            self._sum -= old
+            self._sum_sq -= old * old
+        else:
+            self._count += 1
+        self._data[self._next] = value
+        self._sum += value
+        self._sum_sq += value * value
+        self._next += 1
+        if self._next == self.capacity:
+            self._next = 0
+            # Re-sum once per lap (amortized O(1)) so rounding errors from
+            # the add/subtract updates don't accumulate over a long run
+            self._sum = float(self._data.sum())
+            self._sum_sq = float(np.dot(self._data, self._data))
+
+    def clear(self):
+        self._next = self._count = 0
+        self._sum = self._sum_sq = 0.0
+
+    def values(self):
+        """The stored samples as an array view, in storage (not time) order.
+
+        Order doesn't matter for the statistics; use ``ordered()`` when it
+        does.
+        """
+        return self._data[: self._count]
+
+    def ordered(self):
+        """A copy of the stored samples, oldest first."""
+        if self._count < self.capacity:
+            return self._data[: self._count].copy()
+        return np.roll(self._data, -self._next)
+
+    def last(self):
+        """The most recent sample (``None`` when empty)."""
+        if not self._count:
+            return None
+        return float(self._data[self._next - 1])
+
+    def mean(self):
+        return self._sum / self._count if self._count else 0.0
+
+    def std(self):
+        if not self._count:
+            return 0.0
+        mean = self._sum / self._count
+        # max(): rounding in the running sums can dip just below zero
+        return max(self._sum_sq / self._count - mean * mean, 0.0) ** 0.5
+
+    def percentiles(self, qs):
+        """Percentiles ``qs`` (0-100) of the stored samples."""
+        if not self._count:
+            return np.zeros(len(qs))
+        return np.percentile(self.values(), qs)
@@ -0,0 +1,151 @@
+"""Low-overhead statistical CPU profiler over all Python threads.
+
+A daemon thread wakes every ``interval`` seconds, takes every thread's
+current stack from ``sys._current_frames()`` and counts it. Nothing is
+hooked into the profiled code, so unlike cProfile the per-frame loop runs
+at its normal speed: the only cost is the sampler briefly holding the GIL
+(tens of microseconds per sample).
+
+Results are written as collapsed stacks, one ``thread;outer;...;inner
+count`` line per distinct stack, which ``flamegraph.pl``, speedscope and
+https://www.speedscope.app read directly, plus a top-N table of the
+hottest functions by self and total samples.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from gesture_recognition import config
+
+
+class SamplingProfiler:
+    """Sample all threads' stacks for ``duration`` seconds (``None``: until stopped).
+
+    ``output_path`` receives the collapsed stacks and ``<output_path>.top.txt``
+    the hot-function summary, when the window ends or on ``stop()``,
+    whichever comes first.
+    """
+
+    def __init__(
+        self,
+        output_path,
+        duration=config.PROFILE_SECONDS,
+        interval=config.PROFILE_INTERVAL,
+        top=config.PROFILE_TOP,
+    ):
+        self.output_path = os.fspath(output_path)
+        self.duration = duration or None
+        self.interval = interval
+        self.top = top
+        self.stacks = Counter()
+        self.samples = 0
+        self._labels = {}
+        self._stop = threading.Event()
+        self._thread = None
+        self._finished = False
+        self._lock = threading.Lock()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop sampling (if still running) and write the results."""
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._finish()
+
+    def _run(self):
+        own = threading.get_ident()
+        deadline = None if self.duration is None else time.monotonic() + self.duration
+        while not self._stop.wait(self.interval):
+            self._sample(own)
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+        self._finish()
+
+    def _sample(self, own):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for tid, frame in sys._current_frames().items():
+            if tid == own:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self._label(frame.f_code))
+                frame = frame.f_back
+            stack.append(names.get(tid, f"thread {tid}"))
+            stack.reverse()
+            self.stacks[tuple(stack)] += 1
+        self.samples += 1
+
+    def _label(self, code):
+        # Cached per code object: formatting is most of the sampling cost
+        label = self._labels.get(code)
+        if label is None:
+            path = code.co_filename
+            if path.startswith(config.BASE_DIR):
+                path = os.path.relpath(path, config.BASE_DIR)
+            else:
+                path = os.path.join(*path.split(os.sep)[-2:]) if os.sep in path else path
+            name = getattr(code, "co_qualname", code.co_name)
+            label = f"{name}({path}:{code.co_firstlineno})".replace(";", ":")
+            self._labels[code] = label
+        return label
+
+    def collapsed(self):
+        """Collapsed-stack lines, most frequent first."""
+        return [
+            f"{';'.join(stack).replace(' ', '_')} {count}"
+            for stack, count in self.stacks.most_common()
+        ]
+
+    def top_functions(self, n=None):
+        """``(function, self_samples, total_samples)`` of the hottest functions.
+
+        Self counts samples where the function was running (the leaf of the
+        stack), total counts samples where it was anywhere on the stack.
+        """
+        own, total = Counter(), Counter()
+        for stack, count in self.stacks.items():
+            frames = stack[1:]  # skip the thread name
+            if not frames:
+                continue
+            own[frames[-1]] += count
+            for function in set(frames):
+                total[function] += count
+        ranked = sorted(total, key=lambda f: (own[f], total[f]), reverse=True)
+        return [(f, own[f], total[f]) for f in ranked[: n or self.top]]
+
+    def format_top(self, n=None):
+        stack_samples = sum(self.stacks.values()) or 1
+        threads = len({stack[0] for stack in self.stacks})
+        interval_ms = self.interval * 1000
+        lines = [
+            f"{self.samples} samples of {threads} thread(s) every {interval_ms:g} ms",
+            f"{'self':>7}{'total':>8}  function",
+        ]
+        for function, own, total in self.top_functions(n):
+            lines.append(
+                f"{own / stack_samples:>7.1%}{total / stack_samples:>8.1%}  {function}"
+            )
+        return "\n".join(lines)
+
+    def _finish(self):
+        with self._lock:
+            if self._finished:
+                return
+            self._finished = True
+        directory = os.path.dirname(self.output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.output_path, "w") as f:
+            f.writelines(line + "\n" for line in self.collapsed())
+        summary = self.format_top()
+        with open(f"{self.output_path}.top.txt", "w") as f:
+            f.write(summary + "\n")
+        print(f"Wrote CPU profile to {self.output_path}\n{summary}")
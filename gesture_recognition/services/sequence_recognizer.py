@@ -0,0 +1,116 @@
+"""Streaming recognition of dynamic (motion) gestures.
+
+``SequenceRecognizer`` feeds one hand's landmarks, frame by frame, to a
+``TemporalStream`` of a sequence model trained by ``SequenceTrainer``. The
+model was trained on takes resampled to a steady ``fps``. Camera frames
+arrive irregularly, so the recognizer steps the model on that same clock:
+it interpolates the landmarks at every tick between two frames. A camera
+slower than ``fps`` gets several steps per frame, a faster one a step on
+some frames only.
+"""
+
+import os
+
+import numpy as np
+
+from gesture_recognition import config
+from gesture_recognition.sequences import frame_features
+from gesture_recognition.services.gesture_smoothing import GestureSmoother
+from gesture_recognition.services.numpy_model import weights_path
+from gesture_recognition.services.temporal_model import NumpyTemporalModel
+
+# A gap longer than this between frames (the hand was lost, the app
+# paused) starts a new sequence instead of interpolating across it
+MAX_FRAME_GAP = 0.5
+
+# A frame this close before a tick is taken as on it (frames timestamped
+# exactly at the model's rate would otherwise miss steps to rounding)
+_TICK_TOLERANCE = 1e-6
+
+
+class SequenceRecognizer:
+    """Smoothed dynamic gesture of one hand, updated every frame.
+
+    ``update(landmarks, timestamp)`` returns ``(gesture, confidence)``.
+    The gesture is ``""`` while nothing is recognized or the model
+    recognizes ``idle_class``, the "no gesture" class it should be trained
+    with. The model's outputs are smoothed with hysteresis (see
+    ``GestureSmoother``).
+    """
+
+    def __init__(
+        self,
+        model,
+        class_names,
+        fps=config.SEQUENCE_FPS,
+        idle_class=config.SEQUENCE_IDLE_CLASS,
+    ):
+        self.model = model
+        self.stream = model.stream()
+        self.class_names = class_names
+        self.fps = fps
+        self.idle_class = idle_class
+        self.smoother = GestureSmoother(strategy="hysteresis")
+        self.steps = 0
+        self.reset()
+
+    @classmethod
+    def load(cls, model_path, names_path=None, **kwargs):
+        """Load ``<model_path>.npz`` and ``<model_path>_gestures.txt``."""
+        model = NumpyTemporalModel.load(weights_path(model_path))
+        names_path = names_path or f"{os.fspath(model_path)}_gestures.txt"
+        with open(names_path) as f:
+            class_names = [line.strip() for line in f if line.strip()]
+        print(f"Loaded {len(class_names)} dynamic gestures: {', '.join(class_names)}")
+        return cls(model, class_names, **kwargs)
+
+    def reset(self):
+        """Forget the current sequence (e.g. when the hand is lost)."""
+        self.stream.reset()
+        self.smoother.reset()
+        self._last = None  # (timestamp, landmarks) of the previous frame
+        self._start = None  # time of the first model step
+        self._ticks = 0  # model steps since the first one
+        self._stepped = None  # landmarks at the previous model step
+        self.probabilities = None
+
+    def _step(self, landmarks):
+        features = frame_features(landmarks[np.newaxis], self._stepped[np.newaxis])
+        self._stepped = landmarks
+        self.probabilities = self.stream.step(features[0])
+        self.steps += 1
+        class_id = int(np.argmax(self.probabilities))
+        self.smoother.update(
+            self.class_names[class_id],
+            float(self.probabilities[class_id]),
+            dict(zip(self.class_names, self.probabilities.tolist())),
+        )
+
+    def update(self, landmarks, timestamp):
+        """Add one frame's ``(21, 2)`` pixel landmarks, taken at ``timestamp`` (s)."""
+        landmarks = np.asarray(landmarks, dtype=np.float32)[:, :2]
+        if self._last is not None and timestamp - self._last[0] > MAX_FRAME_GAP:
+            self.reset()
+        if self._last is None:
+            self._stepped = landmarks
+            self._step(landmarks)
+            self._start = timestamp
+        else:
+            last_time, last_landmarks = self._last
+            span = timestamp - last_time
+            while True:
+                # Counted from the start, so rounding errors don't add up
+                tick = self._start + (self._ticks + 1) / self.fps
+                if tick > timestamp + _TICK_TOLERANCE:
+                    break
+                weight = min((tick - last_time) / span, 1.0) if span > 0 else 1.0
+                self._step(last_landmarks + weight * (landmarks - last_landmarks))
+                self._ticks += 1
+        self._last = (timestamp, landmarks)
+        return self.result()
+
+    def result(self):
+        gesture = self.smoother.get_dominant_gesture()
+        if not gesture or gesture == self.idle_class:
+            return "", 0.0
+        return gesture, float(self.probabilities[self.class_names.index(gesture)])
@@ -0,0 +1,156 @@
+"""Pure-NumPy streaming inference for causal temporal (dynamic-gesture) models.
+
+The sequence models trained by ``SequenceTrainer`` are a stack of dilated
+1D convolutions without padding, followed by Dense layers. The last conv
+layer outputs a single time step for a window exactly as long as the
+stack's receptive field, so every prediction only looks at past frames.
+
+Running that model on the full window every frame would redo all the work
+for the frames it already saw. ``TemporalStream`` instead keeps, for each
+conv layer, a ring buffer of the inputs its kernel still needs (``(k - 1)
+* dilation + 1`` of them). A new frame costs one small matrix multiply per
+layer, the same whatever the window length, and gives exactly the output
+the full-window model would.
+"""
+
+import numpy as np
+
+from gesture_recognition.services.numpy_model import ACTIVATIONS, NumpyDenseModel
+
+
+class NumpyTemporalModel:
+    """Forward pass of a dilated Conv1D* -> Dense* network on NumPy arrays.
+
+    ``convs`` is a list of ``(kernel, bias, dilation, activation)`` with
+    Keras-shaped ``(kernel_size, in, out)`` kernels, ``dense`` a list of
+    ``(kernel, bias, activation)`` as for ``NumpyDenseModel``.
+    """
+
+    def __init__(self, convs, dense):
+        self.convs = []
+        self.conv_activations = []
+        for kernel, bias, dilation, activation in convs:
+            if activation not in ACTIVATIONS:
+                raise ValueError(f"Unsupported activation: {activation}")
+            self.convs.append(
+                (
+                    np.ascontiguousarray(kernel, dtype=np.float32),
+                    np.ascontiguousarray(bias, dtype=np.float32),
+                    int(dilation),
+                    ACTIVATIONS[activation],
+                )
+            )
+            self.conv_activations.append(activation)
+        self.head = NumpyDenseModel(dense)
+
+    @classmethod
+    def load(cls, path):
+        """Load weights written by :meth:`save`."""
+        with np.load(path, allow_pickle=False) as data:
+            convs = [
+                (data[f"conv_kernel_{i}"], data[f"conv_bias_{i}"], dilation, str(a))
+                for i, (dilation, a) in enumerate(
+                    zip(data["conv_dilations"].tolist(), data["conv_activations"])
+                )
+            ]
+            dense = [
+                (data[f"kernel_{i}"], data[f"bias_{i}"], str(a))
+                for i, a in enumerate(data["activations"])
+            ]
+        return cls(convs, dense)
+
+    def save(self, path):
+        arrays = {
+            "conv_dilations": np.array([d for _, _, d, _ in self.convs]),
+            "conv_activations": np.array(self.conv_activations),
+            "activations": np.array(self.head.activations),
+        }
+        for i, (kernel, bias, _, _) in enumerate(self.convs):
+            arrays[f"conv_kernel_{i}"] = kernel
+            arrays[f"conv_bias_{i}"] = bias
+        for i, (kernel, bias, _) in enumerate(self.head.layers):
+            arrays[f"kernel_{i}"] = kernel
+            arrays[f"bias_{i}"] = bias
+        np.savez(path, **arrays)
+
+    @property
+    def feature_size(self):
+        return self.convs[0][0].shape[1]
+
+    @property
+    def receptive_field(self):
+        """Frames that one prediction depends on (the training window)."""
+        return 1 + sum((len(kernel) - 1) * d for kernel, _, d, _ in self.convs)
+
+    def __call__(self, windows, training=False):
+        """Predictions for the last frame of each ``(batch, frames, features)`` window.
+
+        Windows shorter than the receptive field are padded at the start by
+        repeating their first frame, as ``TemporalStream`` does.
+        """
+        x = np.asarray(windows, dtype=np.float32)
+        missing = self.receptive_field - x.shape[1]
+        if missing > 0:
+            x = np.concatenate([np.repeat(x[:, :1], missing, axis=1), x], axis=1)
+        for kernel, bias, dilation, activation in self.convs:
+            steps = x.shape[1] - (len(kernel) - 1) * dilation
+            out = np.zeros((len(x), steps, kernel.shape[2]), np.float32)
+            for j, tap in enumerate(kernel):
+                out += x[:, j * dilation : j * dilation + steps] @ tap
+            out += bias
+            x = activation(out.reshape(-1, out.shape[2])).reshape(out.shape)
+        return self.head(x[:, -1])
+
+    def stream(self):
+        """A ``TemporalStream`` that runs this model one frame at a time."""
+        return TemporalStream(self)
+
+
+class TemporalStream:
+    """Frame-by-frame inference of a ``NumpyTemporalModel``.
+
+    ``step(features)`` takes one frame's feature vector and returns the
+    class probabilities for the window ending at that frame. After
+    ``reset()`` the history is as if the first frame had been repeated
+    forever, the same padding ``NumpyTemporalModel.__call__`` uses.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.layers = []
+        for kernel, bias, dilation, activation in model.convs:
+            size, n_in, n_out = kernel.shape
+            span = (size - 1) * dilation + 1
+            self.layers.append(
+                (
+                    # All taps in one matrix multiply: (size * in, out)
+                    kernel.reshape(size * n_in, n_out),
+                    bias,
+                    activation,
+                    dilation,
+                    span,
+                    # Every input is written twice, span apart, so the last
+                    # span inputs are always one contiguous slice
+                    np.zeros((2 * span, n_in), np.float32),
+                )
+            )
+        self.reset()
+
+    def reset(self):
+        self.position = -1  # count of frames stepped since the reset, minus 1
+
+    def step(self, features):
+        x = np.asarray(features, dtype=np.float32)
+        self.position += 1
+        for kernel, bias, activation, dilation, span, buffer in self.layers:
+            i = self.position % span
+            if self.position == 0:
+                buffer[:] = x
+            else:
+                buffer[i] = buffer[i + span] = x
+            # Every dilation-th of the last span inputs, oldest first, are
+            # the kernel's taps
+            x = buffer[i + 1 : i + 1 + span : dilation].reshape(1, -1) @ kernel
+            x += bias
+            x = activation(x)
+        return self.model.head(x)[0]
@@ -0,0 +1,77 @@
+"""TFLite inference for exported gesture classifiers.
+
+Runs ``.tflite`` files written by ``gesture_recognition.export.export_tflite``
+(float32, float16 or full-int8 quantized) through the TFLite interpreter.
+Uses the standalone ``tflite_runtime`` package when it is installed (small,
+suited to low-end deployment boxes) and falls back to ``tf.lite`` otherwise.
+"""
+
+import os
+
+import numpy as np
+
+# Variants written by `main.py export-tflite`, smallest last
+TFLITE_VARIANTS = ("float32", "float16", "int8")
+
+
+def tflite_path(model_path, variant):
+    """``models/custom_model`` + ``int8`` -> ``models/custom_model_int8.tflite``."""
+    return f"{os.fspath(model_path).rstrip('/')}_{variant}.tflite"
+
+
+def _interpreter_class():
+    try:
+        from tflite_runtime.interpreter import Interpreter
+    except ImportError:
+        import tensorflow as tf
+
+        Interpreter = tf.lite.Interpreter
+    return Interpreter
+
+
+class TFLiteModel:
+    """Callable wrapper around a TFLite interpreter.
+
+    Called like a Keras model: takes a float batch and returns float
+    probabilities, quantizing the input and dequantizing the output when the
+    model was converted with integer input/output types.
+    """
+
+    def __init__(self, path, num_threads=1):
+        self.path = path
+        self.interpreter = _interpreter_class()(
+            model_path=path, num_threads=num_threads
+        )
+        self.interpreter.allocate_tensors()
+        self.input = self.interpreter.get_input_details()[0]
+        self.output = self.interpreter.get_output_details()[0]
+        self._batch = int(self.input["shape"][0])
+
+    def _resize(self, batch):
+        # Interpreters are built for a fixed batch size; only resize (and
+        # reallocate) when the batch size actually changes.
+        shape = [batch, *self.input["shape"][1:]]
+        self.interpreter.resize_tensor_input(self.input["index"], shape)
+        self.interpreter.allocate_tensors()
+        self.input = self.interpreter.get_input_details()[0]
+        self.output = self.interpreter.get_output_details()[0]
+        self._batch = batch
+
+    def __call__(self, inputs, training=False):
+        inputs = np.asarray(inputs, dtype=np.float32)
+        if len(inputs) != self._batch:
+            self._resize(len(inputs))
+
+        dtype = self.input["dtype"]
+        if dtype != np.float32:
+            scale, zero_point = self.input["quantization"]
+            info = np.iinfo(dtype)
+            inputs = np.clip(np.round(inputs / scale + zero_point), info.min, info.max)
+        self.interpreter.set_tensor(self.input["index"], inputs.astype(dtype))
+        self.interpreter.invoke()
+
+        outputs = self.interpreter.get_tensor(self.output["index"])
+        if self.output["dtype"] != np.float32:
+            scale, zero_point = self.output["quantization"]
+            outputs = (outputs.astype(np.float32) - zero_point) * scale
+        return outputs
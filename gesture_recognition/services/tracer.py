@@ -0,0 +1,153 @@
+"""Per-frame span recording, exported in Chrome Trace Event format.
+
+``Tracer.span(name)`` times a block and appends one event tuple to a bounded
+in-memory deque (the oldest events are dropped once it is full), so a long
+run keeps the most recent minutes. ``save`` writes the buffer as a
+``{"traceEvents": [...]}`` JSON file that ``chrome://tracing`` and
+https://ui.perfetto.dev open, with one track per thread: the outlier frames
+that averages hide show up as long bars.
+
+Timestamps come from ``time.perf_counter``, which is system-wide monotonic
+on Linux and macOS, so events recorded in worker processes (``analyze``)
+can be merged into one trace with ``merge``.
+
+``NULL_TRACER`` is a no-op stand-in for when tracing is off; its ``span``
+returns a shared do-nothing context manager.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+
+from gesture_recognition import config
+
+
+class _Span:
+    __slots__ = ("args", "cat", "name", "start", "tracer")
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.tracer.add(self.name, self.cat, self.start, time.perf_counter(), self.args)
+        return False
+
+
+class Tracer:
+    """Bounded recorder of complete ("X") trace events."""
+
+    enabled = True
+
+    def __init__(self, capacity=config.TRACE_BUFFER_EVENTS, process_name=None):
+        self.events = deque(maxlen=capacity)
+        self.pid = os.getpid()
+        # (pid, tid) -> thread name, and pid -> process name, for the viewer
+        self.threads = {}
+        self.processes = {self.pid: process_name or f"pid {self.pid}"}
+
+    def span(self, name, cat="frame", args=None):
+        """Context manager recording its block as a span."""
+        return _Span(self, name, cat, args)
+
+    def add(self, name, cat, start, end, args=None):
+        """Record a span from ``start`` to ``end`` (``perf_counter`` seconds)."""
+        tid = threading.get_ident()
+        if (self.pid, tid) not in self.threads:
+            self.threads[self.pid, tid] = threading.current_thread().name
+        # deque.append is atomic, so threads can record concurrently
+        self.events.append((name, cat, start, end - start, self.pid, tid, args))
+
+    def drain(self):
+        """Remove and return ``(events, threads, processes)`` for ``merge``."""
+        events = []
+        while self.events:
+            events.append(self.events.popleft())
+        return events, dict(self.threads), dict(self.processes)
+
+    def merge(self, drained):
+        """Add events drained from another (e.g. worker process's) tracer."""
+        events, threads, processes = drained
+        self.events.extend(events)
+        self.threads.update(threads)
+        self.processes.update(processes)
+
+    def to_chrome(self):
+        """The buffered events as a Chrome Trace Event format dict."""
+        events = list(self.events)
+        origin = min((event[2] for event in events), default=0.0)
+        trace = [
+            {"name": "process_name", "ph": "M", "pid": pid, "args": {"name": name}}
+            for pid, name in self.processes.items()
+        ]
+        trace += [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": tid,
+                "args": {"name": name},
+            }
+            for (pid, tid), name in self.threads.items()
+        ]
+        for name, cat, start, duration, pid, tid, args in events:
+            event = {
+                "name": name,
+                "cat": cat,
+                "ph": "X",
+                "ts": round((start - origin) * 1e6, 3),
+                "dur": round(duration * 1e6, 3),
+                "pid": pid,
+                "tid": tid,
+            }
+            if args:
+                event["args"] = args
+            trace.append(event)
+        return {"traceEvents": trace, "displayTimeUnit": "ms"}
+
+    def save(self, path):
+        """Write the trace to ``path``; returns the number of spans written."""
+        trace = self.to_chrome()
+        directory = os.path.dirname(os.fspath(path))
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(trace, f)
+        return sum(1 for event in trace["traceEvents"] if event["ph"] == "X")
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class NullTracer:
+    """Tracer interface that records nothing."""
+
+    enabled = False
+    _span = _NullSpan()
+
+    def span(self, name, cat="frame", args=None):
+        return self._span
+
+    def add(self, name, cat, start, end, args=None):
+        pass
+
+    def drain(self):
+        return [], {}, {}
+
+
+NULL_TRACER = NullTracer()
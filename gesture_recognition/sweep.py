@@ -0,0 +1,275 @@
+"""Cross-validated architecture sweep for the classifier (`main.py train --sweep`).
+
+Every candidate in a grid of layer widths, depths and learning rates is
+trained and scored with k-fold cross-validation, where folds are made of
+whole recording sessions (per gesture) for the same reason the trainer's
+validation split is. The (candidate, fold) jobs run in parallel on a pool of
+CPU-only worker processes, one TensorFlow thread each, so they don't compete
+for cores. Every candidate's single-sample inference latency is measured
+with both the Keras model and the NumPy backend.
+
+``select_candidate`` then picks the smallest model whose mean accuracy is
+within a margin of the best one: on a kiosk a slightly less accurate but
+much cheaper model is usually the better trade.
+
+TensorFlow is imported inside the worker functions only, as in
+``analyze.py``.
+"""
+
+import csv
+import itertools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Default grid: first-layer widths, number of hidden layers (each layer half
+# as wide as the previous one, like the default 64/32) and learning rates
+SWEEP_WIDTHS = (16, 32, 64, 128)
+SWEEP_DEPTHS = (1, 2, 3)
+SWEEP_LEARNING_RATES = (0.001, 0.003)
+
+# Narrowest hidden layer the halving may produce
+MIN_WIDTH = 4
+
+TABLE_FIELDS = [
+    "hidden_layers",
+    "learning_rate",
+    "params",
+    "accuracy",
+    "accuracy_std",
+    "keras_us",
+    "numpy_us",
+]
+
+# Per-process dataset and folds, set by _init_worker
+_worker = {}
+
+
+def candidate_grid(
+    widths=SWEEP_WIDTHS, depths=SWEEP_DEPTHS, learning_rates=SWEEP_LEARNING_RATES
+):
+    """Return the candidates as ``{"hidden_layers", "learning_rate"}`` dicts."""
+    candidates = []
+    for width, depth, learning_rate in itertools.product(
+        widths, depths, learning_rates
+    ):
+        hidden_layers = tuple(max(width >> i, MIN_WIDTH) for i in range(depth))
+        candidates.append(
+            {"hidden_layers": hidden_layers, "learning_rate": learning_rate}
+        )
+    return candidates
+
+
+def parameter_count(hidden_layers, num_classes, input_size=42):
+    """Number of weights of a Flatten -> Dense* classifier."""
+    sizes = [input_size, *hidden_layers, num_classes]
+    # No itertools.pairwise: Python 3.9 is still supported
+    return sum((sizes[i] + 1) * sizes[i + 1] for i in range(len(sizes) - 1))
+
+
+def session_folds(labels, sessions, folds, seed=0):
+    """Split sample indices into ``folds`` ``(train, validation)`` pairs.
+
+    Whole sessions are assigned to folds, round-robin per gesture so every
+    fold gets a share of each gesture's sessions. Raises ``ValueError`` when
+    there are fewer than two sessions to split.
+    """
+    labels = np.asarray(labels)
+    sessions = np.asarray(sessions)
+    unique_sessions = np.unique(sessions)
+    folds = min(folds, len(unique_sessions))
+    if folds < 2:
+        raise ValueError(
+            "Cross-validation needs at least two recording sessions; "
+            "record more sessions or train without --sweep"
+        )
+
+    rng = np.random.default_rng(seed)
+    fold_of_session = {}
+    offset = 0
+    for label in np.unique(labels):
+        label_sessions = np.unique(sessions[labels == label])
+        rng.shuffle(label_sessions)
+        for i, session in enumerate(label_sessions):
+            fold_of_session.setdefault(session, (offset + i) % folds)
+        offset += len(label_sessions)
+
+    fold = np.array([fold_of_session[s] for s in unique_sessions])[
+        np.searchsorted(unique_sessions, sessions)
+    ]
+    return [
+        (np.flatnonzero(fold != k), np.flatnonzero(fold == k)) for k in range(folds)
+    ]
+
+
+def _init_worker(data_dir, candidates, folds, epochs, batch_size, augmentation, pooled):
+    if pooled:
+        # CPU only, one thread per worker: the pool provides the parallelism.
+        # Must be set before TensorFlow is imported in this process.
+        os.environ["CUDA_VISIBLE_DEVICES"] = "-1"
+        import tensorflow as tf
+
+        tf.config.threading.set_intra_op_parallelism_threads(1)
+        tf.config.threading.set_inter_op_parallelism_threads(1)
+
+    from gesture_recognition.dataset import load_training_arrays
+
+    x, y, _, gestures = load_training_arrays(data_dir)
+    _worker.update(
+        x=x,
+        y=y,
+        num_classes=len(gestures),
+        candidates=candidates,
+        folds=folds,
+        epochs=epochs,
+        batch_size=batch_size,
+        augmentation=augmentation,
+    )
+
+
+def _evaluate(candidate_index, fold_index):
+    """Train one candidate on one fold.
+
+    Returns ``(accuracy, latency)`` where ``latency`` is ``None`` except for
+    the first fold, which also times single-sample inference.
+    """
+    from gesture_recognition.export import dense_layers, median_latency_us
+    from gesture_recognition.services.numpy_model import NumpyDenseModel
+    from gesture_recognition.trainer import build_model
+    from gesture_recognition.training_data import make_dataset
+
+    x, y = _worker["x"], _worker["y"]
+    num_classes = _worker["num_classes"]
+    train_indices, val_indices = _worker["folds"][fold_index]
+    batch_size = _worker["batch_size"]
+
+    model = build_model(num_classes, **_worker["candidates"][candidate_index])
+    # Fixed epochs, no early stopping: stopping on the evaluation fold would
+    # bias the score in favour of whichever candidate it happens to suit.
+    model.fit(
+        make_dataset(
+            x,
+            y,
+            train_indices,
+            num_classes,
+            batch_size,
+            augmentation=_worker["augmentation"],
+        ),
+        epochs=_worker["epochs"],
+        verbose=0,
+    )
+    _, accuracy = model.evaluate(
+        make_dataset(x, y, val_indices, num_classes, batch_size, training=False),
+        verbose=0,
+    )
+
+    latency = None
+    if fold_index == 0:
+        sample = np.asarray(x[val_indices[:1]], dtype=np.float32)[0]
+        latency = (
+            median_latency_us(model, sample),
+            median_latency_us(NumpyDenseModel(dense_layers(model)), sample),
+        )
+    return float(accuracy), latency
+
+
+def run_sweep(
+    data_dir,
+    candidates,
+    folds,
+    epochs=50,
+    batch_size=16,
+    augmentation=True,
+    workers=None,
+):
+    """Cross-validate every candidate; returns one result row per candidate."""
+    from gesture_recognition.dataset import load_training_arrays
+
+    _, y, sessions, gestures = load_training_arrays(data_dir)
+    splits = session_folds(y, sessions, folds)
+    jobs = list(itertools.product(range(len(candidates)), range(len(splits))))
+
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    print(
+        f"Sweeping {len(candidates)} candidate(s) x {len(splits)} fold(s) "
+        f"with {workers} worker(s)"
+    )
+    init_args = (data_dir, candidates, splits, epochs, batch_size, augmentation)
+
+    if workers == 1:
+        _init_worker(*init_args, False)
+        results = [_evaluate(*job) for job in jobs]
+    else:
+        # spawn, not fork: TensorFlow doesn't survive forking a process that
+        # has already started its thread pools.
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(*init_args, True),
+        ) as pool:
+            results = list(pool.map(_evaluate, *zip(*jobs)))
+
+    scores = [[] for _ in candidates]
+    latencies = [None] * len(candidates)
+    for (candidate_index, _), (accuracy, latency) in zip(jobs, results):
+        scores[candidate_index].append(accuracy)
+        if latency is not None:
+            latencies[candidate_index] = latency
+
+    return [
+        {
+            "hidden_layers": candidate["hidden_layers"],
+            "learning_rate": candidate["learning_rate"],
+            "params": parameter_count(candidate["hidden_layers"], len(gestures)),
+            "accuracy": float(np.mean(candidate_scores)),
+            "accuracy_std": float(np.std(candidate_scores)),
+            "keras_us": keras_us,
+            "numpy_us": numpy_us,
+        }
+        for candidate, candidate_scores, (keras_us, numpy_us) in zip(
+            candidates, scores, latencies
+        )
+    ]
+
+
+def select_candidate(rows, margin):
+    """The smallest (then fastest) row within ``margin`` of the best accuracy."""
+    best = max(row["accuracy"] for row in rows)
+    eligible = [row for row in rows if row["accuracy"] >= best - margin]
+    return min(eligible, key=lambda row: (row["params"], row["numpy_us"]))
+
+
+def format_table(rows, selected=None):
+    """Format sweep rows as a text table, marking the ``selected`` row."""
+    lines = [
+        (
+            f"  {'hidden layers':<16}{'lr':>8}{'params':>9}{'accuracy':>14}"
+            f"{'keras (us)':>12}{'numpy (us)':>12}"
+        )
+    ]
+    for row in sorted(rows, key=lambda r: (r["params"], r["learning_rate"])):
+        marker = "*" if row is selected else " "
+        layers = "/".join(str(width) for width in row["hidden_layers"])
+        accuracy = f"{row['accuracy']:.1%} ±{row['accuracy_std']:.1%}"
+        lines.append(
+            f"{marker} {layers:<16}{row['learning_rate']:>8g}{row['params']:>9}"
+            f"{accuracy:>14}{row['keras_us']:>12.1f}{row['numpy_us']:>12.1f}"
+        )
+    return "\n".join(lines)
+
+
+def write_table(rows, path):
+    """Write sweep rows to ``path`` as CSV."""
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=TABLE_FIELDS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(
+                {
+                    **row,
+                    "hidden_layers": "/".join(map(str, row["hidden_layers"])),
+                }
+            )
@@ -1,10 +1,107 @@
 import cv2
-import mediapipe as mp
+import numpy as np
+import sys
 import time
 
+from gesture_recognition import config
+from gesture_recognition.tracking.roi import (
+    contains,
+    landmark_roi,
+    leaving_roi,
+    to_frame,
+)
+
+
+def _import_mediapipe():
+    """Import mediapipe without dragging in TensorFlow.
+
+    mediapipe's package ``__init__`` imports ``tensorflow.tools.docs`` (only
+    used for its API docs) whenever TensorFlow is installed, which adds
+    seconds to startup even on the TensorFlow-free numpy/tflite backends.
+    Marking that module as missing for the duration of the import makes
+    mediapipe fall back to its built-in no-op.
+    """
+    blocked = "tensorflow" not in sys.modules
+    if blocked:
+        sys.modules["tensorflow.tools.docs"] = None
+    try:
+        import mediapipe
+    finally:
+        if blocked:
+            del sys.modules["tensorflow.tools.docs"]
+    return mediapipe
+
+
+mp = _import_mediapipe()
+
+NUM_LANDMARKS = 21
+
+# Wire format of one serialized NormalizedLandmark inside a
+# NormalizedLandmarkList when only x, y and z are set (as MediaPipe Hands
+# does): 17 bytes of field-1 tag + length, then x/y/z each as a one-byte tag
+# followed by a little-endian float32.
+_LANDMARK_WIRE_SIZE = 17
+_LANDMARK_WIRE_TAGS = ((0, 0x0A), (1, 15), (2, 0x0D), (7, 0x15), (12, 0x1D))
+# Byte offset of x, and the distance between x, y and z
+_LANDMARK_WIRE_X, _LANDMARK_WIRE_STEP = 3, 5
+
+
+def _copy_landmarks(hand_landmarks, out):
+    """Copy one hand's normalized x/y/z into ``out`` (a ``(21, 3)`` array).
+
+    The protobuf landmark list exposes no array view, so it is serialized
+    (one C++ call) and the floats are copied straight out of the bytes
+    through a strided view. If the message doesn't have the expected layout (e.g.
+    a MediaPipe version that also sets visibility) this falls back to
+    iterating the landmarks.
+    """
+    data = hand_landmarks.SerializeToString()
+    if len(data) == NUM_LANDMARKS * _LANDMARK_WIRE_SIZE and all(
+        data[offset::_LANDMARK_WIRE_SIZE] == bytes([tag]) * NUM_LANDMARKS
+        for offset, tag in _LANDMARK_WIRE_TAGS
+    ):
+        out[:] = np.ndarray(
+            (NUM_LANDMARKS, 3),
+            dtype="<f4",
+            buffer=data,
+            offset=_LANDMARK_WIRE_X,
+            strides=(_LANDMARK_WIRE_SIZE, _LANDMARK_WIRE_STEP),
+        )
+        return
+    out[:] = np.fromiter(
+        (v for lm in hand_landmarks.landmark for v in (lm.x, lm.y, lm.z)),
+        dtype=np.float32,
+        count=NUM_LANDMARKS * 3,
+    ).reshape(NUM_LANDMARKS, 3)
+
 
 class handDetector():
-    def __init__(self, mode=False, maxHands=1, modelComplexity=1, detectionCon=0.5, trackCon=0.5):
+    """MediaPipe Hands wrapper.
+
+    With ``roi=True`` (tracking mode), once a hand has been found only a
+    square crop around the previous frame's landmarks (padded by
+    ``roiPadding``, see ``tracking.roi``) is resized to ``roiSize`` pixels
+    and processed, and the landmarks are mapped back to the full frame. The
+    full frame is searched again when the hand is lost or reaches the edge
+    of the crop, and every ``roiRefresh`` frames so that other hands
+    entering the frame are found. ``fullSearches`` and ``roiFrames`` count
+    the frames processed each way, ``roiMisses`` the crops that lost the
+    hand (those frames are searched in full as well).
+    """
+
+    def __init__(
+        self,
+        mode=False,
+        maxHands=1,
+        modelComplexity=1,
+        detectionCon=0.5,
+        trackCon=0.5,
+        buffers=1,
+        roi=False,
+        roiSize=config.ROI_SIZE,
+        roiPadding=config.ROI_PADDING,
+        roiRefresh=config.ROI_REFRESH_FRAMES,
+    ):
         self.mode = mode
         self.maxHands = maxHands
         self.modelComplex = modelComplexity
@@ -22,42 +119,198 @@ class handDetector():
         )
         self.mpDraw = mp.solutions.drawing_utils
 
+        self.roi = roi
+        self.roiSize = roiSize
+        self.roiPadding = roiPadding
+        self.roiRefresh = roiRefresh
+        # Crops are processed by a second graph, so the full-frame graph's
+        # tracking state and input size stay consistent
+        self.roiHands = None
+        self._nextRoi = None  # crop for the next frame, None: full frame
+        self._resultsRoi = None  # crop ``results`` are relative to
+        self._roiRun = 0  # consecutive cropped frames
+        # After a crop misses the hand, full frames only for a while (doubling
+        # on repeated misses), so a hand the crop can't track costs one
+        # extra crop now and then rather than on every frame
+        self._roiWait = 0
+        self._roiBackoff = 1
+        self._roiPoints = np.zeros((maxHands, NUM_LANDMARKS, 3), np.float32)
+        self.fullSearches = 0
+        self.roiFrames = 0
+        self.roiMisses = 0
+
+        # Preallocated outputs of findLandmarks. With buffers > 1 consecutive
+        # calls rotate through separate arrays, so a result can still be in
+        # use (e.g. queued in a pipeline) while the next frame is detected.
+        self._landmarks = np.zeros((buffers, maxHands, NUM_LANDMARKS, 3), np.float32)
+        self._handedness = np.zeros((buffers, maxHands), np.float32)
+        self._buffer = 0
+
+    def reset(self):
+        """Forget the hands tracked so far, as if no frame had been seen.
+
+        Restarts the MediaPipe graphs (which track hands from one frame to
+        the next) and drops the ROI state, so the next frame is searched in
+        full. Use it before frames that don't follow the previous ones.
+        """
+        self.hands.reset()
+        if self.roiHands is not None:
+            self.roiHands.reset()
+        self.results = None
+        self._nextRoi = None
+        self._resultsRoi = None
+        self._roiRun = 0
+        self._roiWait = 0
+        self._roiBackoff = 1
+
     def findHands(self, img, draw=True):
-        imgRGB = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        self.results = self.hands.process(imgRGB)
+        self._resultsRoi = None
+        if self._roiWait:
+            self._roiWait -= 1
+        elif self._nextRoi is not None and self._roiRun < self.roiRefresh:
+            results = self._processRoi(img, self._nextRoi)
+            if results is not None:
+                self.results = results
+                self._resultsRoi = self._nextRoi
+                self._roiRun += 1
+                self.roiFrames += 1
+                self._roiBackoff = 1
+            else:
+                self.roiMisses += 1
+                self._roiWait = self._roiBackoff
+                self._roiBackoff = min(2 * self._roiBackoff, max(self.roiRefresh, 1))
+        if self._resultsRoi is None:
+            imgRGB = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+            self.results = self.hands.process(imgRGB)
+            self._roiRun = 0
+            self.fullSearches += 1
+        if self.roi:
+            self._nextRoi = self._roiAround(img.shape)
 
         if self.results.multi_hand_landmarks:
             for handLms in self.results.multi_hand_landmarks:
                 if draw:
+                    if self._resultsRoi is not None:
+                        handLms = self._toFrameProto(handLms, img.shape)
                     self.mpDraw.draw_landmarks(img, handLms, self.mpHands.HAND_CONNECTIONS)
         return img
 
-    def findPosition(self, img, handNo=0, draw=True):
-        lmlist = []
+    def _processRoi(self, img, roi):
+        """Process the ``roi`` crop; ``None`` if the hand was lost or is leaving it."""
+        if self.roiHands is None:
+            self.roiHands = self.mpHands.Hands(
+                static_image_mode=self.mode,
+                max_num_hands=self.maxHands,
+                model_complexity=self.modelComplex,
+                min_detection_confidence=self.detectionCon,
+                min_tracking_confidence=self.trackCon,
+            )
+        x, y, size = roi
+        crop = img[y : y + size, x : x + size]
+        interpolation = cv2.INTER_AREA if size > self.roiSize else cv2.INTER_LINEAR
+        crop = cv2.resize(crop, (self.roiSize, self.roiSize), interpolation=interpolation)
+        results = self.roiHands.process(cv2.cvtColor(crop, cv2.COLOR_BGR2RGB))
+
+        hands = results.multi_hand_landmarks
+        if not hands:
+            return None
+        points = self._roiPoints
+        for i, hand in enumerate(hands[: self.maxHands]):
+            _copy_landmarks(hand, points[i])
+            if leaving_roi(points[i], roi, img.shape):
+                return None
+        return results
+
+    def _roiAround(self, shape):
+        """The crop for the next frame around the current results' hands."""
+        hands = self.results.multi_hand_landmarks
+        if not hands:
+            return None
+        points = self._roiPoints[: min(len(hands), self.maxHands)]
+        for i, hand in enumerate(hands[: len(points)]):
+            _copy_landmarks(hand, points[i])
+        if self._resultsRoi is not None:
+            to_frame(points, self._resultsRoi)
+            # Keep the crop still while the hand stays well inside it:
+            # MediaPipe tracks the hand from the previous frame's landmarks
+            # in crop coordinates, which moving the crop would invalidate
+            if contains(self._resultsRoi, landmark_roi(points, shape, self.roiPadding / 2)):
+                return self._resultsRoi
+        else:
+            points[..., 0] *= shape[1]
+            points[..., 1] *= shape[0]
+        return landmark_roi(points, shape, padding=self.roiPadding)
+
+    def _toFrameProto(self, handLms, shape):
+        """Copy of crop-relative ``handLms`` normalized to the full frame."""
+        x, y, size = self._resultsRoi
+        h, w = shape[:2]
+        mapped = type(handLms)()
+        mapped.CopyFrom(handLms)
+        for lm in mapped.landmark:
+            lm.x = (x + lm.x * size) / w
+            lm.y = (y + lm.y * size) / h
+        return mapped
+
+    def findLandmarks(self, img):
+        """Landmarks of the hands found by the last ``findHands`` call.
+
+        Returns ``(landmarks, handedness)``: a float32 ``(hands, 21, 3)``
+        array of sub-pixel ``x, y`` coordinates in ``img`` and ``z`` (relative
+        depth, on the same scale as ``x``), and a float32 ``(hands,)`` array
+        with the probability that each hand is a right hand. Both are views
+        of preallocated buffers that the next call(s) overwrite — copy them
+        to keep them longer.
+        """
+        buffer = self._buffer
+        self._buffer = (buffer + 1) % len(self._landmarks)
         # No detection results yet (findHands not called, or no frame processed)
         if self.results is None or not self.results.multi_hand_landmarks:
-            return lmlist
+            return self._landmarks[buffer, :0], self._handedness[buffer, :0]
 
-        myHand = self.results.multi_hand_landmarks[handNo]
-        h, w, _ = img.shape
-        for id, lm in enumerate(myHand.landmark):
-            cx, cy = int(lm.x * w), int(lm.y * h)
-            lmlist.append([id, cx, cy])
-            if draw:
-                cv2.circle(img, (cx, cy), 7, (255, 0, 255), cv2.FILLED)
-        return lmlist
+        hands = self.results.multi_hand_landmarks[: self.maxHands]
+        landmarks = self._landmarks[buffer, : len(hands)]
+        handedness = self._handedness[buffer, : len(hands)]
+        for i, hand in enumerate(hands):
+            _copy_landmarks(hand, landmarks[i])
+        for i, classification in enumerate(self.results.multi_handedness[: len(hands)]):
+            top = classification.classification[0]
+            handedness[i] = top.score if top.label == "Right" else 1 - top.score
+
+        if self._resultsRoi is not None:
+            to_frame(landmarks, self._resultsRoi)
+            return landmarks, handedness
+        h, w = img.shape[:2]
+        landmarks[..., 0] *= w
+        landmarks[..., 1] *= h
+        landmarks[..., 2] *= w
+        return landmarks, handedness
+
+    def findPosition(self, img, handNo=0, draw=True):
+        """``[[id, x, y], ...]`` integer pixel landmarks of one hand."""
+        landmarks, _ = self.findLandmarks(img)
+        if handNo >= len(landmarks):
+            return []
+
+        points = landmarks[handNo, :, :2].astype(int)
+        if draw:
+            for cx, cy in points:
+                cv2.circle(img, (int(cx), int(cy)), 7, (255, 0, 255), cv2.FILLED)
+        return [[id, int(cx), int(cy)] for id, (cx, cy) in enumerate(points)]
 
 
 def main():
+    from gesture_recognition.camera import FrameSource
+
     pTime = 0
-    cap = cv2.VideoCapture(0)
+    camera = FrameSource().open()
     detector = handDetector()
 
     while True:
-        success, img = cap.read()
-        if not success:
+        frame = camera.read()
+        if frame is None:
             continue
-        img = detector.findHands(img)
+        img = detector.findHands(frame.image)
         lmlist = detector.findPosition(img)
         if len(lmlist) != 0:
             print(lmlist[4])
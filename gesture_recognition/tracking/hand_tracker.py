@@ -0,0 +1,179 @@
+"""Stable IDs for several hands across frames.
+
+MediaPipe reports the hands of a frame in no particular order, so with
+``MAX_HANDS`` above 1 "hand 0" may be a different hand on every frame.
+``HandTracker`` matches each frame's detections to the hands it already
+tracks, so each hand keeps its ID and its own ``GestureSmoother``. A
+detection and a tracked hand are compared by:
+
+- the mean distance between their landmarks, in hand sizes (the larger
+  side of the tracked hand's bounding box). Pairs further apart than
+  ``max_distance`` never match, and
+- the difference in their right-hand probability, weighted by
+  ``handedness_weight``, which breaks ties between two nearby hands.
+
+Pairs are matched greedily, cheapest first. With the two or three hands
+MediaPipe tracks that gives the same result as an optimal assignment
+unless two hands cross.
+"""
+
+import numpy as np
+
+from gesture_recognition import config
+
+
+def hand_sizes(landmarks):
+    """Larger bounding-box side of each ``(hands, 21, 2+)`` hand, at least 1."""
+    xy = landmarks[..., :2]
+    return np.maximum((xy.max(axis=1) - xy.min(axis=1)).max(axis=1), 1.0)
+
+
+def match_hands(
+    previous,
+    previous_handedness,
+    landmarks,
+    handedness,
+    max_distance=None,
+    handedness_weight=config.HAND_HANDEDNESS_WEIGHT,
+):
+    """Match detections to previous hands; returns ``[(previous, new), ...]`` indices.
+
+    ``previous`` and ``landmarks`` are ``(hands, 21, 2+)`` pixel landmark
+    arrays, the handedness arrays right-hand probabilities per hand.
+    ``max_distance=None`` matches every hand it can, however far apart.
+    """
+    if not len(previous) or not len(landmarks):
+        return []
+    distance = (
+        np.linalg.norm(
+            previous[:, np.newaxis, :, :2] - landmarks[np.newaxis, :, :, :2], axis=3
+        ).mean(axis=2)
+        / hand_sizes(previous)[:, np.newaxis]
+    )
+    cost = distance + handedness_weight * np.abs(
+        np.subtract.outer(previous_handedness, handedness)
+    )
+    if max_distance is not None:
+        cost[distance > max_distance] = np.inf
+
+    pairs, used_previous, used_new = [], set(), set()
+    for flat in np.argsort(cost, axis=None):
+        i, j = np.unravel_index(flat, cost.shape)
+        if not np.isfinite(cost[i, j]):
+            break
+        if i in used_previous or j in used_new:
+            continue
+        pairs.append((int(i), int(j)))
+        used_previous.add(i)
+        used_new.add(j)
+    return pairs
+
+
+class TrackedHand:
+    """One hand's ID, latest landmarks and smoothed gesture."""
+
+    def __init__(self, hand_id, landmarks, handedness, smoother):
+        self.id = hand_id
+        self.landmarks = landmarks
+        self.handedness = handedness
+        self.smoother = smoother
+        self.gesture = ""
+        self.confidence = 0.0
+        self.missed = 0  # consecutive frames without a matching detection
+
+    @property
+    def side(self):
+        return "Right" if self.handedness >= 0.5 else "Left"
+
+    @property
+    def anchor(self):
+        """Integer top-left corner of the hand's bounding box, for its label."""
+        x, y = self.landmarks[:, :2].min(axis=0)
+        return int(x), int(y)
+
+    def update_prediction(self, prediction):
+        """Smooth one ``predict_batch`` result; returns the smoothed gesture."""
+        self.smoother.update(*prediction)
+        self.gesture = self.smoother.get_dominant_gesture()
+        self.confidence = prediction[1]
+        return self.gesture
+
+
+class HandTracker:
+    """Keeps every detected hand under a stable ID across frames.
+
+    ``update(landmarks, handedness)`` takes one frame's detections and
+    returns their ``TrackedHand`` objects in the same order, so row ``i``
+    of a batch built from ``landmarks`` belongs to the ``i``-th hand.
+    New hands get the next ID and a fresh smoother from
+    ``smoother_factory``. A hand that isn't detected keeps its ID and
+    smoother for ``max_missed`` frames, so a detection dropout doesn't
+    reset it.
+    """
+
+    def __init__(
+        self,
+        smoother_factory,
+        max_distance=config.HAND_MATCH_DISTANCE,
+        handedness_weight=config.HAND_HANDEDNESS_WEIGHT,
+        max_missed=config.HAND_MAX_MISSED,
+    ):
+        self.smoother_factory = smoother_factory
+        self.max_distance = max_distance
+        self.handedness_weight = handedness_weight
+        self.max_missed = max_missed
+        self.hands = []  # tracked hands, visible or recently missed
+        self.visible = []  # the last update's hands, in detection order
+        self._next_id = 1
+
+    def reset(self):
+        self.hands = []
+        self.visible = []
+
+    @property
+    def primary(self):
+        """The longest-tracked visible hand (lowest ID), or ``None``."""
+        return min(self.visible, key=lambda hand: hand.id, default=None)
+
+    def update(self, landmarks, handedness=None):
+        landmarks = np.array(landmarks, dtype=np.float32)
+        if handedness is None:
+            handedness = np.full(len(landmarks), 0.5, np.float32)
+        handedness = np.array(handedness, dtype=np.float32)
+
+        pairs = []
+        if self.hands:
+            pairs = match_hands(
+                np.stack([hand.landmarks for hand in self.hands]),
+                np.array([hand.handedness for hand in self.hands]),
+                landmarks,
+                handedness,
+                self.max_distance,
+                self.handedness_weight,
+            )
+        visible = [None] * len(landmarks)
+        for i, j in pairs:
+            hand = self.hands[i]
+            hand.landmarks = landmarks[j]
+            hand.handedness = float(handedness[j])
+            hand.missed = 0
+            visible[j] = hand
+
+        for hand in self.hands:
+            if hand not in visible:
+                hand.missed += 1
+        self.hands = [hand for hand in self.hands if hand.missed <= self.max_missed]
+
+        for j, hand in enumerate(visible):
+            if hand is None:
+                hand = TrackedHand(
+                    self._next_id,
+                    landmarks[j],
+                    float(handedness[j]),
+                    self.smoother_factory(),
+                )
+                self._next_id += 1
+                self.hands.append(hand)
+                visible[j] = hand
+        self.visible = visible
+        return visible
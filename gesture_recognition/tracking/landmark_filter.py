@@ -0,0 +1,293 @@
+"""Landmark filtering and detection skipping.
+
+MediaPipe inference dominates the frame time. ``FilteredDetector`` wraps a
+``handDetector`` and runs it only when needed. On the frames in between it
+predicts the landmarks from a per-coordinate motion filter:
+
+- ``OneEuroFilter``: an adaptive low-pass filter. It smooths jitter hard when
+  the hand is still and little when it moves fast. Its filtered derivative
+  extrapolates the landmarks between detections.
+- ``KalmanFilter``: a constant-velocity Kalman filter for every landmark
+  coordinate.
+
+Both filters take and return ``(hands, 21, 3)`` arrays. ``update(x, dt)``
+feeds a measurement ``dt`` seconds after the previous one and returns the
+filtered landmarks. ``predict(elapsed)`` returns the landmarks extrapolated
+``elapsed`` seconds past the last update, without changing the filter.
+"""
+
+import math
+import time
+
+import numpy as np
+
+from gesture_recognition import config
+from gesture_recognition.tracking.hand_tracker import match_hands
+
+# Floor for the time step, so two frames with the same timestamp don't
+# divide by zero
+_MIN_DT = 1e-3
+
+
+class OneEuroFilter:
+    """The 1€ filter (Casiez et al., CHI 2012), vectorized over an array.
+
+    ``min_cutoff`` (Hz) sets the smoothing of a still hand. ``beta`` raises
+    the cutoff with the speed (in units per second), so fast motion lags
+    less. ``d_cutoff`` (Hz) smooths the speed estimate itself.
+    """
+
+    def __init__(self, min_cutoff=1.0, beta=0.05, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        self.x = None
+        self.velocity = None
+        self._raw = None
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def update(self, x, dt):
+        x = np.asarray(x, dtype=np.float32)
+        if self.x is None or self.x.shape != x.shape:
+            self.x = x.copy()
+            self._raw = x.copy()
+            self.velocity = np.zeros_like(x)
+            return self.x.copy()
+        dt = max(dt, _MIN_DT)
+        a_d = self._alpha(self.d_cutoff, dt)
+        # The speed of the raw measurements (rather than the paper's
+        # filtered one) so the lag of the filtered value doesn't inflate it:
+        # it also extrapolates between detections
+        self.velocity += a_d * ((x - self._raw) / dt - self.velocity)
+        self._raw = x.copy()
+        cutoff = self.min_cutoff + self.beta * np.abs(self.velocity)
+        a = self._alpha(cutoff, dt)
+        self.x += a * (x - self.x)
+        return self.x.copy()
+
+    def predict(self, elapsed):
+        return self.x + self.velocity * elapsed
+
+
+class KalmanFilter:
+    """Constant-velocity Kalman filter per coordinate, vectorized over an array.
+
+    ``process_noise`` is the spectral density of the (unmodelled)
+    acceleration in units²/s³, and ``measurement_noise`` the variance of a
+    detection in units². The coordinates are filtered independently, so the
+    2x2 covariance is kept as three arrays.
+    """
+
+    def __init__(self, process_noise=5e3, measurement_noise=4.0):
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self.reset()
+
+    def reset(self):
+        self.x = None
+        self.velocity = None
+
+    def update(self, x, dt):
+        x = np.asarray(x, dtype=np.float32)
+        if self.x is None or self.x.shape != x.shape:
+            self.x = x.copy()
+            self.velocity = np.zeros_like(x)
+            # Position as uncertain as a measurement, velocity unknown
+            self.p00 = np.full_like(x, self.measurement_noise)
+            self.p01 = np.zeros_like(x)
+            self.p11 = np.full_like(x, 1e6)
+            return self.x.copy()
+
+        # Predict dt ahead: x += v dt, P = F P F' + Q
+        dt = max(dt, _MIN_DT)
+        q = self.process_noise
+        self.x += self.velocity * dt
+        self.p00 += dt * (2 * self.p01 + dt * self.p11) + q * dt**3 / 3
+        self.p01 += dt * self.p11 + q * dt**2 / 2
+        self.p11 += q * dt
+
+        # Correct with the measurement
+        s = self.p00 + self.measurement_noise
+        k0, k1 = self.p00 / s, self.p01 / s
+        residual = x - self.x
+        self.x += k0 * residual
+        self.velocity += k1 * residual
+        self.p11 -= k1 * self.p01
+        self.p01 *= 1 - k0
+        self.p00 *= 1 - k0
+        return self.x.copy()
+
+    def predict(self, elapsed):
+        return self.x + self.velocity * elapsed
+
+
+FILTERS = {"one_euro": OneEuroFilter, "kalman": KalmanFilter}
+
+
+class FilteredDetector:
+    """Run ``detector`` on some frames only, filtering and predicting the rest.
+
+    Drop-in for ``handDetector`` (``findHands``, ``findLandmarks``,
+    ``findPosition``). Every detection feeds the filter (``"one_euro"`` or
+    ``"kalman"``). The landmarks returned on every frame, detected or not,
+    are the filter's, so the classifier and the display both get the
+    smoothed landmarks.
+
+    The detector runs at least every ``interval`` frames, and earlier when:
+
+    - no hand is being tracked, or the hands were only just found or
+      changed in number (two detections in a row give the filter their
+      velocity),
+    - the hand's predicted movement since the last detection exceeds
+      ``max_motion`` times the hand size (the larger side of its bounding
+      box), or
+    - the last detection's handedness score, a proxy for the landmark
+      model's confidence, is below ``min_confidence``.
+
+    A steady hand is therefore detected every ``interval`` frames and a
+    moving one on every frame. ``detections`` and ``predictions`` count
+    the frames handled each way.
+    """
+
+    def __init__(
+        self,
+        detector,
+        interval=config.DETECT_INTERVAL,
+        filter=config.LANDMARK_FILTER,
+        max_motion=config.DETECT_MAX_MOTION,
+        min_confidence=config.DETECT_MIN_CONFIDENCE,
+        clock=time.perf_counter,
+    ):
+        if filter not in FILTERS:
+            raise ValueError(
+                f"Unknown landmark filter {filter!r}, expected one of {tuple(FILTERS)}"
+            )
+        self.detector = detector
+        self.interval = max(1, interval)
+        self.filter = FILTERS[filter]()
+        self.max_motion = max_motion
+        self.min_confidence = min_confidence
+        self.clock = clock
+        self.landmarks = np.zeros((0, 21, 3), np.float32)
+        self.handedness = np.zeros(0, np.float32)
+        self._detected = None  # filtered landmarks at the last detection
+        self._updated = 0.0  # clock() of the last filter update
+        self._skipped = 0
+        self._tracked = 0  # consecutive detections of the current hands
+        self._confidence = 0.0
+        self.detections = 0
+        self.predictions = 0
+
+    def __getattr__(self, name):
+        # Everything else (mpHands, results, roi counters...) is the detector's
+        if name == "detector":
+            raise AttributeError(name)
+        return getattr(self.detector, name)
+
+    def _should_detect(self, now):
+        # Two detections in a row first, so the filter knows the velocity
+        if self._tracked < 2 or self._skipped + 1 >= self.interval:
+            return True
+        if self._confidence < self.min_confidence:
+            return True
+        predicted = self.filter.predict(now - self._updated)
+        xy = self._detected[..., :2]
+        size = (xy.max(axis=1) - xy.min(axis=1)).max(axis=1)
+        motion = np.linalg.norm(predicted[..., :2] - xy, axis=2).max(axis=1)
+        return bool((motion > self.max_motion * np.maximum(size, 1.0)).any())
+
+    def findHands(self, img, draw=True):
+        now = self.clock()
+        if self._should_detect(now):
+            self.detector.findHands(img, draw=False)
+            found, handedness = self.detector.findLandmarks(img)
+            self.detections += 1
+            self._skipped = 0
+            if len(found) > 1 and self._detected is not None:
+                found, handedness = self._keep_order(found, handedness)
+            if len(found):
+                # A different number of hands restarts the filter at zero
+                # velocity, so it needs two detections in a row again
+                same_hands = len(found) == len(self.landmarks)
+                self._tracked = self._tracked + 1 if same_hands else 1
+                self.landmarks = self.filter.update(found, now - self._updated)
+                self.handedness = handedness.copy()
+                self._detected = self.landmarks
+                self._confidence = float(np.maximum(handedness, 1 - handedness).min())
+            else:
+                self.filter.reset()
+                self._tracked = 0
+                self.landmarks = found[:0].copy()
+                self.handedness = handedness[:0].copy()
+                self._detected = None
+            self._updated = now
+        else:
+            self.landmarks = self.filter.predict(now - self._updated)
+            self.predictions += 1
+            self._skipped += 1
+
+        if draw:
+            self._draw(img)
+        return img
+
+    def _keep_order(self, found, handedness):
+        """Reorder a detection of several hands to match the filter's hands.
+
+        MediaPipe doesn't keep the hands in the same order from one frame
+        to the next; fed as is, the filter would blend one hand into the
+        other. With the same number of hands as tracked, each detection is
+        moved to the row of the tracked hand it matches.
+        """
+        if len(found) != len(self.landmarks):
+            return found, handedness
+        order = np.arange(len(found))
+        for i, j in match_hands(self.landmarks, self.handedness, found, handedness):
+            order[i] = j
+        return found[order], handedness[order]
+
+    def _draw(self, img):
+        import cv2
+
+        for hand in self.landmarks.astype(np.int32):
+            for a, b in self.detector.mpHands.HAND_CONNECTIONS:
+                cv2.line(
+                    img, tuple(hand[a, :2]), tuple(hand[b, :2]), (255, 255, 255), 2
+                )
+            for x, y, _ in hand:
+                cv2.circle(img, (int(x), int(y)), 4, (0, 0, 255), cv2.FILLED)
+
+    def findLandmarks(self, img):
+        """The filtered landmarks and handedness of the last ``findHands`` call."""
+        return self.landmarks, self.handedness
+
+    def findPosition(self, img, handNo=0, draw=True):
+        """``[[id, x, y], ...]`` integer pixel landmarks of one hand."""
+        if handNo >= len(self.landmarks):
+            return []
+        points = self.landmarks[handNo, :, :2].astype(int)
+        if draw:
+            import cv2
+
+            for cx, cy in points:
+                cv2.circle(img, (int(cx), int(cy)), 7, (255, 0, 255), cv2.FILLED)
+        return [[id, int(cx), int(cy)] for id, (cx, cy) in enumerate(points)]
+
+    @property
+    def detector_load(self):
+        """Fraction of frames on which the detector ran."""
+        frames = self.detections + self.predictions
+        return self.detections / frames if frames else 1.0
+
+
+def filtered_detector(detector, interval=config.DETECT_INTERVAL):
+    """``detector`` wrapped in a ``FilteredDetector`` when skipping is on."""
+    if interval <= 1:
+        return detector
+    return FilteredDetector(detector, interval=interval)
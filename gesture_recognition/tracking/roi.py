@@ -0,0 +1,92 @@
+"""Region-of-interest geometry for cropped hand tracking.
+
+While a hand is tracked, ``handDetector`` in ROI mode only sends a square
+crop around the previous frame's landmarks to MediaPipe, resized to a fixed
+size, so the per-frame cost no longer grows with the camera resolution.
+These helpers work out that crop and map the crop's normalized landmarks
+back to full-frame pixels.
+
+A ROI is an ``(x, y, size)`` tuple of integers: the top-left corner and the
+side of a square that lies entirely inside the frame.
+"""
+
+import numpy as np
+
+
+def landmark_roi(points, frame_shape, padding=0.5, min_size=64):
+    """Square ROI around ``points`` (``(..., 2+)`` pixel coordinates).
+
+    The landmarks' bounding box is padded by ``padding`` times its longer
+    side on every side, so the hand can move between frames without
+    leaving the crop. The square is centred on the box, at least
+    ``min_size`` pixels, and shifted (and if needed shrunk) to stay inside
+    the frame. Returns ``None`` when there are no points.
+    """
+    points = np.asarray(points, dtype=np.float32)
+    points = points.reshape(-1, points.shape[-1])
+    if not len(points):
+        return None
+    height, width = frame_shape[:2]
+    low = points[:, :2].min(axis=0)
+    high = points[:, :2].max(axis=0)
+    extent = float((high - low).max())
+    size = round(max(extent * (1 + 2 * padding), min_size))
+    size = min(size, width, height)
+
+    cx, cy = (low + high) / 2
+    x = round(float(cx) - size / 2)
+    y = round(float(cy) - size / 2)
+    x = min(max(x, 0), width - size)
+    y = min(max(y, 0), height - size)
+    return x, y, size
+
+
+def contains(outer, inner):
+    """Whether ROI ``inner`` lies inside ROI ``outer`` and is at least half its size.
+
+    A crop more than twice the hand's padded size would waste resolution
+    on background, so it doesn't count as containing it.
+    """
+    x, y, size = outer
+    ix, iy, isize = inner
+    return (
+        x <= ix
+        and y <= iy
+        and ix + isize <= x + size
+        and iy + isize <= y + size
+        and 2 * isize >= size
+    )
+
+
+def to_frame(landmarks, roi):
+    """Map normalized crop landmarks to full-frame pixels, in place.
+
+    ``landmarks`` is a ``(..., 3)`` array of MediaPipe's normalized ``x, y``
+    and ``z`` (on the scale of ``x``) relative to the crop of ``roi``.
+    """
+    x, y, size = roi
+    landmarks[..., 0] *= size
+    landmarks[..., 0] += x
+    landmarks[..., 1] *= size
+    landmarks[..., 1] += y
+    landmarks[..., 2] *= size
+    return landmarks
+
+
+def leaving_roi(landmarks, roi, frame_shape, margin=0.02):
+    """Whether normalized crop landmarks come within ``margin`` of a crop edge.
+
+    A hand that reaches the edge of the crop may extend past it, so its
+    landmarks can't be trusted and the detector searches the full frame
+    instead. Crop edges on the frame border don't count: there is nothing
+    more to see beyond them.
+    """
+    x, y, size = roi
+    height, width = frame_shape[:2]
+    xs, ys = landmarks[..., 0], landmarks[..., 1]
+    return bool(
+        (x > 0 and xs.min() < margin)
+        or (y > 0 and ys.min() < margin)
+        or (x + size < width and xs.max() > 1 - margin)
+        or (y + size < height and ys.max() > 1 - margin)
+    )
@@ -1,13 +1,44 @@
 import os
 
-import numpy as np
-import tensorflow as tf
 from keras.callbacks import EarlyStopping, TensorBoard
 from keras.layers import Dense, Flatten, Input
 from keras.models import Sequential
+from keras.optimizers import Adam
 
 from gesture_recognition.config import BASE_DIR
-from gesture_recognition.dataset import load_samples
+from gesture_recognition.dataset import load_training_arrays
+from gesture_recognition.export import dense_layers
+from gesture_recognition.services.numpy_model import NumpyDenseModel, weights_path
+from gesture_recognition.training_data import make_dataset, session_split
+
+# Hidden layer widths of the default architecture (see `train --sweep`)
+DEFAULT_HIDDEN_LAYERS = (64, 32)
+
+
+def build_model(num_classes, hidden_layers=DEFAULT_HIDDEN_LAYERS, learning_rate=0.001):
+    """Build and compile a dense classifier.
+
+    The 21 landmarks of a single frame are a static pose, not a time
+    sequence, so a small dense network on the flattened coordinates is both
+    faster and a better fit than a recurrent model. Motions are handled by
+    the separate sequence model (see ``sequence_trainer``).
+    """
+    model = Sequential(
+        [
+            Input(shape=(21, 2)),
+            Flatten(),
+            *[Dense(width, activation="relu") for width in hidden_layers],
+            Dense(num_classes, activation="softmax"),
+        ]
+    )
+
+    model.compile(
+        optimizer=Adam(learning_rate=learning_rate),
+        loss="categorical_crossentropy",
+        metrics=["accuracy"],
+    )
+
+    return model
 
 
 class GestureTrainer:
@@ -18,83 +49,91 @@ class GestureTrainer:
         self.model_path = model_path or os.path.join(BASE_DIR, "models", "custom_model")
         self.x_train = []
         self.y_train = []
+        self.sessions = []
         self.gestures = []
 
     def load_data(self):
-        """Load recorded gesture data from JSON files"""
+        """Load recorded gesture data (JSON recordings or the binary store)"""
         print("Loading gesture data...")
 
         if not os.path.exists(self.data_dir):
             print(f"Error: Data directory {self.data_dir} not found")
             return False
 
-        # Samples are normalized (wrist-relative, scale-invariant) so the
-        # model doesn't learn the hand's position in the frame.
-        self.x_train, self.y_train, self.gestures = load_samples(
-            self.data_dir, normalize=True
+        # Raw samples: the input pipeline normalizes (wrist-relative,
+        # scale-invariant) after augmenting. With a binary store x_train is
+        # a memory map, streamed batch by batch during training.
+        self.x_train, self.y_train, self.sessions, self.gestures = (
+            load_training_arrays(self.data_dir)
         )
 
-        if not self.x_train:
+        if not len(self.x_train):
             print(f"No gesture data files found in {self.data_dir}")
             return False
 
-        print(f"Loaded {len(self.x_train)} samples for {len(self.gestures)} gestures")
+        print(
+            f"Loaded {len(self.x_train)} samples from "
+            f"{len(set(self.sessions.tolist()))} sessions for "
+            f"{len(self.gestures)} gestures"
+        )
         return True
 
-    def prepare_data(self):
-        """Prepare data for training"""
-        self.x_train = np.array(self.x_train, dtype=np.float32)
-        self.y_train = np.array(self.y_train)
-
-        # One-hot encode the labels
-        self.y_train = tf.keras.utils.to_categorical(self.y_train)
+    def prepare_data(self, batch_size, augmentation=True):
+        """Build the training and validation ``tf.data`` pipelines.
 
-        # Shuffle so the validation split isn't a single gesture
-        indices = np.random.permutation(len(self.x_train))
-        self.x_train = self.x_train[indices]
-        self.y_train = self.y_train[indices]
-
-    def build_model(self):
-        """Build and compile the model.
-
-        The 21 landmarks of a single frame are a static pose, not a time
-        sequence, so a small dense network on the flattened coordinates is
-        both faster and a better fit than a recurrent model.
+        Validation holds out whole recording sessions (see
+        ``training_data.session_split``); it is ``None`` when no gesture has
+        more than one session.
         """
-        model = Sequential(
-            [
-                Input(shape=(21, 2)),
-                Flatten(),
-                Dense(64, activation="relu"),
-                Dense(32, activation="relu"),
-                Dense(len(self.gestures), activation="softmax"),
-            ]
+        train_indices, val_indices = session_split(self.y_train, self.sessions)
+        num_classes = len(self.gestures)
+        train_data = make_dataset(
+            self.x_train,
+            self.y_train,
+            train_indices,
+            num_classes,
+            batch_size,
+            augmentation=augmentation,
         )
-
-        model.compile(
-            optimizer="adam", loss="categorical_crossentropy", metrics=["accuracy"]
+        val_data = None
+        if len(val_indices):
+            val_data = make_dataset(
+                self.x_train,
+                self.y_train,
+                val_indices,
+                num_classes,
+                batch_size,
+                training=False,
+            )
+        print(
+            f"Training on {len(train_indices)} samples, validating on "
+            f"{len(val_indices)} from held-out sessions"
         )
-
-        return model
-
-    def train(self, epochs=50, batch_size=16):
+        return train_data, val_data
+
+    def build_model(self, hidden_layers=DEFAULT_HIDDEN_LAYERS, learning_rate=0.001):
+        """Build and compile the model for the loaded gestures."""
+        return build_model(len(self.gestures), hidden_layers, learning_rate)
+
+    def train(
+        self,
+        epochs=50,
+        batch_size=16,
+        augmentation=True,
+        hidden_layers=DEFAULT_HIDDEN_LAYERS,
+        learning_rate=0.001,
+    ):
         """Train the model"""
         if not self.load_data():
             return False
 
-        self.prepare_data()
-
-        model = self.build_model()
-        print(f"Training model with {len(self.x_train)} samples...")
+        train_data, val_data = self.prepare_data(batch_size, augmentation)
+        model = self.build_model(hidden_layers, learning_rate)
 
         callbacks = [
             TensorBoard(log_dir=os.path.join(BASE_DIR, "logs", "fit"), histogram_freq=1)
         ]
-
-        # A validation split only makes sense with more than one class and
-        # enough samples to hold some out.
-        validation_split = 0.2 if len(self.x_train) >= 10 else 0.0
-        if validation_split:
+        if val_data is not None:
             callbacks.append(
                 EarlyStopping(
                     monitor="val_loss", patience=10, restore_best_weights=True
@@ -102,17 +141,17 @@ class GestureTrainer:
             )
 
         model.fit(
-            self.x_train,
-            self.y_train,
+            train_data,
+            validation_data=val_data,
             epochs=epochs,
-            batch_size=batch_size,
-            validation_split=validation_split,
             callbacks=callbacks,
         )
 
-        # Save the model
+        # Save the model, plus its weights for the TensorFlow-free numpy
+        # backend (`recognize --backend numpy`)
         os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
         model.save(self.model_path)
+        NumpyDenseModel(dense_layers(model)).save(weights_path(self.model_path))
 
         # Save gesture names
         with open(f"{self.model_path}_gestures.txt", "w") as f:
@@ -0,0 +1,133 @@
+"""tf.data input pipeline for ``GestureTrainer``.
+
+Samples are read lazily in shuffled batches — from the in-memory JSON
+recordings or straight from the memory-mapped binary store — then augmented
+and normalized per batch inside the TensorFlow graph, on parallel map calls
+with prefetching. Augmentation is random on every epoch, so each recording
+yields new variants without keeping augmented copies in memory.
+
+Validation data is held out by recording session: consecutive frames of one
+session are near-duplicates, so a random row split would measure how well
+the model remembers a session rather than how it generalizes to a new one.
+"""
+
+import math
+
+import numpy as np
+import tensorflow as tf
+
+# Augmentation, applied to the wrist-centred raw landmarks before
+# normalization (a uniform scale would be normalized away, so scaling is
+# per axis, i.e. it varies the hand's aspect ratio)
+ROTATION_RANGE = math.radians(15)  # in-plane rotation, +/- radians
+SCALE_RANGE = 0.1  # per-axis scale factor in [1 - r, 1 + r]
+MIRROR_PROBABILITY = 0.5  # horizontal flip (left <-> right hand)
+# ... and to the normalized landmarks
+JITTER_STDDEV = 0.02  # Gaussian noise, in normalized units
+DROPOUT_PROBABILITY = 0.05  # chance a landmark is dropped (set to the wrist)
+
+# Fraction of each gesture's recording sessions held out for validation
+VALIDATION_FRACTION = 0.2
+
+
+def session_split(labels, sessions, fraction=VALIDATION_FRACTION, seed=0):
+    """Split sample indices into ``(train, validation)`` by whole sessions.
+
+    For every gesture, ``fraction`` of its sessions (rounded, at least one)
+    go to validation, as long as the gesture keeps at least one training
+    session; gestures recorded in a single session are only trained on.
+    """
+    rng = np.random.default_rng(seed)
+    labels = np.asarray(labels)
+    sessions = np.asarray(sessions)
+    held_out = []
+    for label in np.unique(labels):
+        label_sessions = np.unique(sessions[labels == label])
+        if len(label_sessions) < 2:
+            continue
+        count = min(max(1, round(len(label_sessions) * fraction)), len(label_sessions) - 1)
+        held_out.extend(rng.choice(label_sessions, count, replace=False))
+
+    is_validation = np.isin(sessions, held_out)
+    return np.flatnonzero(~is_validation), np.flatnonzero(is_validation)
+
+
+def normalize(x):
+    """TensorFlow version of ``landmarks.normalize_landmarks_batch``."""
+    x = x - x[:, :1]
+    scale = tf.reduce_max(tf.abs(x), axis=[1, 2], keepdims=True)
+    return tf.math.divide_no_nan(x, scale)
+
+
+def augment(x):
+    """Randomly augment a ``(batch, 21, 2)`` batch of raw landmarks.
+
+    Returns the augmented batch normalized (see ``normalize``).
+    """
+    batch = tf.shape(x)[0]
+    x = x - x[:, :1]
+
+    mirror = tf.where(tf.random.uniform([batch, 1, 1]) < MIRROR_PROBABILITY, -1.0, 1.0)
+    x = x * tf.concat([mirror, tf.ones_like(mirror)], axis=2)
+
+    angle = tf.random.uniform([batch], -ROTATION_RANGE, ROTATION_RANGE)
+    cos, sin = tf.cos(angle), tf.sin(angle)
+    rotation = tf.reshape(tf.stack([cos, sin, -sin, cos], axis=1), [batch, 2, 2])
+    x = tf.matmul(x, rotation)
+
+    x = x * tf.random.uniform([batch, 1, 2], 1 - SCALE_RANGE, 1 + SCALE_RANGE)
+
+    x = normalize(x)
+    x = x + tf.random.normal(tf.shape(x), stddev=JITTER_STDDEV)
+    keep = tf.random.uniform([batch, tf.shape(x)[1], 1]) >= DROPOUT_PROBABILITY
+    return x * tf.cast(keep, x.dtype)
+
+
+def make_dataset(
+    x,
+    y,
+    indices,
+    num_classes,
+    batch_size,
+    training=True,
+    augmentation=True,
+    seed=None,
+):
+    """Build a batched ``tf.data.Dataset`` of ``(landmarks, one_hot)`` pairs.
+
+    ``x`` is any array-like of raw ``(N, 21, 2)`` samples (including a
+    ``np.memmap``), ``y`` the in-memory label indices and ``indices`` the
+    samples to use. Batches are gathered from ``x`` on parallel map calls,
+    so for a memory map only the pages a batch touches are read. With
+    ``training``, samples are reshuffled every epoch and (with
+    ``augmentation``) augmented.
+    """
+    y = np.asarray(y, dtype=np.int32)
+
+    def gather(batch):
+        # Sorted reads are sequential on a memory map; the batch is already
+        # a random draw, so its order doesn't matter.
+        batch = np.sort(batch)
+        return np.asarray(x[batch], dtype=np.float32), y[batch]
+
+    def load(batch):
+        landmarks, labels = tf.numpy_function(
+            gather, [batch], (tf.float32, tf.int32), stateful=False
+        )
+        landmarks.set_shape([None, 21, 2])
+        labels.set_shape([None])
+        return landmarks, labels
+
+    def prepare(landmarks, labels):
+        landmarks = augment(landmarks) if training and augmentation else normalize(landmarks)
+        return landmarks, tf.one_hot(labels, num_classes)
+
+    dataset = tf.data.Dataset.from_tensor_slices(np.asarray(indices, dtype=np.int64))
+    if training:
+        dataset = dataset.shuffle(len(indices), seed=seed, reshuffle_each_iteration=True)
+    return (
+        dataset.batch(batch_size)
+        .map(load, num_parallel_calls=tf.data.AUTOTUNE)
+        .map(prepare, num_parallel_calls=tf.data.AUTOTUNE)
+        .prefetch(tf.data.AUTOTUNE)
+    )
@@ -1,12 +1,49 @@
 import argparse
+import atexit
 import os
 import sys
-from gesture_recognition.app import GestureRecognitionApp
-from gesture_recognition.config import BASE_DIR
-from gesture_recognition.recorder import record_gesture
-from gesture_recognition.trainer import GestureTrainer
-from gesture_recognition.ui.settings_dialog import SettingsDialog
-from gesture_recognition.user_profile import UserProfile
+
+# Only lightweight modules are imported at startup. Each subcommand imports
+# what it needs (TensorFlow, MediaPipe, OpenCV, Tkinter, ...) when it runs,
+# so `--help` and light subcommands don't pay the full ML import cost.
+# benchmarks/startup_time.py checks this against a per-subcommand budget.
+from gesture_recognition.config import (
+    ANALYZE_CHUNK_FRAMES,
+    BASE_DIR,
+    GESTURE_NAMES_PATH,
+    INFERENCE_BACKENDS,
+    MODEL_PATH,
+    PROFILE_SECONDS,
+    SWEEP_ACCURACY_MARGIN,
+    SWEEP_FOLDS,
+    TFLITE_THREADS,
+)
+
+
+def model_settings(model):
+    """Return ``(model_path, names_path, normalize)`` for a --model choice."""
+    if model == "custom":
+        # Custom models are trained on normalized landmarks (see
+        # GestureTrainer), so recognition must normalize too.
+        model_path = os.path.join(BASE_DIR, "models", "custom_model")
+        return model_path, f"{model_path}_gestures.txt", True
+    return None, None, False
+
+
+def add_profile_arguments(parser):
+    parser.add_argument(
+        "--profile-cpu",
+        metavar="OUT",
+        help="Sample all Python threads' stacks and write them to OUT as "
+        "collapsed stacks (for flame graphs), plus a hot-function summary "
+        "to OUT.top.txt",
+    )
+    parser.add_argument(
+        "--profile-seconds",
+        type=float,
+        default=PROFILE_SECONDS,
+        help="How long to sample for --profile-cpu (0 = until exit)",
+    )
 
 
 def main():
@@ -30,12 +67,47 @@ def main():
         help="Which model to use: the bundled pretrained model or the one "
         "trained with 'train' (models/custom_model)",
     )
+    recognize_parser.add_argument(
+        "--backend",
+        choices=INFERENCE_BACKENDS,
+        default=None,
+        help="Inference backend (default: GESTURE_BACKEND or keras); numpy "
+        "needs weights exported with 'export-npz', tflite a model converted "
+        "with 'export-tflite'",
+    )
+    recognize_parser.add_argument(
+        "--pipelined",
+        action="store_true",
+        help="Run capture, detection and classification as separate threaded "
+        "stages so they overlap across frames",
+    )
+    recognize_parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help="Serve Prometheus metrics at http://127.0.0.1:PORT/metrics "
+        "(default: GESTURE_METRICS_PORT, off when unset)",
+    )
+    recognize_parser.add_argument(
+        "--trace",
+        metavar="OUT_JSON",
+        help="Record a span for every stage of every frame and write them on "
+        "exit as a Chrome trace (open in chrome://tracing or ui.perfetto.dev)",
+    )
+
+    add_profile_arguments(recognize_parser)
 
     # Recording mode
     record_parser = subparsers.add_parser("record", help="Record gesture data")
     record_parser.add_argument(
         "--gesture", type=str, help="Name of the gesture to record"
     )
+    record_parser.add_argument(
+        "--sequence",
+        action="store_true",
+        help="Record timed takes of a dynamic (motion) gesture, such as a "
+        "wave or a swipe, for 'train --sequences'",
+    )
 
     # Training mode
     train_parser = subparsers.add_parser(
@@ -47,6 +119,202 @@ def main():
     train_parser.add_argument(
         "--batch-size", type=int, default=16, help="Training batch size"
     )
+    train_parser.add_argument(
+        "--no-augment",
+        action="store_true",
+        help="Train on the recorded samples as-is (no random rotation, "
+        "scaling, mirroring, jitter or landmark dropout)",
+    )
+    train_parser.add_argument(
+        "--sequences",
+        action="store_true",
+        help="Train the dynamic-gesture model on takes recorded with "
+        "'record --sequence' instead of the static pose classifier",
+    )
+    train_parser.add_argument(
+        "--sweep",
+        action="store_true",
+        help="Cross-validate a grid of architectures first and train the "
+        "smallest one within --accuracy-margin of the best",
+    )
+    train_parser.add_argument(
+        "--folds",
+        type=int,
+        default=SWEEP_FOLDS,
+        help="Cross-validation folds for --sweep (split by recording session)",
+    )
+    train_parser.add_argument(
+        "--accuracy-margin",
+        type=float,
+        default=SWEEP_ACCURACY_MARGIN,
+        help="How much lower (absolute) accuracy than the best candidate is "
+        "acceptable for a smaller model, e.g. 0.01 = one percentage point",
+    )
+    train_parser.add_argument(
+        "--widths",
+        type=int,
+        nargs="+",
+        help="First hidden layer widths to sweep (default: 16 32 64 128)",
+    )
+    train_parser.add_argument(
+        "--depths",
+        type=int,
+        nargs="+",
+        help="Numbers of hidden layers to sweep (default: 1 2 3)",
+    )
+    train_parser.add_argument(
+        "--learning-rates",
+        type=float,
+        nargs="+",
+        help="Learning rates to sweep (default: 0.001 0.003)",
+    )
+    train_parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Sweep worker processes (default: one per CPU core)",
+    )
+    train_parser.add_argument(
+        "--sweep-output",
+        default=os.path.join(BASE_DIR, "logs", "sweep.csv"),
+        help="CSV file for the sweep results table",
+    )
+
+    add_profile_arguments(train_parser)
+
+    # Offline analysis mode
+    analyze_parser = subparsers.add_parser(
+        "analyze", help="Recognize gestures in video files without a window"
+    )
+    analyze_parser.add_argument("videos", nargs="+", help="Video files to analyze")
+    analyze_parser.add_argument(
+        "--model",
+        choices=["pretrained", "custom"],
+        default="pretrained",
+        help="Which model to use (see 'recognize --model')",
+    )
+    analyze_parser.add_argument(
+        "--backend",
+        choices=INFERENCE_BACKENDS,
+        default=None,
+        help="Inference backend (default: GESTURE_BACKEND or keras); numpy "
+        "needs weights exported with 'export-npz', tflite a model converted "
+        "with 'export-tflite'",
+    )
+    analyze_parser.add_argument(
+        "--output",
+        default="predictions.jsonl",
+        help="Output file; .csv writes CSV, anything else JSON lines",
+    )
+    analyze_parser.add_argument(
+        "--format", choices=["jsonl", "csv"], help="Override the output format"
+    )
+    analyze_parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (default: one per CPU core)",
+    )
+    analyze_parser.add_argument(
+        "--chunk-frames",
+        type=int,
+        default=ANALYZE_CHUNK_FRAMES,
+        help="Frames per work chunk",
+    )
+    analyze_parser.add_argument(
+        "--flip",
+        action="store_true",
+        help="Mirror frames like the live camera view (for webcam recordings)",
+    )
+    analyze_parser.add_argument(
+        "--trace",
+        metavar="OUT_JSON",
+        help="Write a Chrome trace of every worker's per-frame stages",
+    )
+
+    add_profile_arguments(analyze_parser)
+
+    # Multi-stream host mode
+    host_parser = subparsers.add_parser(
+        "host", help="Recognize gestures on several cameras/videos in one process"
+    )
+    host_parser.add_argument(
+        "sources",
+        nargs="+",
+        help="Camera indices and/or video files, one per stream",
+    )
+    host_parser.add_argument(
+        "--model",
+        choices=["pretrained", "custom"],
+        default="pretrained",
+        help="Which model to use (see 'recognize --model')",
+    )
+    host_parser.add_argument(
+        "--backend",
+        choices=INFERENCE_BACKENDS,
+        default=None,
+        help="Inference backend (default: GESTURE_BACKEND or keras); numpy "
+        "needs weights exported with 'export-npz', tflite a model converted "
+        "with 'export-tflite'",
+    )
+    host_parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="Don't open windows; print gesture changes per stream instead",
+    )
+
+    # Export mode
+    export_npz_parser = subparsers.add_parser(
+        "export-npz",
+        help="Export a dense model's weights for the TensorFlow-free numpy backend",
+    )
+    export_npz_parser.add_argument(
+        "--model",
+        choices=["pretrained", "custom"],
+        default="pretrained",
+        help="Which model to export (see 'recognize --model')",
+    )
+    export_npz_parser.add_argument(
+        "--output", help="Output .npz file (default: next to the model)"
+    )
+
+    export_tflite_parser = subparsers.add_parser(
+        "export-tflite",
+        help="Convert a model to float16 / int8 TFLite and compare the variants",
+    )
+    export_tflite_parser.add_argument(
+        "--model",
+        choices=["pretrained", "custom"],
+        default="pretrained",
+        help="Which model to convert (see 'recognize --model')",
+    )
+    export_tflite_parser.add_argument(
+        "--data-dir",
+        default=os.path.join(BASE_DIR, "recorded_gestures"),
+        help="Recorded samples used to calibrate int8 and measure accuracy",
+    )
+    export_tflite_parser.add_argument(
+        "--threads",
+        type=int,
+        default=TFLITE_THREADS,
+        help="Interpreter threads used for the latency comparison",
+    )
+
+    # Dataset maintenance
+    dataset_parser = subparsers.add_parser(
+        "dataset", help="Manage recorded gesture samples"
+    )
+    dataset_subparsers = dataset_parser.add_subparsers(dest="dataset_command")
+    convert_parser = dataset_subparsers.add_parser(
+        "convert",
+        help="Copy JSON recordings into the memory-mapped sample store used "
+        "for training (re-run to add new recordings)",
+    )
+    convert_parser.add_argument(
+        "--data-dir",
+        default=os.path.join(BASE_DIR, "recorded_gestures"),
+        help="Recordings directory (the store is written to <data-dir>/store)",
+    )
 
     # Settings mode
     settings_parser = subparsers.add_parser(
@@ -67,34 +335,171 @@ def main():
         ).strip().lower()
         mode = choice or "recognize"
 
+    if getattr(args, "profile_cpu", None):
+        from gesture_recognition.services.sampling_profiler import SamplingProfiler
+
+        profiler = SamplingProfiler(args.profile_cpu, duration=args.profile_seconds)
+        # Writes the profile when the window ends, or at exit if that's sooner
+        atexit.register(profiler.stop)
+        profiler.start()
+
     # Handle different modes
-    if mode == "record":
+    if mode == "record" and getattr(args, "sequence", False):
+        from gesture_recognition.recorder import record_sequences
+
+        record_sequences(args.gesture)
+    elif mode == "record":
+        from gesture_recognition.recorder import record_gesture
+
         record_gesture()
+    elif mode == "train" and getattr(args, "sequences", False):
+        from gesture_recognition.sequence_trainer import SequenceTrainer
+
+        SequenceTrainer().train(
+            epochs=args.epochs,
+            batch_size=args.batch_size,
+            augmentation=not args.no_augment,
+        )
     elif mode == "train":
+        from gesture_recognition.trainer import GestureTrainer
+
+        epochs = getattr(args, "epochs", 50)
+        batch_size = getattr(args, "batch_size", 16)
+        augmentation = not getattr(args, "no_augment", False)
         trainer = GestureTrainer()
+        architecture = {}
+        if getattr(args, "sweep", False):
+            from gesture_recognition import sweep
+
+            candidates = sweep.candidate_grid(
+                args.widths or sweep.SWEEP_WIDTHS,
+                args.depths or sweep.SWEEP_DEPTHS,
+                args.learning_rates or sweep.SWEEP_LEARNING_RATES,
+            )
+            try:
+                rows = sweep.run_sweep(
+                    trainer.data_dir,
+                    candidates,
+                    args.folds,
+                    epochs=epochs,
+                    batch_size=batch_size,
+                    augmentation=augmentation,
+                    workers=args.workers,
+                )
+            except ValueError as e:
+                print(f"Sweep failed: {e}")
+                return
+            selected = sweep.select_candidate(rows, args.accuracy_margin)
+            print(sweep.format_table(rows, selected))
+            os.makedirs(os.path.dirname(args.sweep_output) or ".", exist_ok=True)
+            sweep.write_table(rows, args.sweep_output)
+            print(f"Wrote sweep results to {args.sweep_output}")
+            architecture = {
+                "hidden_layers": selected["hidden_layers"],
+                "learning_rate": selected["learning_rate"],
+            }
         trainer.train(
-            epochs=getattr(args, "epochs", 50),
-            batch_size=getattr(args, "batch_size", 16),
+            epochs=epochs,
+            batch_size=batch_size,
+            augmentation=augmentation,
+            **architecture,
+        )
+    elif mode == "analyze":
+        from gesture_recognition.analyze import analyze_videos, write_predictions
+
+        model_path, names_path, normalize = model_settings(args.model)
+        records = analyze_videos(
+            args.videos,
+            model_path=model_path,
+            names_path=names_path,
+            normalize=normalize,
+            workers=args.workers,
+            chunk_frames=args.chunk_frames,
+            flip=args.flip,
+            backend=args.backend,
+            trace_path=args.trace,
+        )
+        write_predictions(records, args.output, args.format)
+        print(f"Wrote {len(records)} frame predictions to {args.output}")
+    elif mode == "host":
+        from gesture_recognition.host import MultiStreamHost
+
+        model_path, names_path, normalize = model_settings(args.model)
+        host = MultiStreamHost(
+            args.sources,
+            model_path=model_path,
+            names_path=names_path,
+            normalize=normalize,
+            headless=args.headless,
+            backend=args.backend,
+        )
+        host.run()
+    elif mode == "export-npz":
+        from gesture_recognition.export import export_npz
+
+        model_path = model_settings(args.model)[0] or MODEL_PATH
+        try:
+            output_path = export_npz(model_path, args.output)
+        except ValueError as e:
+            print(f"Export failed: {e}")
+            return
+        print(f"Exported {model_path} to {output_path}")
+    elif mode == "export-tflite":
+        from gesture_recognition.export import (
+            compare_variants,
+            export_tflite,
+            format_report,
+            load_representative_samples,
+        )
+
+        model_path, names_path, normalize = model_settings(args.model)
+        model_path = model_path or MODEL_PATH
+        with open(names_path or GESTURE_NAMES_PATH) as f:
+            class_names = [line.strip() for line in f if line.strip()]
+        x, y, gestures = load_representative_samples(args.data_dir, normalize)
+        paths = export_tflite(model_path, x)
+        for variant, path in paths.items():
+            print(f"Wrote {variant} model to {path}")
+        rows = compare_variants(
+            model_path, paths, x, y, gestures, class_names, normalize, args.threads
         )
+        print(format_report(rows))
+    elif mode == "dataset":
+        if args.dataset_command != "convert":
+            dataset_parser.print_help()
+            return
+        from gesture_recognition.dataset import convert_recordings
+
+        if not os.path.isdir(args.data_dir):
+            print(f"Error: Data directory {args.data_dir} not found")
+            return
+        sessions, samples = convert_recordings(args.data_dir)
+        print(f"Added {sessions} recording(s), {samples} samples to the store")
     elif mode == "settings":
+        from gesture_recognition.ui.settings_dialog import SettingsDialog
+        from gesture_recognition.user_profile import UserProfile
+
         profile = UserProfile(getattr(args, "profile", "default"))
         dialog = SettingsDialog(profile)
         dialog.show()
     else:  # Default to recognize mode
+        from gesture_recognition.app import GestureRecognitionApp
+        from gesture_recognition.user_profile import UserProfile
+
         profile = UserProfile(getattr(args, "profile", "default"))
-        if getattr(args, "model", "pretrained") == "custom":
-            # Custom models are trained on normalized landmarks (see
-            # GestureTrainer), so recognition must normalize too.
-            model_path = os.path.join(BASE_DIR, "models", "custom_model")
-            names_path = f"{model_path}_gestures.txt"
-            app = GestureRecognitionApp(
-                profile=profile,
-                model_path=model_path,
-                names_path=names_path,
-                normalize=True,
-            )
-        else:
-            app = GestureRecognitionApp(profile=profile)
+        model_path, names_path, normalize = model_settings(
+            getattr(args, "model", "pretrained")
+        )
+        app = GestureRecognitionApp(
+            profile=profile,
+            model_path=model_path,
+            names_path=names_path,
+            normalize=normalize,
+            pipelined=getattr(args, "pipelined", False),
+            backend=getattr(args, "backend", None),
+            metrics_port=getattr(args, "metrics_port", None),
+            trace_path=getattr(args, "trace", None),
+        )
         app.run()
 
 
@@ -1,7 +1,18 @@
 import cv2
 import mediapipe as mp
+import os
+import sys
 import time
-cap = cv2.VideoCapture(0)
+
+# Make the project root importable so the shared frame source resolves when
+# this script is run directly (e.g. `python scripts/hand_tracking_demo.py`).
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from gesture_recognition.camera import FrameSource
+
+camera = FrameSource(0).open()
 
 mpHands = mp.solutions.hands
 hands = mpHands.Hands(static_image_mode=False,
@@ -14,7 +25,10 @@ pTime = 0
 cTime = 0
 
 while True:
-    success, img = cap.read()
+    frame = camera.read()
+    if frame is None:
+        continue
+    img = frame.image
     imgRGB = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
     results = hands.process(imgRGB)
     #print(results.multi_hand_landmarks)
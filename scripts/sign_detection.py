@@ -12,6 +12,7 @@ ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if ROOT_DIR not in sys.path:
     sys.path.insert(0, ROOT_DIR)
 
+from gesture_recognition.camera import FrameSource
 from gesture_recognition.tracking.hand_detector import handDetector
 from gesture_recognition.services.audio_manager import AudioManager
 from gesture_recognition.services.gesture_smoothing import GestureSmoother
@@ -31,21 +32,21 @@ enable_voice = False  # Change to True when you want to enable voice
 # Initialize gesture smoothing
 smoother = GestureSmoother(history_length=10)
 
-# Initialize the webcam
-cap = cv2.VideoCapture(1)  # if webcam not working change to (0)/(1)/(2)
+# Initialize the webcam (serves only the newest frame)
+camera = FrameSource(1).open()  # if webcam not working change to (0)/(1)/(2)
 
 # Initialize hand detector
 detector = handDetector(detectionCon=0.7, maxHands=1)
 
 while True:
-    # Read each frame from the webcam
-    success, frame = cap.read()
-    if not success:
+    # Read the newest frame from the webcam
+    captured = camera.read()
+    if captured is None:
         print("Failed to capture image")
         continue
 
     # Flip the frame horizontally for a more intuitive mirror view
-    frame = cv2.flip(frame, 1)
+    frame = cv2.flip(captured.image, 1)
 
     # Find hands
     frame = detector.findHands(frame)
@@ -123,5 +124,5 @@ while True:
         print(f"Voice feedback {status}")
 
 # Release resources
-cap.release()
+camera.release()
 cv2.destroyAllWindows()
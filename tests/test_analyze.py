@@ -0,0 +1,109 @@
+import csv
+import json
+
+import pytest
+
+from gesture_recognition.analyze import (
+    plan_chunks,
+    smooth_predictions,
+    write_predictions,
+)
+
+
+def test_plan_chunks_covers_every_frame_once():
+    chunks = plan_chunks(2500, chunk_frames=1000)
+    assert chunks == [(0, 1000), (1000, 2000), (2000, 2500)]
+
+
+def test_plan_chunks_empty_video():
+    assert plan_chunks(0) == []
+
+
+def test_plan_chunks_rejects_zero_size():
+    with pytest.raises(ValueError):
+        plan_chunks(10, chunk_frames=0)
+
+
+def test_smoothing_runs_over_merged_rows():
+    rows = [(0, "fist", 0.9), (1, None, 0.0), (2, "fist", 0.9), (3, "peace", 0.9)]
+    records = smooth_predictions("clip.mp4", rows, 30.0, 10, 0.5)
+
+    assert [r["frame"] for r in records] == [0, 1, 2, 3]
+    assert records[1]["hand"] is False
+    assert records[1]["smoothed"] == ""
+    # Smoother history carries across frames (and chunk boundaries)
+    assert records[3]["smoothed"] == "fist"
+    assert records[2]["time"] == pytest.approx(2 / 30, abs=1e-3)
+
+
+def test_write_jsonl_and_csv(tmp_path):
+    records = smooth_predictions("clip.mp4", [(0, "fist", 0.9)], 30.0, 10, 0.5)
+
+    jsonl = tmp_path / "out.jsonl"
+    write_predictions(records, str(jsonl))
+    assert json.loads(jsonl.read_text().splitlines()[0])["gesture"] == "fist"
+
+    csv_path = tmp_path / "out.csv"
+    write_predictions(records, str(csv_path))
+    with open(csv_path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert rows[0]["smoothed"] == "fist"
+
+
+def test_trace_covers_every_frame(tmp_path):
+    cv2 = pytest.importorskip("cv2")
+    pytest.importorskip("mediapipe")
+    import numpy as np
+
+    from gesture_recognition.analyze import analyze_videos
+
+    video = str(tmp_path / "blank.avi")
+    writer = cv2.VideoWriter(video, cv2.VideoWriter_fourcc(*"MJPG"), 30, (160, 120))
+    for _ in range(6):
+        writer.write(np.zeros((120, 160, 3), np.uint8))
+    writer.release()
+
+    trace_path = tmp_path / "trace.json"
+    records = analyze_videos(
+        [video], workers=1, chunk_frames=4, backend="numpy", trace_path=trace_path
+    )
+
+    events = json.loads(trace_path.read_text())["traceEvents"]
+    names = [e["name"] for e in events if e["ph"] == "X"]
+    assert len(records) == 6
+    assert names.count("detect") == 6
+    assert names.count("chunk") == 2
+    assert {"init detector", "init classifier", "smooth"} <= set(names)
+
+
+def test_results_do_not_depend_on_worker_count(tmp_path):
+    cv2 = pytest.importorskip("cv2")
+    pytest.importorskip("mediapipe")
+    import importlib.util
+    import os
+
+    from gesture_recognition.analyze import analyze_videos
+
+    bench_path = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        "benchmarks",
+        "pipeline_bench.py",
+    )
+    spec = importlib.util.spec_from_file_location("pipeline_bench", bench_path)
+    pipeline_bench = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(pipeline_bench)
+
+    # A drawn hand moving through the clip, so the detector tracks it
+    frames, _ = pipeline_bench.synthetic_frames(16)
+    video = str(tmp_path / "hand.avi")
+    height, width = frames[0].shape[:2]
+    writer = cv2.VideoWriter(video, cv2.VideoWriter_fourcc(*"MJPG"), 30, (width, height))
+    for frame in frames:
+        writer.write(frame)
+    writer.release()
+
+    # Each worker gets chunks that don't follow the one it ran before
+    single = analyze_videos([video], workers=1, chunk_frames=4, backend="numpy")
+    pooled = analyze_videos([video], workers=3, chunk_frames=4, backend="numpy")
+    assert any(record["hand"] for record in single)
+    assert pooled == single
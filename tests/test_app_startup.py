@@ -0,0 +1,106 @@
+import threading
+
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+pytest.importorskip("mediapipe")
+
+from gesture_recognition import app as app_module
+
+
+class FakeCamera:
+    def __init__(self):
+        self.released = threading.Event()
+
+    def open(self):
+        return self
+
+    def release(self):
+        self.released.set()
+
+
+@pytest.fixture
+def fakes(monkeypatch):
+    camera = FakeCamera()
+    model_loaded = threading.Event()
+
+    class SlowGestureManager:
+        def __init__(self, *args, **kwargs):
+            model_loaded.wait(5)
+
+    monkeypatch.setattr(app_module, "FrameSource", lambda index: camera)
+    monkeypatch.setattr(app_module, "handDetector", lambda **kwargs: object())
+    monkeypatch.setattr(app_module, "GestureManager", SlowGestureManager)
+    return camera, model_loaded
+
+
+def test_frames_ready_before_classifier(fakes):
+    camera, model_loaded = fakes
+    app = app_module.GestureRecognitionApp()
+
+    assert app.camera is camera
+    assert app.gesture_manager is None
+    assert app._classify([[0, 1, 2]]) is None
+    assert set(app.init_times) == {"camera", "detector", "audio"}
+
+    model_loaded.set()
+    app._classifier.result(timeout=5)
+    assert app._poll_classifier()
+    assert "classifier" in app.init_times
+
+
+def test_classify_batches_all_hands_under_stable_ids(fakes):
+    _, model_loaded = fakes
+    model_loaded.set()
+    app = app_module.GestureRecognitionApp()
+    app._classifier.result(timeout=5)
+    app._poll_classifier()
+
+    batches = []
+
+    class FakeManager:
+        def predict_batch(self, landmarks, distributions=False):
+            batches.append(len(landmarks))
+            # Left of the frame is a fist, right a palm
+            return [("fist" if hand[0, 0] < 300 else "palm", 0.9) for hand in landmarks]
+
+    app.gesture_manager = FakeManager()
+    left, right = np.zeros((2, 21, 3), np.float32)
+    left[:, 0] = np.linspace(100, 200, 21)
+    right[:, 0] = np.linspace(400, 500, 21)
+    left[:, 1] = right[:, 1] = np.linspace(200, 300, 21)
+
+    for frame in range(4):
+        hands = np.stack([left, right] if frame % 2 else [right, left])
+        results = app._classify(hands, np.float32([0.5, 0.5]))
+    by_id = {hand_id: (gesture, anchor) for hand_id, gesture, _, anchor in results}
+    assert batches == [2, 2, 2, 2]
+    assert by_id == {1: ("palm", (400, 200)), 2: ("fist", (100, 200))}
+    app._draw_overlays(np.zeros((480, 640, 3), np.uint8), results)
+
+
+def test_init_fails_fast_and_releases_camera(fakes, monkeypatch):
+    camera, model_loaded = fakes
+
+    def broken_detector(**kwargs):
+        raise RuntimeError("no graph")
+
+    monkeypatch.setattr(app_module, "handDetector", broken_detector)
+    # The classifier is still loading; the detector error must not wait for it
+    with pytest.raises(RuntimeError, match="no graph"):
+        app_module.GestureRecognitionApp()
+    assert camera.released.wait(5)
+    model_loaded.set()
+
+
+def test_classifier_error_stops_app(fakes, monkeypatch):
+    camera, _ = fakes
+
+    def broken_manager(*args, **kwargs):
+        raise OSError("model missing")
+
+    monkeypatch.setattr(app_module, "GestureManager", broken_manager)
+    with pytest.raises(OSError, match="model missing"):
+        app_module.GestureRecognitionApp()
+    assert camera.released.wait(5)
@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+
+from gesture_recognition.camera import (
+    FrameSource,
+    decode_fourcc,
+    negotiate_mode,
+)
+
+
+def write_video(path, frames=12, fps=30):
+    writer = cv2.VideoWriter(
+        str(path), cv2.VideoWriter_fourcc(*"MJPG"), fps, (64, 48)
+    )
+    for i in range(frames):
+        writer.write(np.full((48, 64, 3), i * 10, dtype=np.uint8))
+    writer.release()
+    return str(path)
+
+
+def test_decode_fourcc_round_trip():
+    assert decode_fourcc(cv2.VideoWriter_fourcc(*"MJPG")) == "MJPG"
+
+
+def test_video_file_delivers_every_frame_in_order(tmp_path):
+    path = write_video(tmp_path / "clip.avi")
+
+    with FrameSource(path) as source:
+        frames = []
+        while (frame := source.read()) is not None:
+            frames.append(frame)
+
+    assert [f.seq for f in frames] == list(range(12))
+    stamps = [f.timestamp for f in frames]
+    assert stamps == sorted(stamps)
+    assert frames[0].image.shape == (48, 64, 3)
+    assert source.finished
+
+
+def test_latest_only_never_serves_a_frame_twice(tmp_path):
+    path = write_video(tmp_path / "clip.avi", frames=30, fps=200)
+
+    with FrameSource(path, latest_only=True) as source:
+        seqs = []
+        while (frame := source.read(timeout=2.0)) is not None:
+            seqs.append(frame.seq)
+
+    assert seqs
+    assert seqs == sorted(set(seqs))
+    # Every grabbed frame was either served or counted as dropped
+    assert len(seqs) + source.dropped == 30
+
+
+def test_missing_file_raises():
+    with pytest.raises(RuntimeError):
+        FrameSource("does_not_exist.avi").open()
+
+
+class FakeCapture:
+    """Accepts only YUYV at any frame rate, like many cheap webcams."""
+
+    def __init__(self):
+        self.props = {cv2.CAP_PROP_FOURCC: cv2.VideoWriter_fourcc(*"YUYV")}
+
+    def set(self, prop, value):
+        if prop == cv2.CAP_PROP_FOURCC:
+            if value != cv2.VideoWriter_fourcc(*"YUYV"):
+                return False
+            # Like some V4L2 backends: a format change resets the size
+            self.props.pop(cv2.CAP_PROP_FRAME_WIDTH, None)
+            self.props.pop(cv2.CAP_PROP_FRAME_HEIGHT, None)
+        self.props[prop] = value
+        return True
+
+    def isOpened(self):
+        return True
+
+    def release(self):
+        pass
+
+    def get(self, prop):
+        return self.props.get(prop, 0.0)
+
+    def grab(self):
+        return True
+
+
+def test_negotiate_skips_unsupported_fourcc():
+    mode = negotiate_mode(FakeCapture())
+    assert mode["fourcc"] == "YUYV"
+    assert mode["buffer_size"] == 1
+
+
+def test_open_sets_the_frame_size_after_negotiating(monkeypatch):
+    capture = FakeCapture()
+    monkeypatch.setattr(cv2, "VideoCapture", lambda source: capture)
+    source = FrameSource(0, width=320, height=240, latest_only=False, negotiate=True)
+    source.open()
+    try:
+        assert source.mode["fourcc"] == "YUYV"
+        assert capture.get(cv2.CAP_PROP_FRAME_WIDTH) == 320
+        assert capture.get(cv2.CAP_PROP_FRAME_HEIGHT) == 240
+    finally:
+        source.release()
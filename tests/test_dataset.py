@@ -1,6 +1,14 @@
 import json
+import os
 
-from gesture_recognition.dataset import gesture_name_from_filename, load_samples
+import numpy as np
+
+from gesture_recognition import dataset
+from gesture_recognition.dataset import (
+    gesture_name_from_filename,
+    load_sample_arrays,
+    load_samples,
+)
 
 
 def test_simple_gesture_name():
@@ -46,3 +54,80 @@ def test_load_samples_ignores_non_json(tmp_path):
     (tmp_path / "notes.txt").write_text("not a recording")
     x, y, gestures = load_samples(tmp_path)
     assert (x, y, gestures) == ([], [], [])
+
+
+def test_load_sample_arrays(tmp_path):
+    hand = [[100 + i, 200 + 2 * i] for i in range(21)]
+    write_recording(tmp_path, "wave", [hand, hand])
+    write_recording(tmp_path, "fist", [hand])
+
+    x, y, gestures = load_sample_arrays(tmp_path, normalize=True)
+
+    assert x.shape == (3, 21, 2) and x.dtype == np.float32
+    assert x.flags["C_CONTIGUOUS"]
+    assert gestures == ["fist", "wave"]
+    np.testing.assert_array_equal(y, [0, 1, 1])
+    lists, _, _ = load_samples(tmp_path, normalize=True)
+    np.testing.assert_allclose(x, lists)
+
+
+def test_load_sample_arrays_empty(tmp_path):
+    write_recording(tmp_path, "wave", [])
+    x, y, gestures = load_sample_arrays(tmp_path)
+    assert x.shape == (0, 21, 2) and y.shape == (0,)
+    assert gestures == ["wave"]
+
+
+def count_parses(monkeypatch):
+    calls = []
+    original = dataset._read_recording
+
+    def counting(path):
+        calls.append(os.path.basename(path))
+        return original(path)
+
+    monkeypatch.setattr(dataset, "_read_recording", counting)
+    return calls
+
+
+def test_cache_parses_only_new_or_changed_files(tmp_path, monkeypatch):
+    hand = [[100 + i, 200 + 2 * i] for i in range(21)]
+    write_recording(tmp_path, "wave", [hand, hand])
+    (tmp_path / "fist_20260101_130000.json").write_text(json.dumps([hand]))
+    first = load_sample_arrays(tmp_path)
+
+    parses = count_parses(monkeypatch)
+    second = load_sample_arrays(tmp_path)
+    assert parses == []
+    np.testing.assert_array_equal(first[0], second[0])
+    assert first[2] == second[2] == ["fist", "wave"]
+
+    # Re-recorded file is re-parsed; the other one comes from the cache
+    (tmp_path / "fist_20260101_130000.json").write_text(json.dumps([hand] * 3))
+    _, y, _ = load_sample_arrays(tmp_path)
+    assert parses == ["fist_20260101_130000.json"]
+    np.testing.assert_array_equal(y, [0, 0, 0, 1, 1])
+
+
+def test_cache_keyed_by_normalization(tmp_path):
+    hand = [[100 + i, 200 + 2 * i] for i in range(21)]
+    write_recording(tmp_path, "wave", [hand])
+    normalized, _, _ = load_sample_arrays(tmp_path, normalize=True)
+    raw, _, _ = load_sample_arrays(tmp_path, normalize=False)
+    np.testing.assert_array_equal(raw[0], hand)
+    assert np.abs(normalized).max() == 1.0
+
+
+def test_cache_evicts_deleted_recordings(tmp_path):
+    hand = [[i, i] for i in range(21)]
+    write_recording(tmp_path, "wave", [hand])
+    (tmp_path / "fist_20260101_130000.json").write_text(json.dumps([hand]))
+    load_sample_arrays(tmp_path)
+    assert len(list((tmp_path / ".cache").glob("*.npy"))) == 2
+
+    (tmp_path / "fist_20260101_130000.json").unlink()
+    _, _, gestures = load_sample_arrays(tmp_path)
+    assert gestures == ["wave"]
+    assert [p.name for p in (tmp_path / ".cache").glob("*.npy")] == [
+        "wave_20260101_120000.json.normalized.npy"
+    ]
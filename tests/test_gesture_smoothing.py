@@ -1,3 +1,8 @@
+import random
+from collections import Counter
+
+import pytest
+
 from gesture_recognition.services.gesture_smoothing import GestureSmoother
 
 
@@ -33,3 +38,101 @@ def test_history_length_limits_memory():
     for _ in range(3):
         smoother.update("new", 0.9)
     assert smoother.get_dominant_gesture() == "new"
+
+
+STRATEGIES = ["majority", "weighted", "ema", "hysteresis"]
+
+
+def switch_delay(smoother, steady=40, confidence=1.0):
+    """Frames of "new" (after a steady run of "old") until "new" is shown."""
+    for _ in range(steady):
+        smoother.update("old", confidence)
+    for frame in range(1, steady + 1):
+        smoother.update("new", confidence)
+        if smoother.get_dominant_gesture() == "new":
+            return frame
+    return None
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+def test_reported_delay_matches_switch(strategy):
+    smoother = GestureSmoother(history_length=15, strategy=strategy)
+    assert switch_delay(smoother) == smoother.delay_frames
+
+
+def test_averaging_strategies_lag_less_than_window():
+    window = GestureSmoother(history_length=15).delay_frames
+    for strategy in ["ema", "hysteresis"]:
+        assert (
+            GestureSmoother(history_length=15, strategy=strategy).delay_frames < window
+        )
+
+
+def test_running_counts_match_recount():
+    rng = random.Random(0)
+    smoother = GestureSmoother(history_length=7, dominance=0.4)
+    names = ["a", "b", "c"]
+    for _ in range(500):
+        smoother.update(rng.choice(names), rng.random())
+        history = [name for name, _ in smoother.strategy.history]
+        assert smoother.strategy.counts == {n: history.count(n) for n in set(history)}
+        expected = ""
+        if history:
+            name, count = Counter(history).most_common(1)[0]
+            if count >= len(history) * 0.4:
+                expected = name
+        got = smoother.get_dominant_gesture()
+        if expected and got != expected:
+            # A tie may be broken either way; the count must still be the max
+            assert history.count(got) == history.count(expected)
+        else:
+            assert got == expected
+
+
+def test_weighted_vote_prefers_confident_predictions():
+    smoother = GestureSmoother(history_length=5, strategy="weighted", dominance=0.5)
+    for name, confidence in [("a", 0.55), ("a", 0.55), ("b", 0.95), ("b", 0.95)]:
+        smoother.update(name, confidence)
+    assert smoother.get_dominant_gesture() == "b"
+
+
+def test_ema_ignores_single_frame_flicker():
+    smoother = GestureSmoother(strategy="ema", alpha=0.25)
+    for _ in range(20):
+        smoother.update("wave", 0.9)
+    smoother.update("fist", 0.9)
+    assert smoother.get_dominant_gesture() == "wave"
+
+
+def test_ema_uses_full_distribution():
+    smoother = GestureSmoother(strategy="ema", alpha=0.5, confidence_threshold=0.3)
+    assert smoother.uses_probabilities
+    # "a" narrowly wins each frame but "b" is consistently close behind
+    for top in ["a", "c", "a", "c"]:
+        probabilities = {"a": 0.0, "b": 0.4, "c": 0.0}
+        probabilities[top] = 0.6
+        smoother.update(top, 0.6, probabilities)
+    assert smoother.get_dominant_gesture() == "b"
+
+
+def test_hysteresis_holds_until_exit_threshold():
+    smoother = GestureSmoother(
+        strategy="hysteresis", alpha=0.5, enter_threshold=0.6, exit_threshold=0.25
+    )
+    smoother.update("wave", 1.0)
+    assert smoother.get_dominant_gesture() == ""
+    smoother.update("wave", 1.0)
+    assert smoother.get_dominant_gesture() == "wave"
+    # Low-confidence frames decay the score: 0.75 -> 0.43 -> 0.26 -> 0.18
+    shown = []
+    for _ in range(3):
+        smoother.update("wave", 0.1)
+        shown.append(smoother.get_dominant_gesture())
+    assert shown == ["wave", "wave", ""]
+
+
+def test_unknown_strategy_rejected():
+    with pytest.raises(ValueError):
+        GestureSmoother(strategy="median")
+    with pytest.raises(ValueError):
+        GestureSmoother(strategy="hysteresis", enter_threshold=0.3, exit_threshold=0.5)
@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+landmark_pb2 = pytest.importorskip("mediapipe.framework.formats.landmark_pb2")
+classification_pb2 = pytest.importorskip(
+    "mediapipe.framework.formats.classification_pb2"
+)
+
+from gesture_recognition.tracking.hand_detector import (
+    _copy_landmarks,
+    handDetector,
+)
+
+
+def make_hand(seed, visibility=False):
+    rng = np.random.default_rng(seed)
+    points = rng.uniform(0, 1, (21, 3)).astype(np.float32)
+    hand = landmark_pb2.NormalizedLandmarkList()
+    for x, y, z in points:
+        lm = hand.landmark.add(x=x, y=y, z=z)
+        if visibility:
+            lm.visibility = 0.9
+    return hand, points
+
+
+def make_handedness(label, score):
+    handedness = classification_pb2.ClassificationList()
+    handedness.classification.add(label=label, score=score)
+    return handedness
+
+
+class FakeResults:
+    def __init__(self, hands, handedness):
+        self.multi_hand_landmarks = hands
+        self.multi_handedness = handedness
+
+
+@pytest.mark.parametrize("visibility", [False, True])
+def test_copy_landmarks_matches_protobuf(visibility):
+    hand, points = make_hand(0, visibility)
+    out = np.zeros((21, 3), np.float32)
+    _copy_landmarks(hand, out)
+    np.testing.assert_array_equal(out, points)
+
+
+@pytest.fixture(scope="module")
+def detector():
+    return handDetector(maxHands=2, buffers=2)
+
+
+def test_find_landmarks_scales_to_pixels(detector):
+    (left, left_points), (right, right_points) = make_hand(1), make_hand(2)
+    detector.results = FakeResults(
+        [left, right], [make_handedness("Left", 0.8), make_handedness("Right", 0.9)]
+    )
+    image = np.zeros((480, 640, 3), np.uint8)
+
+    landmarks, handedness = detector.findLandmarks(image)
+
+    assert landmarks.shape == (2, 21, 3) and landmarks.dtype == np.float32
+    expected = left_points * np.float32([640, 480, 640])
+    np.testing.assert_allclose(landmarks[0], expected, rtol=1e-6)
+    np.testing.assert_allclose(handedness, [0.2, 0.9], rtol=1e-6)
+
+    lmList = detector.findPosition(image, handNo=1, draw=False)
+    assert lmList[5] == [5, int(right_points[5, 0] * 640), int(right_points[5, 1] * 480)]
+
+
+def test_find_landmarks_rotates_buffers(detector):
+    hand, _ = make_hand(3)
+    detector.results = FakeResults([hand], [make_handedness("Right", 1.0)])
+    image = np.zeros((10, 10, 3), np.uint8)
+
+    first, _ = detector.findLandmarks(image)
+    second, _ = detector.findLandmarks(image)
+    assert not np.shares_memory(first, second)
+
+
+def test_no_hands(detector):
+    detector.results = None
+    landmarks, handedness = detector.findLandmarks(np.zeros((10, 10, 3), np.uint8))
+    assert landmarks.shape == (0, 21, 3)
+    assert handedness.shape == (0,)
+    assert detector.findPosition(np.zeros((10, 10, 3), np.uint8)) == []
+
+
+def test_find_landmarks_maps_roi_results_to_frame(detector):
+    hand, points = make_hand(4)
+    detector.results = FakeResults([hand], [make_handedness("Right", 1.0)])
+    detector._resultsRoi = (100, 50, 200)
+    try:
+        landmarks, _ = detector.findLandmarks(np.zeros((480, 640, 3), np.uint8))
+    finally:
+        detector._resultsRoi = None
+
+    expected = points * 200 + np.float32([100, 50, 0])
+    np.testing.assert_allclose(landmarks[0], expected, rtol=1e-5)
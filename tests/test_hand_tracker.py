@@ -0,0 +1,85 @@
+import numpy as np
+
+from gesture_recognition.services.gesture_smoothing import GestureSmoother
+from gesture_recognition.tracking.hand_tracker import HandTracker, match_hands
+
+
+def hand_at(x, y=200.0, size=100.0):
+    """A (21, 3) hand: landmarks spread over a ``size`` square at (x, y)."""
+    grid = np.linspace(0, size, 21, dtype=np.float32)
+    points = np.zeros((21, 3), np.float32)
+    points[:, 0] = x + grid
+    points[:, 1] = y + grid[::-1]
+    return points
+
+
+def hands(*xs):
+    return np.stack([hand_at(x) for x in xs])
+
+
+def tracker(**kwargs):
+    return HandTracker(lambda: GestureSmoother(history_length=3), **kwargs)
+
+
+def ids(visible):
+    return [hand.id for hand in visible]
+
+
+def test_match_hands_pairs_nearest_and_gates_distance():
+    previous = hands(100, 400)
+    assert sorted(match_hands(previous, [0.9, 0.1], hands(410, 95), [0.1, 0.9])) == [
+        (0, 1),
+        (1, 0),
+    ]
+    # 300 px away is 3 hand sizes: no match within 1
+    assert match_hands(previous[:1], [0.9], hands(400), [0.9], max_distance=1.0) == []
+    assert match_hands(previous[:1], [0.9], hands(400), [0.9]) == [(0, 0)]
+
+
+def test_handedness_breaks_ties_between_overlapping_hands():
+    previous = hands(100, 100)
+    pairs = match_hands(previous, [0.1, 0.9], hands(100, 100), [0.9, 0.1])
+    assert sorted(pairs) == [(0, 1), (1, 0)]
+
+
+def test_ids_stay_with_hands_when_detection_order_swaps():
+    t = tracker()
+    assert ids(t.update(hands(100, 400), [0.9, 0.1])) == [1, 2]
+    assert ids(t.update(hands(405, 110), [0.1, 0.9])) == [2, 1]
+    assert ids(t.update(hands(115, 410), [0.9, 0.1])) == [1, 2]
+    assert t.primary.id == 1
+
+
+def test_missed_hand_keeps_id_for_max_missed_frames():
+    t = tracker(max_missed=2)
+    t.update(hands(100, 400))
+    for _ in range(2):
+        assert ids(t.update(hands(100))) == [1]
+    assert ids(t.update(hands(100, 400))) == [1, 2]
+
+    for _ in range(3):
+        t.update(hands(100))
+    # Gone for longer than max_missed: the hand comes back as a new one
+    assert ids(t.update(hands(100, 400))) == [1, 3]
+
+
+def test_no_hands_and_far_jumps():
+    t = tracker()
+    assert t.update(np.zeros((0, 21, 3), np.float32)) == []
+    assert t.primary is None
+    assert ids(t.update(hands(100))) == [1]
+    assert ids(t.update(hands(600))) == [2]
+    t.reset()
+    assert t.hands == [] and t.primary is None
+
+
+def test_each_hand_smooths_its_own_gestures():
+    t = tracker()
+    for xs in [(100, 400), (405, 105), (110, 410)]:
+        for hand in t.update(hands(*xs)):
+            hand.update_prediction(("fist", 0.9) if hand.id == 1 else ("peace", 0.8))
+
+    first, second = t.update(hands(100, 400))
+    assert (first.id, first.gesture) == (1, "fist")
+    assert (second.id, second.gesture, second.confidence) == (2, "peace", 0.8)
+    assert first.anchor == (100, 200)
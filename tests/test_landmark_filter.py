@@ -0,0 +1,173 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from gesture_recognition.tracking.landmark_filter import (
+    FilteredDetector,
+    KalmanFilter,
+    OneEuroFilter,
+    filtered_detector,
+)
+
+DT = 1 / 30
+
+
+def hand_at(x, y=200.0, size=100.0):
+    """A (1, 21, 3) hand: landmarks spread over a ``size`` square at (x, y)."""
+    grid = np.linspace(0, size, 21, dtype=np.float32)
+    points = np.zeros((1, 21, 3), np.float32)
+    points[0, :, 0] = x + grid
+    points[0, :, 1] = y + grid[::-1]
+    return points
+
+
+class FakeDetector:
+    """Finds a hand at ``positions[frame]`` (``None``: no hand)."""
+
+    def __init__(self, positions, handedness=0.95):
+        self.positions = positions
+        self.handedness = np.float32([handedness])
+        self.calls = 0
+        self.frame = 0
+
+    def findHands(self, img, draw=True):
+        self.calls += 1
+        return img
+
+    def findLandmarks(self, img):
+        x = self.positions[self.frame]
+        if x is None:
+            return np.zeros((0, 21, 3), np.float32), np.zeros(0, np.float32)
+        return hand_at(x), self.handedness
+
+
+def run(detector, frames):
+    """Feed ``frames`` frames; returns the x of landmark 0 on every frame."""
+    image = np.zeros((4, 4, 3), np.uint8)
+    xs = []
+    for frame in range(frames):
+        detector.detector.frame = frame
+        detector.findHands(image, draw=False)
+        landmarks, _ = detector.findLandmarks(image)
+        xs.append(float(landmarks[0, 0, 0]) if len(landmarks) else None)
+    return xs
+
+
+def frame_clock():
+    return itertools.count(0, DT).__next__
+
+
+@pytest.mark.parametrize("filter_class", [OneEuroFilter, KalmanFilter])
+def test_filters_track_constant_velocity(filter_class):
+    f = filter_class()
+    for i in range(60):
+        f.update(hand_at(100 + 3 * i), DT)
+    # 3 px per frame = 90 px/s: the prediction continues the motion
+    assert f.velocity[0, 0, 0] == pytest.approx(90, rel=0.1)
+    last = f.x[0, 0, 0]
+    assert f.predict(2 * DT)[0, 0, 0] == pytest.approx(last + 6, abs=1)
+
+
+@pytest.mark.parametrize("filter_class", [OneEuroFilter, KalmanFilter])
+def test_filters_reduce_jitter(filter_class):
+    rng = np.random.default_rng(0)
+    f = filter_class()
+    noisy = 200 + rng.normal(0, 2, 200)
+    out = [f.update(hand_at(x), DT)[0, 0, 0] for x in noisy]
+    assert np.std(out[50:]) < 0.7 * np.std(noisy[50:])
+
+
+def test_steady_hand_runs_detector_every_interval():
+    detector = FakeDetector([200.0] * 100)
+    filtered = FilteredDetector(detector, interval=4, clock=frame_clock())
+    xs = run(filtered, 42)
+    # Frames 0 and 1 acquire the hand, then every 4th frame
+    assert detector.calls == 12
+    assert filtered.detector_load == pytest.approx(12 / 42)
+    assert xs[-1] == pytest.approx(200)
+
+
+def test_fast_motion_forces_detection():
+    # 20 px per frame on a 100 px hand, over the 10% motion limit
+    detector = FakeDetector([100 + 20.0 * i for i in range(100)])
+    filtered = FilteredDetector(
+        detector, interval=4, filter="kalman", max_motion=0.1, clock=frame_clock()
+    )
+    run(filtered, 40)
+    assert filtered.detector_load > 0.9
+
+
+def test_low_confidence_forces_detection():
+    detector = FakeDetector([200.0] * 100, handedness=0.55)
+    filtered = FilteredDetector(
+        detector, interval=4, min_confidence=0.6, clock=frame_clock()
+    )
+    run(filtered, 20)
+    assert detector.calls == 20
+
+
+def test_lost_hand_is_searched_for_every_frame():
+    detector = FakeDetector([200.0] * 5 + [None, None, 210.0])
+    filtered = FilteredDetector(detector, interval=4, clock=frame_clock())
+    xs = run(filtered, 8)
+    # Detected on frames 0 and 1, predicted on 2-4, lost on 5 and 6
+    assert xs[5:7] == [None, None]
+    assert detector.calls == 5  # the hand's return is picked up at once
+    assert xs[7] == pytest.approx(210)
+
+
+def test_two_hands_keep_their_rows_when_mediapipe_swaps_them():
+    class SwappingDetector(FakeDetector):
+        def findLandmarks(self, img):
+            found = np.concatenate([hand_at(100.0), hand_at(400.0)])
+            handedness = np.float32([0.9, 0.1])
+            if self.frame % 2:
+                return found[::-1], handedness[::-1]
+            return found, handedness
+
+    detector = SwappingDetector([])
+    filtered = FilteredDetector(detector, interval=2, clock=frame_clock())
+    image = np.zeros((4, 4, 3), np.uint8)
+    for frame in range(6):
+        detector.frame = frame
+        filtered.findHands(image, draw=False)
+        landmarks, handedness = filtered.findLandmarks(image)
+        # Without reordering the filter would average the two hands
+        assert landmarks[:, 0, 0] == pytest.approx([100, 400], abs=1)
+        assert handedness.tolist() == pytest.approx([0.9, 0.1])
+
+
+def test_new_hand_is_detected_twice_in_a_row():
+    class HandsDetector(FakeDetector):
+        """Finds a hand at each x of ``positions[frame]``."""
+
+        def __init__(self, positions):
+            super().__init__(positions)
+            self.detected = []  # frames the detector ran on
+
+        def findHands(self, img, draw=True):
+            self.detected.append(self.frame)
+            return img
+
+        def findLandmarks(self, img):
+            xs = self.positions[self.frame]
+            return (
+                np.concatenate([hand_at(x) for x in xs]),
+                np.full(len(xs), 0.95, np.float32),
+            )
+
+    # The first hand moves 3 px a frame; a second one appears on frame 5
+    positions = [[100.0 + 3 * f] + ([400.0] if f >= 5 else []) for f in range(8)]
+    detector = HandsDetector(positions)
+    filtered = FilteredDetector(detector, interval=4, clock=frame_clock())
+    run(filtered, 8)
+    # Frame 6 is detected too: the filter restarted at zero velocity on
+    # frame 5 and would otherwise predict both hands standing still
+    assert detector.detected == [0, 1, 5, 6]
+
+    detector = FakeDetector([])
+    assert filtered_detector(detector, interval=1) is detector
+    assert isinstance(filtered_detector(detector, interval=3), FilteredDetector)
+    with pytest.raises(ValueError):
+        FilteredDetector(detector, filter="median")
@@ -0,0 +1,108 @@
+import json
+
+import numpy as np
+
+from gesture_recognition.dataset import (
+    convert_recordings,
+    load_sample_arrays,
+    open_store,
+)
+from gesture_recognition.landmark_store import LandmarkStore
+
+
+def make_samples(n, seed):
+    return np.random.default_rng(seed).integers(0, 640, (n, 21, 2)).tolist()
+
+
+def write_recording(path, name, samples):
+    (path / f"{name}.json").write_text(json.dumps(samples))
+
+
+def test_append_and_reopen(tmp_path):
+    store = LandmarkStore(tmp_path / "store")
+    store.append(make_samples(3, 0), "wave", "wave_20260101_120000")
+    store.append(make_samples(2, 1), "fist", "fist_20260101_120100")
+
+    reopened = LandmarkStore(tmp_path / "store")
+    landmarks, labels, sessions = reopened.arrays()
+    assert isinstance(landmarks, np.memmap)
+    assert landmarks.shape == (5, 21, 2)
+    np.testing.assert_array_equal(landmarks[3:], make_samples(2, 1))
+    np.testing.assert_array_equal(labels, [0, 0, 0, 1, 1])
+    np.testing.assert_array_equal(sessions, [0, 0, 0, 1, 1])
+    assert reopened.has_session("fist_20260101_120100")
+
+
+def test_interrupted_append_tail_is_ignored(tmp_path):
+    store = LandmarkStore(tmp_path / "store")
+    store.append(make_samples(2, 0), "wave", "wave_1")
+    # Simulate a crash after writing data but before the manifest
+    with open(tmp_path / "store" / "landmarks.f32", "ab") as f:
+        f.write(b"\0" * 100)
+
+    store = LandmarkStore(tmp_path / "store")
+    assert len(store) == 2
+    store.append(make_samples(1, 1), "wave", "wave_2")
+    landmarks, _, _ = store.arrays()
+    np.testing.assert_array_equal(landmarks[2], make_samples(1, 1)[0])
+    assert (tmp_path / "store" / "landmarks.f32").stat().st_size == 3 * 42 * 4
+
+
+def test_convert_matches_json_loading(tmp_path):
+    write_recording(tmp_path, "wave_20260101_120000", make_samples(4, 0))
+    write_recording(tmp_path, "fist_20260101_120000", make_samples(3, 1))
+    expected = load_sample_arrays(tmp_path)
+
+    assert convert_recordings(tmp_path) == (2, 7)
+    assert convert_recordings(tmp_path) == (0, 0)  # already converted
+
+    x, y, gestures = load_sample_arrays(tmp_path)  # now read from the store
+    assert gestures == expected[2] == ["fist", "wave"]
+    np.testing.assert_array_equal(y, expected[1])
+    np.testing.assert_allclose(x, expected[0])
+
+
+def test_convert_keeps_label_order_of_json_loading(tmp_path):
+    # "ok2_..." sorts before "ok_..." as a filename, after "ok" as a name
+    write_recording(tmp_path, "ok_20260101_120000", make_samples(2, 0))
+    write_recording(tmp_path, "ok2_20260101_120000", make_samples(3, 1))
+    write_recording(tmp_path, "fist_20260102_120000", make_samples(1, 2))
+    expected = load_sample_arrays(tmp_path)
+
+    # "fist" is recorded after the first conversion, so it is stored last
+    fist = tmp_path / "fist_20260102_120000.json"
+    fist.rename(tmp_path / "fist.later")
+    convert_recordings(tmp_path)
+    (tmp_path / "fist.later").rename(fist)
+    assert convert_recordings(tmp_path) == (1, 1)
+
+    x, y, gestures = load_sample_arrays(tmp_path)
+    assert gestures == expected[2] == ["fist", "ok2", "ok"]
+    np.testing.assert_array_equal(y, expected[1])
+    np.testing.assert_allclose(x, expected[0])
+
+
+def test_batches_follow_indices(tmp_path):
+    write_recording(tmp_path, "wave_20260101_120000", make_samples(5, 0))
+    write_recording(tmp_path, "fist_20260101_120000", make_samples(5, 1))
+    convert_recordings(tmp_path)
+    store = open_store(tmp_path)
+    x_all, y_all, _ = store.load(normalize=True)
+
+    indices = np.array([7, 2, 9, 0, 4])
+    batches = list(store.batches(2, indices=indices))
+
+    assert [len(x) for x, _ in batches] == [2, 2, 1]
+    x = np.concatenate([x for x, _ in batches])
+    y = np.concatenate([y for _, y in batches])
+    np.testing.assert_allclose(x, x_all[indices])
+    np.testing.assert_array_equal(y, y_all[indices])
+
+
+def test_open_store_warns_about_unconverted(tmp_path, capsys):
+    write_recording(tmp_path, "wave_20260101_120000", make_samples(1, 0))
+    convert_recordings(tmp_path)
+    write_recording(tmp_path, "wave_20260102_120000", make_samples(1, 1))
+
+    assert open_store(tmp_path) is not None
+    assert "1 recording(s)" in capsys.readouterr().out
@@ -1,6 +1,6 @@
 import numpy as np
 
-from gesture_recognition.landmarks import normalize_landmarks
+from gesture_recognition.landmarks import normalize_landmarks, normalize_landmarks_batch
 
 
 def make_hand(offset_x=0, offset_y=0, scale=1):
@@ -35,3 +35,28 @@ def test_degenerate_all_same_point():
     # All landmarks identical: no crash, all zeros
     result = normalize_landmarks([[5, 5]] * 21)
     assert np.array(result).sum() == 0
+
+
+def test_batch_matches_single_hand():
+    hands = [make_hand(), make_hand(offset_x=50, scale=2), make_hand(scale=0.5)]
+    result = normalize_landmarks_batch(np.array(hands))
+    assert result.dtype == np.float32
+    for hand, normalized in zip(hands, result):
+        np.testing.assert_allclose(normalized, normalize_landmarks(hand), atol=1e-6)
+
+
+def test_batch_zero_scale_rows_are_zero():
+    batch = np.array([make_hand(scale=3), [[5, 5]] * 21], dtype=np.float32)
+    result = normalize_landmarks_batch(batch)
+    assert np.isfinite(result).all()
+    assert not result[1].any()
+    assert np.abs(result[0]).max() == 1.0
+
+
+def test_batch_accepts_xyz_and_leaves_input_untouched():
+    batch = np.random.default_rng(0).uniform(0, 640, (4, 21, 3)).astype(np.float32)
+    original = batch.copy()
+    result = normalize_landmarks_batch(batch)
+    assert result.shape == (4, 21, 3)
+    assert not result[:, 0].any()
+    np.testing.assert_array_equal(batch, original)
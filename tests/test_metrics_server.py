@@ -0,0 +1,108 @@
+import types
+import urllib.error
+import urllib.request
+from collections import Counter
+
+import pytest
+
+from gesture_recognition.services.metrics_server import (
+    MetricsServer,
+    MetricsWriter,
+    app_metrics,
+)
+from gesture_recognition.services.ring_buffer import RingBuffer
+
+
+def test_writer_formats_gauges_counters_and_labels():
+    writer = MetricsWriter()
+    writer.add("fps", "gauge", "Frames per second.", 29.5)
+    writer.add(
+        "predictions_total", "counter", "Predictions.", [({"gesture": 'say "hi"'}, 3)]
+    )
+    writer.add("rss", "gauge", "Unknown values are left out.", None)
+
+    assert writer.text().splitlines() == [
+        "# HELP gesture_fps Frames per second.",
+        "# TYPE gesture_fps gauge",
+        "gesture_fps 29.5",
+        "# HELP gesture_predictions_total Predictions.",
+        "# TYPE gesture_predictions_total counter",
+        'gesture_predictions_total{gesture="say \\"hi\\""} 3',
+        "# HELP gesture_rss Unknown values are left out.",
+        "# TYPE gesture_rss gauge",
+    ]
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = types.SimpleNamespace(
+        buckets=(0.01, 0.1), counts=[2, 1, 1], sum=0.5, count=4
+    )
+    writer = MetricsWriter()
+    writer.add_histogram("stage_seconds", "Stage time.", [({"stage": "detect"}, histogram)])
+
+    lines = writer.text().splitlines()[2:]
+    assert lines == [
+        'gesture_stage_seconds_bucket{stage="detect",le="0.01"} 2',
+        'gesture_stage_seconds_bucket{stage="detect",le="0.1"} 3',
+        'gesture_stage_seconds_bucket{stage="detect",le="+Inf"} 4',
+        'gesture_stage_seconds_sum{stage="detect"} 0.5',
+        'gesture_stage_seconds_count{stage="detect"} 4',
+    ]
+
+
+def test_app_metrics():
+    pytest.importorskip("cv2")
+    from gesture_recognition.services.performance_analyzer import PerformanceAnalyzer
+
+    perf = PerformanceAnalyzer()
+    perf.record("detect", 0.012)
+    perf.end_frame()
+    presence = RingBuffer(10)
+    for value in (1.0, 1.0, 0.0, 1.0):
+        presence.append(value)
+    app = types.SimpleNamespace(
+        perf_analyzer=perf,
+        camera=types.SimpleNamespace(dropped=7),
+        queue_stats={"detect": (1, 2, 3)},
+        classified_frames=4,
+        hand_frames=3,
+        hand_presence=presence,
+        prediction_counts=Counter({"fist": 2, "okay": 1}),
+        audio_manager=types.SimpleNamespace(queue_depth=lambda: 1),
+        gesture_manager=types.SimpleNamespace(cache=None),
+    )
+
+    text = app_metrics(app)
+
+    assert 'gesture_stage_seconds_bucket{stage="detect",le="0.02"} 1' in text
+    assert 'gesture_dropped_frames_total{source="camera"} 7' in text
+    assert 'gesture_dropped_frames_total{source="queue_detect"} 3' in text
+    assert "gesture_hand_present_ratio 0.75" in text
+    assert 'gesture_predictions_total{gesture="fist"} 2' in text
+    assert "gesture_audio_queue_depth 1" in text
+    assert "gesture_frames_total 1" in text
+    assert "prediction_cache" not in text
+
+    from gesture_recognition.services.prediction_cache import PredictionCache
+
+    app.gesture_manager.cache = cache = PredictionCache(4, step=0.05)
+    cache.get(cache.key([0.0]))
+    cache.put(cache.key([0.0]), [1.0])
+    cache.get(cache.key([0.0]))
+    text = app_metrics(app)
+    assert 'gesture_prediction_cache_lookups_total{result="hit"} 1' in text
+    assert 'gesture_prediction_cache_lookups_total{result="miss"} 1' in text
+
+
+def test_server_serves_metrics_path_only():
+    server = MetricsServer(lambda: "gesture_fps 30\n", port=0).start()
+    try:
+        url = f"http://127.0.0.1:{server.port}"
+        with urllib.request.urlopen(f"{url}/metrics", timeout=5) as response:
+            assert response.read() == b"gesture_fps 30\n"
+            assert response.headers["Content-Type"].startswith("text/plain")
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f"{url}/other", timeout=5)
+        assert error.value.code == 404
+    finally:
+        server.stop()
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from gesture_recognition.services.numpy_model import NumpyDenseModel, weights_path
+
+
+def random_layers(sizes, seed=0):
+    rng = np.random.default_rng(seed)
+    layers = []
+    activations = ["relu"] * (len(sizes) - 2) + ["softmax"]
+    for n_in, n_out, activation in zip(sizes, sizes[1:], activations):
+        layers.append(
+            (rng.normal(size=(n_in, n_out)), rng.normal(size=n_out), activation)
+        )
+    return layers
+
+
+def test_forward_matches_reference():
+    layers = random_layers([42, 64, 32, 5])
+    model = NumpyDenseModel(layers)
+    x = np.random.default_rng(1).normal(size=(3, 21, 2)).astype(np.float32)
+
+    expected = x.reshape(3, -1)
+    for kernel, bias, activation in layers:
+        expected = expected @ kernel + bias
+        if activation == "relu":
+            expected = np.maximum(expected, 0)
+    expected = np.exp(expected - expected.max(axis=1, keepdims=True))
+    expected /= expected.sum(axis=1, keepdims=True)
+
+    np.testing.assert_allclose(model(x), expected, rtol=1e-4, atol=1e-6)
+
+
+def test_softmax_rows_sum_to_one():
+    model = NumpyDenseModel(random_layers([42, 16, 4]))
+    probs = model(np.ones((2, 21, 2)))
+    np.testing.assert_allclose(probs.sum(axis=1), 1.0, rtol=1e-5)
+
+
+def test_save_load_round_trip(tmp_path):
+    model = NumpyDenseModel(random_layers([42, 8, 3]))
+    path = tmp_path / "model.npz"
+    model.save(path)
+
+    loaded = NumpyDenseModel.load(path)
+    x = np.ones((1, 42))
+    np.testing.assert_array_equal(loaded(x), model(x))
+    assert loaded.activations == ["relu", "softmax"]
+
+
+def test_unsupported_activation_rejected():
+    with pytest.raises(ValueError):
+        NumpyDenseModel([(np.ones((2, 2)), np.zeros(2), "gelu")])
+
+
+def test_weights_path():
+    assert weights_path("models/custom_model") == "models/custom_model.npz"
+    assert weights_path("models/custom_model/") == "models/custom_model.npz"
+    assert weights_path("a/b.npz") == "a/b.npz"
+
+
+def test_parity_with_keras(tmp_path):
+    keras = pytest.importorskip("keras")
+    from gesture_recognition.export import export_npz
+
+    model = keras.Sequential(
+        [
+            keras.layers.Input(shape=(21, 2)),
+            keras.layers.Flatten(),
+            keras.layers.Dense(64, activation="relu"),
+            keras.layers.Dense(32, activation="relu"),
+            keras.layers.Dense(4, activation="softmax"),
+        ]
+    )
+    model_path = str(tmp_path / "dense_model")
+    model.save(model_path)
+
+    npz = NumpyDenseModel.load(export_npz(model_path))
+    x = np.random.default_rng(2).normal(size=(16, 21, 2)).astype(np.float32)
+
+    np.testing.assert_allclose(npz(x), model(x).numpy(), rtol=1e-4, atol=1e-6)
+
+
+def test_bundled_weights_match_pretrained_model():
+    keras = pytest.importorskip("keras")
+    from gesture_recognition import config
+
+    npz = NumpyDenseModel.load(weights_path(config.MODEL_PATH))
+    model = keras.models.load_model(config.MODEL_PATH)
+    x = np.random.default_rng(3).uniform(0, 640, size=(32, 21, 2)).astype(np.float32)
+
+    np.testing.assert_allclose(npz(x), model(x).numpy(), rtol=1e-3, atol=1e-5)
@@ -0,0 +1,51 @@
+import time
+
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+
+from gesture_recognition.services.performance_analyzer import PerformanceAnalyzer
+
+
+def test_stage_context_manager_and_decorator_record_timings():
+    perf = PerformanceAnalyzer(max_samples=10)
+
+    with perf.stage("detect"):
+        time.sleep(0.002)
+
+    @perf.timed("predict")
+    def predict(x):
+        return x * 2
+
+    assert predict(3) == 6
+    assert perf.stage_stats("detect")["p50"] >= 0.002
+    assert perf.stage_stats("predict")["count"] == 1
+    assert perf.stage_stats("render") is None
+
+
+def test_metrics_report_percentiles_and_legacy_keys():
+    perf = PerformanceAnalyzer(max_samples=100)
+    for ms in range(1, 101):
+        perf.record("detect", ms / 1000)
+    perf.log_prediction_time(0.004)
+
+    metrics = perf.get_metrics()
+    detect = metrics["stages"]["detect"]
+    assert detect["p50"] == pytest.approx(0.0505)
+    assert detect["p99"] == pytest.approx(0.09901)
+    assert detect["jitter"] == pytest.approx(np.std(np.arange(1, 101) / 1000))
+    assert metrics["avg_detection_time"] == pytest.approx(0.0505)
+    assert metrics["avg_prediction_time"] == pytest.approx(0.004)
+
+
+def test_draw_metrics_with_breakdown():
+    perf = PerformanceAnalyzer()
+    perf.start_frame()
+    perf.record("detect", 0.01)
+    perf.end_frame()
+    frame = np.zeros((480, 640, 3), np.uint8)
+
+    perf.draw_metrics(frame, breakdown=True)
+
+    assert frame.any()
@@ -0,0 +1,89 @@
+import itertools
+import threading
+import time
+
+import pytest
+
+from gesture_recognition.pipeline import Pipeline, StageQueue
+
+
+def test_queue_drops_oldest_when_full():
+    q = StageQueue("detect", maxsize=2)
+    for i in range(5):
+        q.put(i)
+
+    assert q.stats() == (2, 2, 3)
+    assert q.get(0) == 3
+    assert q.get(0) == 4
+    assert q.get(0) is None
+
+
+def test_queue_rejects_zero_size():
+    with pytest.raises(ValueError):
+        StageQueue("detect", maxsize=0)
+
+
+def collect(pipeline, count, timeout=5.0):
+    results = []
+    deadline = time.monotonic() + timeout
+    while len(results) < count and time.monotonic() < deadline:
+        item = pipeline.get(0.05)
+        if item is not None:
+            results.append(item)
+    return results
+
+
+def test_results_stay_in_frame_order_with_slow_stage():
+    counter = itertools.count()
+
+    def slow(item):
+        time.sleep(0.002)
+        return item
+
+    pipeline = Pipeline(
+        lambda: next(counter), [("detect", slow), ("classify", lambda i: i * 10)]
+    ).start()
+    try:
+        results = collect(pipeline, 20)
+    finally:
+        pipeline.stop()
+
+    assert len(results) == 20
+    # Stale frames are dropped, but never reordered
+    assert results == sorted(results)
+    assert all(r % 10 == 0 for r in results)
+    stats = pipeline.queue_stats()
+    assert set(stats) == {"detect", "classify", "output"}
+    assert stats["detect"][2] > 0  # the fast source outran the slow stage
+
+
+def test_stage_returning_none_discards_item():
+    counter = itertools.count()
+    pipeline = Pipeline(
+        lambda: next(counter), [("even", lambda i: i if i % 2 == 0 else None)]
+    ).start()
+    try:
+        results = collect(pipeline, 5)
+    finally:
+        pipeline.stop()
+
+    assert all(r % 2 == 0 for r in results)
+
+
+def test_stage_error_is_raised_on_consumer():
+    def boom(item):
+        raise RuntimeError("detector crashed")
+
+    pipeline = Pipeline(lambda: 1, [("detect", boom)]).start()
+    try:
+        with pytest.raises(RuntimeError, match="detector crashed"):
+            for _ in range(100):
+                pipeline.get(0.05)
+    finally:
+        pipeline.stop()
+
+
+def test_stop_joins_threads():
+    pipeline = Pipeline(lambda: 1, [("detect", lambda i: i)]).start()
+    pipeline.stop()
+    assert not [t for t in threading.enumerate() if t.name.startswith("pipeline-")]
@@ -0,0 +1,104 @@
+import importlib.util
+import json
+import os
+
+import numpy as np
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+spec = importlib.util.spec_from_file_location(
+    "pipeline_bench", os.path.join(ROOT_DIR, "benchmarks", "pipeline_bench.py")
+)
+pipeline_bench = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(pipeline_bench)
+
+
+def results(**stages):
+    return {
+        "inputs": {
+            "synthetic": {
+                "stages": {
+                    stage: {"p50_us": p50, "p95_us": p95}
+                    for stage, (p50, p95) in stages.items()
+                }
+            }
+        }
+    }
+
+
+def test_summarize_reports_percentiles_and_throughput():
+    summary = pipeline_bench.summarize(np.arange(1, 101) * 1e-6)
+    assert summary["count"] == 100
+    assert summary["p50_us"] == pytest.approx(50.5)
+    assert summary["p99_us"] == pytest.approx(99.01)
+    assert summary["throughput_per_s"] == pytest.approx(1e6 / 50.5, rel=1e-3)
+
+
+def test_compare_flags_regressions_over_threshold():
+    baseline = results(detect=(1000, 1200), smooth=(3, 4), predict=(100, 120))
+    current = results(detect=(1100, 1500), smooth=(6, 8), predict=(130, 125))
+
+    regressions = pipeline_bench.compare(current, baseline, 0.15, min_delta_us=5)
+    # detect p95 +25%; smooth doubled but only by a few microseconds;
+    # predict p50 +30%
+    assert [r.split(":")[0] for r in regressions] == [
+        "synthetic/detect p95_us",
+        "synthetic/predict p50_us",
+    ]
+    assert pipeline_bench.compare(
+        current, baseline, 0.15, 5, stage_thresholds={"detect": 0.3, "predict": 0.5}
+    ) == []
+
+
+def test_synthetic_frames_are_deterministic():
+    pytest.importorskip("cv2")
+    frames, landmarks = pipeline_bench.synthetic_frames(3, seed=1)
+    again, _ = pipeline_bench.synthetic_frames(3, seed=1)
+
+    assert landmarks.shape == (3, 21, 2)
+    assert frames[0].shape == (480, 640, 3)
+    assert all(np.array_equal(a, b) for a, b in zip(frames, again))
+
+
+def test_record_then_compare(tmp_path):
+    pytest.importorskip("cv2")
+    baseline = tmp_path / "baseline.json"
+    args = [
+        "--frames", "20",
+        "--stages", "normalize", "predict", "smooth",
+        "--backend", "numpy",
+        "--output", str(tmp_path / "results.json"),
+        "--baseline", str(baseline),
+    ]  # fmt: skip
+
+    assert pipeline_bench.main([*args, "--record"]) == 0
+    recorded = json.loads(baseline.read_text())
+    assert list(recorded["inputs"]["synthetic"]["stages"]) == [
+        "normalize",
+        "predict",
+        "smooth",
+    ]
+    # Generous limits: only checks the comparison path runs
+    assert pipeline_bench.main([*args, "--threshold", "100"]) == 0
+
+
+def test_loop_stage_runs_the_app_per_frame_path():
+    pytest.importorskip("cv2")
+    pytest.importorskip("mediapipe")
+    from gesture_recognition import config
+    from gesture_recognition.services.gesture_manager import GestureManager
+    from gesture_recognition.tracking.hand_detector import handDetector
+
+    frames, landmarks = pipeline_bench.synthetic_frames(1)
+    manager = GestureManager(
+        config.MODEL_PATH, config.GESTURE_NAMES_PATH, backend="numpy"
+    )
+    app = pipeline_bench._headless_app(handDetector(), manager)
+
+    summaries, _ = pipeline_bench.run_input(
+        frames, landmarks, app, set(pipeline_bench.STAGES), warmup=0
+    )
+    assert set(summaries) == set(pipeline_bench.STAGES)
+    assert summaries["loop"]["count"] == 1
+    assert app.classified_frames == 1
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from gesture_recognition.services.gesture_manager import GestureManager
+from gesture_recognition.services.numpy_model import NumpyDenseModel
+from gesture_recognition.services.prediction_cache import PredictionCache
+
+
+class CountingModel:
+    def __init__(self, model):
+        self.model = model
+        self.rows = 0
+
+    def __call__(self, inputs, training=False):
+        self.rows += len(inputs)
+        return self.model(inputs)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    rng = np.random.default_rng(0)
+    NumpyDenseModel(
+        [
+            (rng.normal(size=(42, 16)), rng.normal(size=16), "relu"),
+            (rng.normal(size=(16, 3)), rng.normal(size=3), "softmax"),
+        ]
+    ).save(tmp_path / "model.npz")
+    names = tmp_path / "names.txt"
+    names.write_text("fist\npeace\nwave\n")
+    manager = GestureManager(
+        str(tmp_path / "model"),
+        str(names),
+        backend="numpy",
+        cache_size=8,
+        cache_step=0.05,
+    )
+    manager.model = CountingModel(manager.model)
+    return manager
+
+
+def hand(seed):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(-1, 1, (21, 2)).astype(np.float32)
+
+
+def test_cache_key_quantizes_to_grid():
+    cache = PredictionCache(4, step=0.1)
+    assert cache.key([0.51, -0.2]) == cache.key([0.54, -0.17])
+    assert cache.key([0.51, -0.2]) != cache.key([0.56, -0.2])
+
+
+def test_lru_evicts_least_recently_used():
+    cache = PredictionCache(2, step=1)
+    cache.put(b"a", 1)
+    cache.put(b"b", 2)
+    assert cache.get(b"a") == 1  # a is now the most recent
+    cache.put(b"c", 3)
+    assert cache.get(b"b") is None
+    assert cache.get(b"a") == 1 and cache.get(b"c") == 3
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_held_pose_skips_the_model(manager):
+    # On grid cell centres, so the jitter below stays inside the cells
+    pose = np.round(hand(1) / 0.05) * np.float32(0.05)
+    first = manager.predict_batch(pose[np.newaxis], distributions=True)[0]
+    again = manager.predict_batch((pose + 0.001)[np.newaxis], distributions=True)[0]
+
+    assert again == first
+    assert manager.model.rows == 1
+    assert manager.cache.hit_rate == 0.5
+    assert manager.cache.saved_seconds > 0
+
+
+def test_batch_calls_model_only_on_misses(manager):
+    manager.predict_batch(hand(1)[np.newaxis])
+    results = manager.predict_batch(np.stack([hand(1), hand(2), hand(3)]))
+    assert manager.model.rows == 3
+    manager.cache = None
+    assert manager.predict_batch(np.stack([hand(1), hand(2), hand(3)])) == results
+
+
+def test_cache_invalidated_on_reload_and_new_gesture(manager, tmp_path):
+    manager.predict_batch(hand(1)[np.newaxis])
+    assert len(manager.cache) == 1
+
+    manager.add_gesture("thumbs_up")
+    assert len(manager.cache) == 0
+    manager.add_gesture("thumbs_up")  # already known: nothing changes
+
+    manager.predict_batch(hand(1)[np.newaxis])
+    manager.load_resources()
+    assert len(manager.cache) == 0
+    assert manager.cache.invalidations == 2
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from gesture_recognition.services.ring_buffer import RingBuffer
+
+
+def test_keeps_only_the_latest_samples():
+    buffer = RingBuffer(3)
+    for value in range(5):
+        buffer.append(value)
+
+    assert len(buffer) == 3
+    assert sorted(buffer.values()) == [2, 3, 4]
+    assert buffer.ordered().tolist() == [2, 3, 4]
+    assert buffer.last() == 4
+
+
+def test_running_statistics_match_numpy():
+    rng = np.random.default_rng(0)
+    samples = rng.uniform(0.01, 0.05, 250)
+    buffer = RingBuffer(100)
+    for value in samples:
+        buffer.append(value)
+
+    recent = samples[-100:]
+    assert buffer.mean() == pytest.approx(recent.mean())
+    assert buffer.std() == pytest.approx(recent.std())
+    assert buffer.percentiles([50, 95]) == pytest.approx(np.percentile(recent, [50, 95]))
+
+
+def test_partial_and_empty_buffers():
+    buffer = RingBuffer(4)
+    assert buffer.mean() == 0.0 and buffer.std() == 0.0 and buffer.last() is None
+    buffer.append(2.0)
+    buffer.append(4.0)
+    assert buffer.ordered().tolist() == [2.0, 4.0]
+    assert buffer.mean() == 3.0
+    buffer.clear()
+    assert len(buffer) == 0
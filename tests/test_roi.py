@@ -0,0 +1,74 @@
+import importlib.util
+import os
+
+import numpy as np
+
+from gesture_recognition.tracking.roi import (
+    contains,
+    landmark_roi,
+    leaving_roi,
+    to_frame,
+)
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_roi_bench():
+    spec = importlib.util.spec_from_file_location(
+        "roi_bench", os.path.join(ROOT_DIR, "benchmarks", "roi_bench.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_landmark_roi_is_padded_square_around_hand():
+    points = np.array([[300, 200], [340, 280]], np.float32)  # 40 x 80 box
+    x, y, size = landmark_roi(points, (480, 640), padding=0.5)
+    assert size == 160
+    assert (x, y) == (240, 160)  # centred on (320, 240)
+
+
+def test_landmark_roi_stays_inside_frame():
+    points = np.array([[5, 470], [60, 478]], np.float32)
+    x, y, size = landmark_roi(points, (480, 640), padding=0.5, min_size=150)
+    assert size == 150
+    assert x == 0 and y + size == 480
+
+    huge = np.array([[0, 0], [639, 479]], np.float32)
+    assert landmark_roi(huge, (480, 640))[2] == 480
+    assert landmark_roi(np.zeros((0, 2)), (480, 640)) is None
+
+
+def test_to_frame_maps_crop_coordinates():
+    landmarks = np.array([[[0.0, 0.0, 0.1], [1.0, 0.5, -0.2]]], np.float32)
+    to_frame(landmarks, (100, 50, 200))
+    np.testing.assert_allclose(landmarks, [[[100, 50, 20], [300, 150, -40]]], rtol=1e-6)
+
+
+def test_leaving_roi_ignores_edges_on_frame_border():
+    landmarks = np.array([[0.01, 0.5, 0], [0.5, 0.5, 0]], np.float32)
+    assert leaving_roi(landmarks, (100, 100, 200), (480, 640))
+    # The crop's left edge is the frame's: nothing beyond it
+    assert not leaving_roi(landmarks, (0, 100, 200), (480, 640))
+    inside = np.array([[0.3, 0.4, 0], [0.7, 0.6, 0]], np.float32)
+    assert not leaving_roi(inside, (100, 100, 200), (480, 640))
+
+
+def test_contains_requires_fit_and_similar_scale():
+    assert contains((100, 100, 200), (150, 150, 100))
+    assert not contains((100, 100, 200), (250, 150, 100))  # sticks out
+    assert not contains((100, 100, 200), (150, 150, 80))  # crop far too large
+
+
+def test_landmark_error_compares_frames_both_modes_found():
+    roi_bench = load_roi_bench()
+    hand = np.array([[0, 0], [30, 40]], np.float32)  # diagonal 50
+    reference = [hand, hand, None, hand]
+    candidate = [hand + [3, 4], None, hand, hand]
+
+    error = roi_bench.landmark_error(reference, candidate)
+
+    assert (error["compared"], error["missed"], error["extra"]) == (2, 1, 1)
+    assert error["mean_px"] == 2.5
+    assert error["mean_relative"] == 0.05
@@ -0,0 +1,40 @@
+import threading
+import time
+
+from gesture_recognition.services.sampling_profiler import SamplingProfiler
+
+
+def spin(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_samples_other_threads(tmp_path):
+    output = tmp_path / "profile.txt"
+    profiler = SamplingProfiler(output, duration=None, interval=0.001, top=5).start()
+    worker = threading.Thread(target=spin, args=(0.3,), name="busy worker")
+    worker.start()
+    worker.join()
+    profiler.stop()
+
+    lines = output.read_text().splitlines()
+    busy = [line for line in lines if line.startswith("busy_worker;")]
+    assert busy and all("spin(tests/test_sampling_profiler.py:" in line for line in busy)
+    assert int(busy[0].rsplit(" ", 1)[1]) > 0
+
+    _, own, total = profiler.top_functions(1)[0]
+    assert own > 0 and total >= own
+    assert "function" in (tmp_path / "profile.txt.top.txt").read_text()
+
+
+def test_window_ends_sampling_by_itself(tmp_path):
+    output = tmp_path / "profile.txt"
+    profiler = SamplingProfiler(output, duration=0.05, interval=0.005).start()
+    profiler._thread.join(timeout=5)
+
+    assert output.exists()
+    samples = profiler.samples
+    time.sleep(0.02)
+    assert profiler.samples == samples
+    profiler.stop()  # already written: a no-op
@@ -0,0 +1,159 @@
+import importlib.util
+import json
+import os
+
+import numpy as np
+
+from gesture_recognition.landmarks import normalize_landmarks_batch
+from gesture_recognition.sequences import (
+    FEATURE_SIZE,
+    frame_features,
+    load_sequences,
+    resample,
+    save_takes,
+    sequence_dataset,
+    sequences_dir,
+    windows,
+)
+from gesture_recognition.services.sequence_recognizer import SequenceRecognizer
+from gesture_recognition.services.temporal_model import NumpyTemporalModel
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def swipe(frames, dx=10.0):
+    """A fixed hand pose whose wrist moves ``dx`` pixels right per frame."""
+    pose = np.random.default_rng(0).uniform(-50, 50, (21, 2)).astype(np.float32)
+    pose[0] = 0
+    wrist = np.stack([100 + dx * np.arange(frames), np.full(frames, 200.0)], -1)
+    return (wrist[:, np.newaxis] + pose).astype(np.float32)
+
+
+def test_save_and_load_takes(tmp_path):
+    os.makedirs(sequences_dir(tmp_path))
+    path = os.path.join(sequences_dir(tmp_path), "wave_20260101_120000.json")
+    save_takes(path, "wave", [([0.0, 0.04, 0.07], swipe(3)), ([0.0], swipe(1))])
+
+    ((gesture, session, times, landmarks),) = load_sequences(tmp_path)
+
+    # Single-frame takes have no motion and are skipped
+    assert (gesture, session) == ("wave", "wave_20260101_120000")
+    np.testing.assert_allclose(times, [0.0, 0.04, 0.07])
+    assert landmarks.shape == (3, 21, 2)
+
+
+def test_resample_interpolates_onto_steady_clock():
+    landmarks = swipe(3)
+    resampled = resample([0.0, 0.05, 0.1], landmarks, fps=40)
+
+    assert len(resampled) == 5  # 0, 0.025, ..., 0.1
+    np.testing.assert_allclose(resampled[1], (landmarks[0] + landmarks[1]) / 2)
+    np.testing.assert_allclose(resampled[-1], landmarks[-1])
+
+
+def test_features_are_normalized_pose_and_relative_motion():
+    landmarks = swipe(2)
+    features = frame_features(landmarks[1:], landmarks[:1])
+
+    assert features.shape == (1, FEATURE_SIZE)
+    np.testing.assert_allclose(
+        features[0, :42], normalize_landmarks_batch(landmarks[1:]).reshape(-1)
+    )
+    scale = np.abs(landmarks[1] - landmarks[1, 0]).max()
+    np.testing.assert_allclose(features[0, 42:], [10 / scale, 0], rtol=1e-5)
+
+    # The same swipe twice as far away: same features
+    far = frame_features(landmarks[1:] * 0.5, landmarks[:1] * 0.5)
+    np.testing.assert_allclose(far, features, rtol=1e-5)
+
+
+def test_windows_pad_short_takes_and_stride_long_ones():
+    features = np.arange(10, dtype=np.float32)[:, np.newaxis]
+
+    short = windows(features[:3], 5)
+    np.testing.assert_array_equal(short[0, :, 0], [0, 0, 0, 1, 2])
+
+    strided = windows(features, 4, stride=3)
+    # Windows end on the last frame and every 3 frames before it
+    np.testing.assert_array_equal(strided[:, -1, 0], [3, 6, 9])
+
+
+def test_sequence_dataset_labels_and_stretches():
+    times = np.arange(20) / 30
+    sequences = [
+        ("wave", "wave_1", times, swipe(20)),
+        ("idle", "idle_1", times, swipe(20, dx=0)),
+    ]
+    x, labels, sessions, gestures = sequence_dataset(
+        sequences, fps=30, length=9, stretches=(1.0, 2.0)
+    )
+
+    assert gestures == ["idle", "wave"]
+    # 20 frames -> 12 windows, stretched x2 to 39 frames -> 31 windows
+    assert len(x) == 2 * (12 + 31)
+    assert x.shape[1:] == (9, FEATURE_SIZE)
+    assert labels.tolist().count(1) == 43
+    assert set(sessions[labels == 0]) == {"idle_1"}
+
+
+def motion_model(classes=("idle", "right")):
+    """A one-layer model that scores "right" by the wrist's x motion."""
+    kernel = np.zeros((1, FEATURE_SIZE, 2), np.float32)
+    kernel[0, 42] = [0, 1]  # dx feature -> hidden unit 1
+    head = np.array([[0, 0], [-20, 20]], np.float32)
+    model = NumpyTemporalModel(
+        [(kernel, np.zeros(2), 1, "relu")], [(head, np.zeros(2), "softmax")]
+    )
+    return SequenceRecognizer(model, list(classes), fps=30)
+
+
+def test_recognizer_steps_on_its_own_clock():
+    recognizer = motion_model()
+    hand = swipe(4)
+    # A 15 fps camera: two model steps per frame after the first
+    for i, landmarks in enumerate(hand):
+        recognizer.update(landmarks, i / 15)
+    assert recognizer.steps == 1 + 2 * 3
+
+
+def test_recognizer_shows_motion_but_not_idle():
+    recognizer = motion_model()
+    for i, landmarks in enumerate(swipe(10, dx=0)):
+        assert recognizer.update(landmarks, i / 30) == ("", 0.0)
+
+    for i, landmarks in enumerate(swipe(10), start=10):
+        gesture, confidence = recognizer.update(landmarks, i / 30)
+    assert gesture == "right"
+    assert confidence > 0.9
+
+
+def test_recognizer_restarts_after_a_gap():
+    recognizer = motion_model()
+    hand = swipe(20)
+    for i in range(10):
+        recognizer.update(hand[i], i / 30)
+    assert recognizer.result()[0] == "right"
+
+    # The stream starts over: no steps interpolated across the gap, and no
+    # motion until the next frame
+    assert recognizer.update(hand[10], 5.0) == ("", 0.0)
+    assert recognizer.steps == 11
+    for i in range(11, 20):
+        recognizer.update(hand[i], 5.0 + (i - 10) / 30)
+    assert recognizer.result()[0] == "right"
+
+
+def test_sequence_bench_reports_every_mode(tmp_path):
+    spec = importlib.util.spec_from_file_location(
+        "sequence_bench", os.path.join(ROOT_DIR, "benchmarks", "sequence_bench.py")
+    )
+    sequence_bench = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(sequence_bench)
+
+    output = tmp_path / "sequence_bench.json"
+    argv = ["--frames", "40", "--warmup", "2", "--output", str(output)]
+    assert sequence_bench.main(argv) == 0
+    result = json.loads(output.read_text())["d1-3-9"]
+    assert result["receptive_field"] == 27
+    assert result["model_steps"] == 42
+    assert {"static", "streaming", "window"} <= set(result)
@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ("numpy", "cv2", "tensorflow", "keras", "mediapipe", "tkinter", "gtts")
+
+
+def run_python(code):
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+
+def test_main_imports_no_heavy_modules():
+    loaded = run_python(
+        "import sys, main; "
+        f"print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    assert loaded.strip() == ""
+
+
+def test_config_does_not_import_cv2():
+    loaded = run_python(
+        "import sys, gesture_recognition.config; print('cv2' in sys.modules)"
+    )
+    assert loaded.strip() == "False"
+
+
+def test_help_lists_subcommands():
+    result = subprocess.run(
+        [sys.executable, "main.py", "--help"],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for command in ("recognize", "train", "analyze", "settings"):
+        assert command in result.stdout
@@ -0,0 +1,81 @@
+import json
+
+import numpy as np
+import pytest
+
+from gesture_recognition.sweep import (
+    candidate_grid,
+    format_table,
+    parameter_count,
+    select_candidate,
+    session_folds,
+)
+
+
+def test_candidate_grid_halves_widths():
+    grid = candidate_grid(widths=(64,), depths=(1, 3), learning_rates=(0.001,))
+    assert [c["hidden_layers"] for c in grid] == [(64,), (64, 32, 16)]
+
+
+def test_parameter_count_matches_default_architecture():
+    # 42 -> 64 -> 32 -> 5
+    assert parameter_count((64, 32), 5) == 43 * 64 + 65 * 32 + 33 * 5
+
+
+def test_session_folds_keep_sessions_together():
+    labels = np.repeat([0, 0, 0, 1, 1, 1], 4)
+    sessions = np.repeat(np.arange(6), 4)
+    folds = session_folds(labels, sessions, folds=3)
+
+    assert len(folds) == 3
+    seen = np.concatenate([val for _, val in folds])
+    assert sorted(seen) == list(range(len(labels)))
+    for train, val in folds:
+        assert not set(sessions[train]) & set(sessions[val])
+        # Round-robin per gesture: every fold validates on both gestures
+        assert set(labels[val]) == {0, 1}
+
+
+def test_session_folds_need_two_sessions():
+    with pytest.raises(ValueError):
+        session_folds([0, 1], [0, 0], folds=5)
+
+
+def row(params, accuracy, numpy_us=1.0):
+    return {
+        "hidden_layers": (params,),
+        "learning_rate": 0.001,
+        "params": params,
+        "accuracy": accuracy,
+        "accuracy_std": 0.0,
+        "keras_us": 100.0,
+        "numpy_us": numpy_us,
+    }
+
+
+def test_select_smallest_within_margin():
+    rows = [row(5000, 0.95), row(1000, 0.945), row(200, 0.90)]
+    assert select_candidate(rows, margin=0.01) is rows[1]
+    assert select_candidate(rows, margin=0.0) is rows[0]
+    assert select_candidate(rows, margin=0.1) is rows[2]
+    assert "*" in format_table(rows, rows[1]).splitlines()[2]
+
+
+def test_sweep_end_to_end(tmp_path):
+    pytest.importorskip("tensorflow")
+    from gesture_recognition.sweep import run_sweep
+
+    rng = np.random.default_rng(0)
+    for gesture in ("fist", "open"):
+        for session in range(2):
+            samples = rng.uniform(0, 640, (1, 21, 2)) + rng.normal(0, 2, (8, 21, 2))
+            path = tmp_path / f"{gesture}_2026010{session}_120000.json"
+            path.write_text(json.dumps(samples.tolist()))
+
+    candidates = candidate_grid(widths=(8, 16), depths=(1,), learning_rates=(0.01,))
+    rows = run_sweep(tmp_path, candidates, folds=2, epochs=1, workers=1)
+
+    assert [r["hidden_layers"] for r in rows] == [(8,), (16,)]
+    for r in rows:
+        assert 0.0 <= r["accuracy"] <= 1.0
+        assert r["keras_us"] > 0 and r["numpy_us"] > 0
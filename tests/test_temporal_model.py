@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from gesture_recognition.services.temporal_model import NumpyTemporalModel
+
+
+def random_model(dilations=(1, 3, 9), kernel_size=3, features=44, seed=0):
+    rng = np.random.default_rng(seed)
+    convs, width = [], features
+    for dilation in dilations:
+        kernel = rng.normal(0, 0.3, (kernel_size, width, 16))
+        convs.append((kernel, rng.normal(0, 0.1, 16), dilation, "relu"))
+        width = 16
+    dense = [(rng.normal(size=(width, 4)), rng.normal(size=4), "softmax")]
+    return NumpyTemporalModel(convs, dense)
+
+
+def reference(model, window):
+    """Causal dilated convolution of one window, written out step by step."""
+    x = np.asarray(window, dtype=np.float64)
+    for kernel, bias, dilation, _ in model.convs:
+        span = (len(kernel) - 1) * dilation
+        x = np.maximum(
+            [
+                sum(x[t - span + j * dilation] @ kernel[j] for j in range(len(kernel)))
+                + bias
+                for t in range(span, len(x))
+            ],
+            0,
+        )
+    logits = x[-1] @ model.head.layers[0][0] + model.head.layers[0][1]
+    return np.exp(logits) / np.exp(logits).sum()
+
+
+def test_receptive_field():
+    assert random_model((1, 3, 9)).receptive_field == 27
+    assert random_model((1, 2), kernel_size=5).receptive_field == 13
+
+
+def test_window_call_matches_reference():
+    model = random_model()
+    window = np.random.default_rng(1).normal(size=(27, 44))
+    np.testing.assert_allclose(
+        model(window[np.newaxis])[0], reference(model, window), rtol=1e-4, atol=1e-6
+    )
+
+
+def test_stream_matches_full_window_on_every_frame():
+    model = random_model()
+    frames = np.random.default_rng(2).normal(size=(70, 44)).astype(np.float32)
+    stream = model.stream()
+
+    for t, features in enumerate(frames):
+        # Early frames: the window is padded with the first frame, as the
+        # stream's history is after a reset
+        window = frames[max(0, t + 1 - model.receptive_field) : t + 1]
+        np.testing.assert_allclose(
+            stream.step(features), model(window[np.newaxis])[0], rtol=1e-4, atol=1e-6
+        )
+
+
+def test_stream_reset_starts_over():
+    model = random_model()
+    frames = np.random.default_rng(3).normal(size=(40, 44)).astype(np.float32)
+    stream = model.stream()
+    first = [stream.step(f) for f in frames]
+    stream.reset()
+    again = [stream.step(f) for f in frames]
+    np.testing.assert_array_equal(first, again)
+
+
+def test_stream_state_does_not_grow():
+    stream = random_model().stream()
+    sizes = [buffer.shape for *_, buffer in stream.layers]
+    for features in np.zeros((200, 44)):
+        stream.step(features)
+    assert [buffer.shape for *_, buffer in stream.layers] == sizes
+    # Two copies of each layer's kernel span
+    assert [size[0] for size in sizes] == [6, 14, 38]
+
+
+def test_save_load_round_trip(tmp_path):
+    model = random_model((1, 2))
+    model.save(tmp_path / "sequence_model.npz")
+    loaded = NumpyTemporalModel.load(tmp_path / "sequence_model.npz")
+
+    window = np.ones((2, loaded.receptive_field, 44))
+    np.testing.assert_array_equal(loaded(window), model(window))
+    assert loaded.conv_activations == ["relu", "relu"]
+    assert loaded.feature_size == 44
+
+
+def test_parity_with_keras(tmp_path):
+    pytest.importorskip("keras")
+    from gesture_recognition.export import temporal_layers
+    from gesture_recognition.sequence_trainer import build_sequence_model
+
+    model = build_sequence_model(3)
+    npz = NumpyTemporalModel(*temporal_layers(model))
+    x = np.random.default_rng(4).normal(size=(8, 27, 44)).astype(np.float32)
+
+    assert npz.receptive_field == model.input_shape[1]
+    np.testing.assert_allclose(npz(x), model(x).numpy(), rtol=1e-4, atol=1e-6)
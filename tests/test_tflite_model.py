@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from gesture_recognition.export import format_report
+from gesture_recognition.services.tflite_model import tflite_path
+
+
+def test_tflite_path():
+    path = tflite_path("models/custom_model", "int8")
+    assert path == "models/custom_model_int8.tflite"
+
+
+def test_report_shows_accuracy_delta_against_keras():
+    rows = [
+        {"variant": "keras", "size_kb": 400.0, "latency_us": 4000.0,
+         "agreement": 1.0, "accuracy": 0.9},
+        {"variant": "int8", "size_kb": 110.0, "latency_us": 30.0,
+         "agreement": 0.98, "accuracy": 0.88},
+    ]
+    report = format_report(rows).splitlines()
+
+    assert len(report) == 3
+    assert report[2].startswith("int8")
+    assert report[2].endswith("-2.0%")
+
+
+def test_report_without_labels():
+    rows = [{"variant": "keras", "size_kb": 1.0, "latency_us": 1.0,
+             "agreement": 1.0, "accuracy": None}]
+    assert "n/a" in format_report(rows)
+
+
+def test_quantized_variants_match_keras(tmp_path):
+    keras = pytest.importorskip("keras")
+    from gesture_recognition.export import export_tflite
+    from gesture_recognition.services.tflite_model import TFLiteModel
+
+    rng = np.random.default_rng(0)
+    model = keras.Sequential(
+        [
+            keras.layers.Input(shape=(21, 2)),
+            keras.layers.Flatten(),
+            keras.layers.Dense(32, activation="relu"),
+            keras.layers.Dense(4, activation="softmax"),
+        ]
+    )
+    model_path = str(tmp_path / "dense_model")
+    model.save(model_path)
+    samples = rng.uniform(-1, 1, (64, 21, 2)).astype(np.float32)
+
+    paths = export_tflite(model_path, samples)
+    assert set(paths) == {"float32", "float16", "int8"}
+
+    expected = model(samples).numpy()
+    for variant, atol in (("float32", 1e-5), ("float16", 1e-2), ("int8", 0.05)):
+        tflite = TFLiteModel(paths[variant])
+        # Batches of different sizes resize the interpreter on the fly
+        got = np.concatenate([tflite(samples[:1]), tflite(samples[1:])])
+        np.testing.assert_allclose(got, expected, atol=atol, err_msg=variant)
@@ -0,0 +1,60 @@
+import json
+import threading
+
+from gesture_recognition.services.tracer import NULL_TRACER, Tracer
+
+
+def spans(trace):
+    return [e for e in trace["traceEvents"] if e["ph"] == "X"]
+
+
+def test_spans_become_chrome_complete_events():
+    tracer = Tracer(process_name="test")
+    with tracer.span("frame", args={"frame": 0}), tracer.span("detect"):
+        pass
+
+    trace = tracer.to_chrome()
+    detect, frame = spans(trace)
+    assert (detect["name"], frame["name"]) == ("detect", "frame")
+    assert frame["args"] == {"frame": 0}
+    # The outer span starts first (at the origin) and encloses the inner one
+    assert frame["ts"] == 0
+    assert detect["ts"] + detect["dur"] <= frame["ts"] + frame["dur"]
+    metadata = {e["name"]: e["args"]["name"] for e in trace["traceEvents"] if e["ph"] == "M"}
+    assert metadata["process_name"] == "test"
+    assert metadata["thread_name"] == threading.current_thread().name
+
+
+def test_buffer_keeps_only_the_newest_events():
+    tracer = Tracer(capacity=3)
+    for i in range(5):
+        tracer.add(f"span{i}", "frame", i, i + 0.5)
+
+    assert [e["name"] for e in spans(tracer.to_chrome())] == ["span2", "span3", "span4"]
+
+
+def test_merge_events_from_another_tracer(tmp_path):
+    worker = Tracer(process_name="worker")
+    worker.pid = 12345  # as if recorded in another process
+    worker.processes = {12345: "worker"}
+    worker.add("detect", "frame", 1.0, 1.25)
+    main = Tracer(process_name="main")
+    main.add("smooth", "frame", 2.0, 2.5)
+
+    main.merge(worker.drain())
+    assert len(worker.events) == 0
+
+    path = tmp_path / "trace.json"
+    assert main.save(path) == 2
+    trace = json.loads(path.read_text())
+    by_name = {e["name"]: e for e in spans(trace)}
+    assert by_name["detect"]["pid"] == 12345
+    assert by_name["smooth"]["ts"] == 1e6
+    assert by_name["smooth"]["dur"] == 0.5e6
+
+
+def test_null_tracer_records_nothing():
+    with NULL_TRACER.span("frame"):
+        pass
+    NULL_TRACER.add("frame", "frame", 0, 1)
+    assert NULL_TRACER.drain() == ([], {}, {})
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from gesture_recognition.landmarks import normalize_landmarks_batch
+
+tf = pytest.importorskip("tensorflow")
+
+from gesture_recognition import training_data
+from gesture_recognition.training_data import (
+    augment,
+    make_dataset,
+    normalize,
+    session_split,
+)
+
+
+def raw_hands(n, seed=0):
+    return np.random.default_rng(seed).uniform(0, 640, (n, 21, 2)).astype(np.float32)
+
+
+def test_normalize_matches_numpy():
+    x = raw_hands(8)
+    x[3] = 5  # zero-scale hand
+    np.testing.assert_allclose(
+        normalize(tf.constant(x)).numpy(), normalize_landmarks_batch(x), atol=1e-6
+    )
+
+
+def test_session_split_holds_out_whole_sessions():
+    labels = np.repeat([0, 0, 0, 0, 0, 1, 1, 2], 10)
+    sessions = np.repeat(np.arange(8), 10)
+    train, val = session_split(labels, sessions, fraction=0.2)
+
+    assert len(train) + len(val) == len(labels)
+    assert not set(sessions[train]) & set(sessions[val])
+    # Gesture 2 has a single session, so it is only trained on
+    assert 2 not in labels[val]
+    # Every gesture keeps training data
+    assert set(labels[train]) == {0, 1, 2}
+    assert len(set(sessions[val])) == 2  # one of 5 for gesture 0, one of 2 for 1
+
+
+def test_augment_without_randomness_is_normalization(monkeypatch):
+    for name in ("ROTATION_RANGE", "SCALE_RANGE", "MIRROR_PROBABILITY"):
+        monkeypatch.setattr(training_data, name, 0.0)
+    monkeypatch.setattr(training_data, "JITTER_STDDEV", 0.0)
+    monkeypatch.setattr(training_data, "DROPOUT_PROBABILITY", 0.0)
+    x = raw_hands(4)
+    np.testing.assert_allclose(
+        augment(tf.constant(x)).numpy(), normalize_landmarks_batch(x), atol=1e-5
+    )
+
+
+def test_augment_preserves_shape_and_changes_samples():
+    x = raw_hands(32)
+    out = augment(tf.constant(x)).numpy()
+    assert out.shape == x.shape
+    assert np.isfinite(out).all()
+    assert not np.allclose(out, normalize_landmarks_batch(x), atol=1e-3)
+
+
+def test_make_dataset_batches_selected_samples():
+    x = raw_hands(10)
+    y = np.arange(10) % 3
+    indices = np.array([1, 4, 7, 9])
+    dataset = make_dataset(x, y, indices, num_classes=3, batch_size=3, training=False)
+
+    batches = list(dataset.as_numpy_iterator())
+    assert [len(b[0]) for b in batches] == [3, 1]
+    landmarks = np.concatenate([b[0] for b in batches])
+    labels = np.concatenate([b[1] for b in batches]).argmax(axis=1)
+    np.testing.assert_allclose(landmarks, normalize_landmarks_batch(x[indices]), atol=1e-6)
+    np.testing.assert_array_equal(labels, y[indices])